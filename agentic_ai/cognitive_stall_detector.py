@@ -8,9 +8,7 @@ import os
 import json
 from datetime import datetime, timezone, timedelta
 from core_layer.memory_engine import recall_recent
-from sentence_transformers import SentenceTransformer, util
-
-model = SentenceTransformer("all-MiniLM-L6-v2")
+from core_layer.thought_similarity import embed_thoughts, count_similar_pairs
 
 class CognitiveStallDetector:
     def __init__(self, memory_window=15, contradiction_threshold=0.88):
@@ -26,14 +24,7 @@ class CognitiveStallDetector:
         if len(thoughts) < 5:
             return False, "Not enough cognitive history"
 
-        embeddings = model.encode(thoughts, convert_to_tensor=True)
-        sim_matrix = util.pytorch_cos_sim(embeddings, embeddings).cpu().numpy()
-
-        loop_count = 0
-        for i in range(len(sim_matrix)):
-            for j in range(i + 1, len(sim_matrix)):
-                if sim_matrix[i][j] > self.threshold:
-                    loop_count += 1
+        loop_count = count_similar_pairs(embed_thoughts(thoughts), self.threshold)
 
         is_looping = loop_count > 5
         return is_looping, f"Loop similarity count = {loop_count}" if is_looping else "Stable reasoning"
@@ -0,0 +1,249 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: agentic_ai/lexical_index.py
+# Purpose: Incremental BM25 inverted index over the reasoning trace log
+# ============================================================
+
+"""BM25 keyword index for reasoning traces.
+
+Dense embeddings blur exact tokens such as ticker symbols (``NVDA``) and fixed
+phrases (``"rate hike"``). This index is the lexical half of the hybrid
+retriever in ``agentic_ai.query_reasoning``.
+
+Layout, kept compact for tens of millions of traces:
+    postings[term]   (array('I') doc ids, array('H') term frequencies)
+    doc_len          array('I') token count per doc
+    doc_entry        array('Q') the trace's entry number in the log's
+                     ``MemoryStore``, so text and payload are re-read on
+                     demand and never held in RAM
+    doc_key          bytes, 16 per doc: the trace's vector point id (see
+                     ``vectorize_reasoning._point_id``), so lexical and dense
+                     hits of the same trace fuse into one result
+
+The log is read through ``core_layer.memory_store`` like
+``vectorize_reasoning`` does, so entry numbers stay valid when the live file
+rolls into segments or has patches compacted in. ``refresh()`` indexes the
+entries appended since its entry-number watermark, so every search sees what
+was appended since the last one. If the store holds fewer entries than the
+watermark (the log was replaced), the index is rebuilt. The index is pickled to
+``TEX_LEXICAL_INDEX_PATH`` at most every ``TEX_LEXICAL_SAVE_INTERVAL`` seconds
+and at exit.
+"""
+
+import os
+import re
+import json
+import math
+import time
+import uuid
+import atexit
+import pickle
+import threading
+from array import array
+
+import numpy as np
+
+from core_layer.memory_store import MemoryStore
+
+# === Config (env overrideable)
+LEXICAL_INDEX_PATH = os.getenv("TEX_LEXICAL_INDEX_PATH", "memory_archive/.reasoning_bm25.idx")
+LEXICAL_SAVE_INTERVAL = float(os.getenv("TEX_LEXICAL_SAVE_INTERVAL", "60"))
+BM25_K1 = float(os.getenv("TEX_BM25_K1", "1.2"))
+BM25_B = float(os.getenv("TEX_BM25_B", "0.75"))
+PHRASE_SCAN_MAX = 2000  # candidates read back from the log to verify quoted phrases
+REFRESH_BATCH = 1000    # entries fetched from the store per read while catching up
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[._'-][a-z0-9]+)*")
+_PHRASE = re.compile(r'"([^"]+)"')
+_MAX_TF = 0xFFFF
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def trace_text(trace):
+    """Searchable text of a trace: its output and input."""
+    if not isinstance(trace, dict):
+        return ""
+    return " ".join(str(trace[k]).strip() for k in ("output", "input") if trace.get(k))
+
+
+class BM25Index:
+    def __init__(self, log_path, index_path=LEXICAL_INDEX_PATH, point_id=None, store=None):
+        self.log_path = str(log_path)
+        self.index_path = index_path
+        self.point_id = point_id
+        name = os.path.basename(self.log_path)
+        self.domain = name[:-len(".jsonl")] if name.endswith(".jsonl") else name
+        self.store = store or MemoryStore(os.path.dirname(self.log_path) or ".")
+        self._lock = threading.RLock()
+        self._last_save = time.monotonic()
+        self._unsaved = 0
+        self._reset()
+        if index_path and os.path.exists(index_path):
+            self._load()
+        if index_path:
+            atexit.register(self.save)
+
+    def _reset(self):
+        self.postings = {}
+        self.doc_len = array("I")
+        self.doc_entry = array("Q")
+        self.doc_key = bytearray()
+        self.total_len = 0
+        self.watermark = 0  # next entry number to index
+
+    # --- persistence -------------------------------------------------------
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("log_path") != self.log_path:
+                return
+            if "doc_entry" not in state:
+                print(f"[LEXICAL INDEX] 🔄 {self.index_path} predates entry-number docs — rebuilding.")
+                return
+            self.postings = state["postings"]
+            self.doc_len = state["doc_len"]
+            self.doc_entry = state["doc_entry"]
+            self.doc_key = state["doc_key"]
+            self.total_len = state["total_len"]
+            self.watermark = state["watermark"]
+        except Exception as e:
+            print(f"[LEXICAL INDEX] ⚠️ Could not load {self.index_path} ({e}) — rebuilding from the log.")
+            self._reset()
+
+    def save(self):
+        with self._lock:
+            if not self.index_path or not self._unsaved:
+                return
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+            tmp = self.index_path + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump({
+                    "log_path": self.log_path, "postings": self.postings, "doc_len": self.doc_len,
+                    "doc_entry": self.doc_entry, "doc_key": self.doc_key, "total_len": self.total_len,
+                    "watermark": self.watermark,
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.index_path)
+            self._unsaved = 0
+            self._last_save = time.monotonic()
+
+    # --- maintenance -------------------------------------------------------
+    def __len__(self):
+        return len(self.doc_len)
+
+    def add(self, trace, entry_no):
+        """Index one trace; ``entry_no`` is its entry number in the store, used to read it back."""
+        counts = {}
+        for token in tokenize(trace_text(trace)):
+            counts[token] = counts.get(token, 0) + 1
+        doc = len(self.doc_len)
+        for token, tf in counts.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = (array("I"), array("H"))
+            posting[0].append(doc)
+            posting[1].append(min(tf, _MAX_TF))
+        length = sum(counts.values())
+        self.doc_len.append(length)
+        self.doc_entry.append(entry_no)
+        self.doc_key += uuid.UUID(self.point_id(trace)).bytes if self.point_id else bytes(16)
+        self.total_len += length
+
+    def refresh(self):
+        """Index traces appended since the last call; returns how many were added."""
+        with self._lock:
+            count = self.store.count(self.domain)
+            if count < self.watermark:
+                print(f"[LEXICAL INDEX] 🔄 {self.log_path} holds fewer entries than indexed — rebuilding.")
+                self._reset()
+            added = 0
+            for lo in range(self.watermark, count, REFRESH_BATCH):
+                hi = min(lo + REFRESH_BATCH, count)
+                for entry_no, trace in self.store.get_pairs(self.domain, range(lo, hi)):
+                    if isinstance(trace, dict):
+                        self.add(trace, entry_no)
+                        added += 1
+                self.watermark = hi
+            self._unsaved += added
+            if self._unsaved and time.monotonic() - self._last_save >= LEXICAL_SAVE_INTERVAL:
+                self.save()
+            return added
+
+    # --- lookup ------------------------------------------------------------
+    def key(self, doc):
+        return str(uuid.UUID(bytes=bytes(self.doc_key[doc * 16:doc * 16 + 16])))
+
+    def traces(self, docs):
+        """Re-read the traces of ``docs`` from the store: ``{doc: trace}``, expired entries left out."""
+        docs_at = {self.doc_entry[doc]: doc for doc in docs}
+        return {docs_at[entry_no]: trace for entry_no, trace in self.store.get_pairs(self.domain, list(docs_at))}
+
+    def trace(self, doc):
+        """Re-read doc ``doc``'s trace from the store (None if it expired)."""
+        return self.traces([doc]).get(doc)
+
+    def search(self, query, top_k=10):
+        """
+        BM25 top-k as [(doc, score)]. Quoted phrases in ``query`` must appear
+        verbatim (case-insensitive) in the matched traces.
+        """
+        self.refresh()
+        phrases = [tokenize(p) for p in _PHRASE.findall(query)]
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            scores = self._score(terms, {t for phrase in phrases for t in phrase}) if terms else None
+        if scores is None:
+            return []
+        candidates = np.flatnonzero(scores)
+        if not len(candidates):
+            return []
+        limit = min(len(candidates), PHRASE_SCAN_MAX if phrases else top_k)
+        best = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        best = best[np.argsort(-scores[best])]
+        if not phrases:
+            return [(int(d), float(scores[d])) for d in best]
+
+        hits = []
+        traces = self.traces([int(d) for d in best])
+        for doc in best:
+            tokens = " " + " ".join(tokenize(trace_text(traces.get(int(doc))))) + " "
+            if all(f" {' '.join(p)} " in tokens for p in phrases):
+                hits.append((int(doc), float(scores[doc])))
+                if len(hits) == top_k:
+                    break
+        return hits
+
+    def _score(self, terms, required):
+        """BM25 score per doc (0 where a phrase term is missing); None if nothing can match.
+
+        Kept in its own frame so the NumPy views over the posting arrays are
+        released before the lock is, since arrays exporting a buffer cannot grow.
+        """
+        n_docs = len(self.doc_len)
+        if not n_docs:
+            return None
+        avg_len = self.total_len / n_docs
+        doc_len = np.frombuffer(self.doc_len, dtype=np.uint32)
+        scores = np.zeros(n_docs, dtype=np.float32)
+        matched = np.ones(n_docs, dtype=bool) if required else None
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                if term in required:
+                    return None
+                continue
+            docs = np.frombuffer(posting[0], dtype=np.uint32)
+            tf = np.frombuffer(posting[1], dtype=np.uint16).astype(np.float32)
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len[docs] / avg_len)
+            scores[docs] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+            if term in required:
+                present = np.zeros(n_docs, dtype=bool)
+                present[docs] = True
+                matched &= present
+        if matched is not None:
+            scores[~matched] = 0
+        return scores
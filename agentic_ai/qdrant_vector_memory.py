@@ -1,32 +1,52 @@
 # ============================================================
 # © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
 # File: agentic_ai/qdrant_vector_memory.py
-# Purpose: Robust, container + cloud-friendly Qdrant helper
+# Purpose: Robust vector memory helper (Qdrant server or local FAISS backend)
 # ============================================================
 
-"""Qdrant connection layer for Tex memory vector store.
+"""Vector memory layer for Tex (Qdrant server or local FAISS).
 
 Key design features:
+- Pluggable backend selected by ``TEX_VECTOR_BACKEND`` (``qdrant`` | ``faiss``),
+  see ``agentic_ai.vector_backends``
 - Container-aware host resolution (Docker, Compose, or Cloud)
+- Lazy connection: nothing touches the network at import time
+- Pooled client + collection-existence cache; async twins (``aquery_similar``,
+  ``aupsert_embeddings``) over AsyncQdrantClient
+- Fire-and-forget writes (``enqueue_embeddings``) through a bounded, batching
+  queue so vector upserts stay off the cognitive loop's critical path
 - Configurable retry & backoff logic
 - Idempotent collection creation
 - Minimal and safe public API
+- ``TexVectorMemory``: text in, texts out — embeds through the shared
+  embedding service, filters on indexed payload fields (agent, type, time
+  range), applies score thresholds and optional MMR re-ranking
 """
 
 from __future__ import annotations
 
 import os
 import time
+import uuid
+import atexit
+import asyncio
+import hashlib
+import threading
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from qdrant_client import QdrantClient
-from qdrant_client.http import models as qdrant
-from qdrant_client.http.exceptions import UnexpectedResponse
+import numpy as np
+
+from agentic_ai.vector_backends import VectorBackend, QdrantBackend, AsyncQdrantBackend, FaissBackend
+from core_layer.embedding_service import get_embedder
+from core_layer.memory_writer import MemoryWriter
 
 
 # -----------------------------------------------------------------------------
 # 🔧 Config (env overrideable)
 # -----------------------------------------------------------------------------
+VECTOR_BACKEND = os.getenv("TEX_VECTOR_BACKEND", "qdrant")  # qdrant | faiss
+
 QDRANT_HOST = os.getenv("QDRANT_HOST", "qdrant") # use Qdrant Cloud or Docker host
 QDRANT_PORT = int(os.getenv("QDRANT_PORT", "6333"))
 QDRANT_TIMEOUT = float(os.getenv("QDRANT_TIMEOUT", "10.0"))
@@ -35,8 +55,20 @@ RETRY_DELAY = float(os.getenv("QDRANT_RETRY_DELAY", "3"))  # base delay in secon
 MAX_RETRIES = int(os.getenv("QDRANT_MAX_RETRIES", "10"))
 
 COLLECTION = os.getenv("QDRANT_COLLECTION", "tex_memory_embeddings")
+# TexVectorMemory's own collection: COLLECTION holds reasoning traces ({"output", ...}), not text memories
+TEXT_COLLECTION = os.getenv("TEX_TEXT_MEMORY_COLLECTION", "tex_text_memory")
+
+UPSERT_QUEUE_MAX = int(os.getenv("TEX_VECTOR_QUEUE_MAX", "5000"))     # back-pressure: producers block past this
+UPSERT_BATCH = int(os.getenv("TEX_VECTOR_UPSERT_BATCH", "128"))       # points per coalesced upsert
+UPSERT_LINGER = float(os.getenv("TEX_VECTOR_UPSERT_LINGER", "0.1"))   # seconds to wait for a batch to fill
+UPSERT_RETRIES = int(os.getenv("TEX_VECTOR_UPSERT_RETRIES", "3"))
 VECTOR_SIZE_RAW = os.getenv("QDRANT_VECTOR_SIZE", "384")
-DISTANCE = qdrant.Distance.COSINE
+
+MMR_LAMBDA = float(os.getenv("TEX_VECTOR_MMR_LAMBDA", "0.5"))    # 1.0 = pure relevance, 0.0 = pure diversity
+MMR_FETCH_FACTOR = int(os.getenv("TEX_VECTOR_MMR_FETCH", "4"))     # candidates fetched per requested MMR hit
+
+# Payload fields TexVectorMemory filters on; indexed so filtered searches stay fast.
+PAYLOAD_INDEXES = {"agent": "keyword", "type": "keyword", "ts": "float"}
 
 try:
     VECTOR_SIZE = int(VECTOR_SIZE_RAW)
@@ -46,50 +78,50 @@ except Exception:
 
 
 # -----------------------------------------------------------------------------
-# 🔁 Resilient connection bootstrap
+# 🔌 Backend selection (created on first use)
 # -----------------------------------------------------------------------------
-def _init_client() -> QdrantClient:
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            if ":" in QDRANT_HOST:
-                qdrant_url = f"http://{QDRANT_HOST}"
-            else:
-                qdrant_url = f"http://{QDRANT_HOST}:{QDRANT_PORT}"
+_backend: Optional[VectorBackend] = None
+_async_backend: Optional[AsyncQdrantBackend] = None
+_backend_lock = threading.Lock()
 
-            client = QdrantClient(url=qdrant_url, timeout=QDRANT_TIMEOUT)
-            client.get_collections()
-            print(f"[QDRANT] ✅ Connected to {qdrant_url}")
-            return client
 
-        except Exception as exc:
-            print(f"[QDRANT] ⚠️  Connection failed ({exc}) – retry {attempt}/{MAX_RETRIES}")
-            if attempt == MAX_RETRIES:
-                raise ConnectionError("[QDRANT] ❌ Unable to connect after max retries") from exc
-            time.sleep(RETRY_DELAY * attempt)  # exponential backoff
+def get_backend() -> VectorBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if VECTOR_BACKEND == "faiss":
+                    _backend = FaissBackend()
+                elif VECTOR_BACKEND == "qdrant":
+                    _backend = QdrantBackend(QDRANT_HOST, QDRANT_PORT, QDRANT_TIMEOUT, MAX_RETRIES, RETRY_DELAY)
+                else:
+                    raise ValueError(f"Unknown TEX_VECTOR_BACKEND: {VECTOR_BACKEND} (expected 'qdrant' or 'faiss')")
+                print(f"[VECTOR MEMORY] 🔌 Using {_backend.name} backend")
+    return _backend
+
+
+def get_async_backend() -> AsyncQdrantBackend:
+    """Lazy AsyncQdrantClient-backed twin of the Qdrant backend (qdrant only)."""
+    global _async_backend
+    if _async_backend is None:
+        with _backend_lock:
+            if _async_backend is None:
+                _async_backend = AsyncQdrantBackend(QDRANT_HOST, QDRANT_PORT, QDRANT_TIMEOUT, MAX_RETRIES, RETRY_DELAY)
+    return _async_backend
 
-_client: QdrantClient = _init_client()
+
+def set_backend(backend: VectorBackend) -> None:
+    """Swap in a specific backend instance (e.g. a FaissBackend rooted in a temp dir)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
 
 
 # -----------------------------------------------------------------------------
 # 🚀 Safe, idempotent collection creation
 # -----------------------------------------------------------------------------
 def _ensure_collection() -> None:
-    try:
-        print(f"[QDRANT] 🌀 Ensuring collection '{COLLECTION}' exists...")
-        _client.create_collection(
-            collection_name=COLLECTION,
-            vectors_config=qdrant.VectorParams(
-                size=VECTOR_SIZE,
-                distance=DISTANCE,
-            ),
-        )
-        print(f"[QDRANT] ✅ Collection '{COLLECTION}' created successfully.")
-    except qdrant.exceptions.UnexpectedResponse as e:
-        if "already exists" in str(e):
-            print(f"[QDRANT] 📚 Collection '{COLLECTION}' already exists — skipping creation.")
-        else:
-            print(f"[QDRANT] ❌ Unexpected error: {e}")
-            raise e
+    get_backend().ensure_collection(COLLECTION, VECTOR_SIZE)
 
 
 # -----------------------------------------------------------------------------
@@ -99,40 +131,279 @@ def upsert_embeddings(
     ids: List[str],
     vectors: List[List[float]],
     payloads: Optional[List[Dict[str, Any]]] = None,
-) -> None:
-    """Insert or update vector embeddings in Qdrant."""
+    wait: bool = True,
+) -> bool:
+    """Insert or update vector embeddings. Returns False on failure."""
     try:
-        _client.upsert(
-            collection_name=COLLECTION,
-            points=qdrant.Batch(ids=ids, vectors=vectors, payloads=payloads),
-            wait=True,
-        )
+        get_backend().upsert(COLLECTION, ids, vectors, payloads, wait=wait)
+        return True
     except Exception as exc:
-        print(f"[QDRANT] ❌ Upsert error – {exc}")
+        print(f"[VECTOR MEMORY] ❌ Upsert error – {exc}")
+        return False
 
 
 def query_similar(
     vector: List[float],
     top_k: int = 5,
     with_payload: bool = True,
-) -> List[qdrant.ScoredPoint]:
-    """Return top_k nearest vectors from Qdrant."""
+) -> List[Any]:
+    """Return top_k nearest vectors (objects with .id, .score, .payload)."""
     try:
-        return _client.search(
-            collection_name=COLLECTION,
-            query_vector=vector,
-            limit=top_k,
-            with_payload=with_payload,
-        )
-    except UnexpectedResponse as exc:
-        print(f"[QDRANT] ❌ Search error – {exc}")
+        return get_backend().search(COLLECTION, vector, top_k=top_k, with_payload=with_payload)
+    except Exception as exc:
+        print(f"[VECTOR MEMORY] ❌ Search error – {exc}")
         return []
 
 
-def is_alive() -> bool:
-    """Returns True if Qdrant collection is available."""
+async def aupsert_embeddings(
+    ids: List[str],
+    vectors: List[List[float]],
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    wait: bool = True,
+) -> bool:
+    """asyncio variant of `upsert_embeddings`."""
     try:
-        _client.get_collection(COLLECTION)
+        if VECTOR_BACKEND != "qdrant":
+            return await asyncio.to_thread(upsert_embeddings, ids, vectors, payloads, wait)
+        backend = get_async_backend()
+        await backend.ensure_collection(COLLECTION, VECTOR_SIZE)
+        await backend.upsert(COLLECTION, ids, vectors, payloads, wait=wait)
         return True
+    except Exception as exc:
+        print(f"[VECTOR MEMORY] ❌ Async upsert error – {exc}")
+        return False
+
+
+async def aquery_similar(
+    vector: List[float],
+    top_k: int = 5,
+    with_payload: bool = True,
+) -> List[Any]:
+    """asyncio variant of `query_similar`."""
+    try:
+        if VECTOR_BACKEND != "qdrant":
+            return await asyncio.to_thread(query_similar, vector, top_k, with_payload)
+        return await get_async_backend().search(COLLECTION, vector, top_k=top_k, with_payload=with_payload)
+    except Exception as exc:
+        print(f"[VECTOR MEMORY] ❌ Async search error – {exc}")
+        return []
+
+
+# -----------------------------------------------------------------------------
+# 📮 Fire-and-forget upsert queue (group commit via core_layer.memory_writer)
+# -----------------------------------------------------------------------------
+class _VectorSink:
+    """MemoryWriter sink: one coalesced upsert per collection per batch, with retry."""
+
+    def write_batch(self, collection: str, points: List[tuple]) -> None:
+        ids, vectors, payloads = (list(col) for col in zip(*points))
+        backend = get_backend()
+        for attempt in range(1, UPSERT_RETRIES + 1):
+            try:
+                backend.ensure_collection(collection, VECTOR_SIZE)
+                backend.upsert(collection, ids, vectors, payloads, wait=False)
+                return
+            except Exception:
+                if attempt == UPSERT_RETRIES:
+                    raise
+                time.sleep(RETRY_DELAY * attempt)
+
+    def sync(self) -> None:
+        pass
+
+
+_vector_sink = _VectorSink()
+_upsert_writer: Optional[MemoryWriter] = None
+
+
+def _get_upsert_writer() -> MemoryWriter:
+    global _upsert_writer
+    if _upsert_writer is None:
+        with _backend_lock:
+            if _upsert_writer is None:
+                _upsert_writer = MemoryWriter(max_queue=UPSERT_QUEUE_MAX, batch_size=UPSERT_BATCH,
+                                              batch_bytes=UPSERT_BATCH * VECTOR_SIZE * 4 * 2,
+                                              commit_interval=UPSERT_LINGER, fsync="none")
+                atexit.register(_upsert_writer.close)
+    return _upsert_writer
+
+
+def enqueue_embeddings(
+    ids: List[str],
+    vectors: List[List[float]],
+    payloads: Optional[List[Dict[str, Any]]] = None,
+    collection: str = COLLECTION,
+) -> None:
+    """Queue points for a batched background upsert; blocks only when the queue is full."""
+    writer = _get_upsert_writer()
+    payloads = payloads or [None] * len(ids)
+    for point in zip(ids, vectors, payloads):
+        writer.submit(_vector_sink, collection, point, len(point[1]) * 4)
+
+
+def flush_upserts(timeout: Optional[float] = None) -> bool:
+    """Block until every queued upsert was handed to the backend."""
+    return _upsert_writer.flush(timeout=timeout) if _upsert_writer is not None else True
+
+
+def is_alive() -> bool:
+    """Returns True if the vector collection is available."""
+    try:
+        return get_backend().is_alive(COLLECTION)
     except Exception:
         return False
+
+
+# -----------------------------------------------------------------------------
+# 🧠 Text-level memory (embed → upsert, filtered search, MMR)
+# -----------------------------------------------------------------------------
+def _epoch(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def mmr_rerank(query_vector, hits: List[Any], top_k: int, lambda_mult: float = MMR_LAMBDA) -> List[Any]:
+    """Maximal marginal relevance: greedily pick hits relevant to the query but unlike those already picked."""
+    if len(hits) <= 1 or any(getattr(hit, "vector", None) is None for hit in hits):
+        return hits[:top_k]
+    vectors = np.asarray([hit.vector for hit in hits], dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    query = np.asarray(query_vector, dtype=np.float32)
+    relevance = vectors @ (query / max(float(np.linalg.norm(query)), 1e-12))
+    similarity = vectors @ vectors.T
+
+    picked, redundancy = [], np.zeros(len(hits), dtype=np.float32)
+    available = np.ones(len(hits), dtype=bool)
+    for _ in range(min(top_k, len(hits))):
+        scores = np.where(available, lambda_mult * relevance - (1 - lambda_mult) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        picked.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+    return [hits[i] for i in picked]
+
+
+class TexVectorMemory:
+    """
+    Text memory over the configured vector backend, in its own collection
+    (``TEX_TEXT_MEMORY_COLLECTION``) so searches never surface raw reasoning
+    traces from ``COLLECTION``.
+
+    Each memory is stored with payload ``{"text", "agent", "type", "ts",
+    "timestamp", **metadata}``; ``ts`` is epoch seconds for range filters.
+    Point ids are derived from (agent, type, text), so re-storing the same
+    thought refreshes it instead of piling up duplicates. Writes go through
+    the batched upsert queue unless ``wait=True``.
+
+    ``query`` returns the stored texts; ``search`` returns the scored hits.
+    Query embeddings come from the shared embedding cache, so repeated
+    checks of the same thought cost a single filtered search.
+    """
+
+    def __init__(self, collection: str = TEXT_COLLECTION, agent: str = "tex", embedder=None):
+        self.collection = collection
+        self.agent = agent
+        self._embedder = embedder
+        self._ready = False
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def _backend(self) -> VectorBackend:
+        backend = get_backend()
+        if not self._ready:
+            backend.ensure_collection(self.collection, VECTOR_SIZE)
+            for field, kind in PAYLOAD_INDEXES.items():
+                backend.ensure_payload_index(self.collection, field, kind)
+            self._ready = True
+        return backend
+
+    def _point_id(self, payload: Dict[str, Any]) -> str:
+        key = f"{payload['agent']}\0{payload['type']}\0{payload['text']}".encode("utf-8")
+        return str(uuid.UUID(bytes=hashlib.blake2b(key, digest_size=16).digest()))
+
+    def embed_batch(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Optional[Dict[str, Any]]]] = None,
+        agent: Optional[str] = None,
+        wait: bool = False,
+    ) -> List[str]:
+        """Embed ``texts`` in one pass and upsert them; returns the point ids ([] on failure)."""
+        if not texts:
+            return []
+        now = time.time()
+        stamp = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        payloads = []
+        for text, metadata in zip(texts, metadatas or [None] * len(texts)):
+            payload = {"agent": agent or self.agent, "type": "memory", "timestamp": stamp, **(metadata or {})}
+            payload.update(text=text, ts=now)
+            payloads.append(payload)
+        ids = [self._point_id(payload) for payload in payloads]
+        try:
+            vectors = self.embedder.encode(list(texts), normalize_embeddings=True).tolist()
+            self._backend()
+            if wait:
+                get_backend().upsert(self.collection, ids, vectors, payloads, wait=True)
+            else:
+                enqueue_embeddings(ids, vectors, payloads, collection=self.collection)
+            return ids
+        except Exception as exc:
+            print(f"[VECTOR MEMORY] ❌ Failed to store {len(texts)} memories – {exc}")
+            return []
+
+    def embed_memory(
+        self,
+        text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+        agent: Optional[str] = None,
+        wait: bool = False,
+    ) -> Optional[str]:
+        ids = self.embed_batch([text], [metadata], agent=agent, wait=wait)
+        return ids[0] if ids else None
+
+    def search(
+        self,
+        text: str,
+        top_k: int = 5,
+        agent: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        since=None,
+        until=None,
+        score_threshold: Optional[float] = None,
+        mmr: bool = False,
+        mmr_lambda: float = MMR_LAMBDA,
+    ) -> List[Any]:
+        """Top-k hits (``.id``, ``.score``, ``.payload``) for ``text`` under the given payload filters."""
+        query_filter: Dict[str, Any] = {}
+        if agent is not None:
+            query_filter["agent"] = agent
+        if memory_type is not None:
+            query_filter["type"] = memory_type
+        if since is not None or until is not None:
+            query_filter["ts"] = {"gte": _epoch(since), "lte": _epoch(until)}
+        try:
+            vector = self.embedder.encode(text, normalize_embeddings=True)
+            hits = self._backend().search(
+                self.collection, vector.tolist(),
+                top_k=top_k * MMR_FETCH_FACTOR if mmr else top_k,
+                with_payload=True, query_filter=query_filter or None,
+                score_threshold=score_threshold, with_vectors=mmr,
+            )
+        except Exception as exc:
+            print(f"[VECTOR MEMORY] ❌ Search error – {exc}")
+            return []
+        return mmr_rerank(vector, hits, top_k, mmr_lambda) if mmr else hits[:top_k]
+
+    def query(self, text: str, top_k: int = 5, **filters) -> List[str]:
+        """Texts of the ``top_k`` most similar memories (same filters as ``search``)."""
+        return [hit.payload.get("text") or hit.payload.get("output", "")
+                for hit in self.search(text, top_k=top_k, **filters) if hit.payload]
@@ -4,20 +4,29 @@
 #
 # Purpose
 # --------
-# Retrieve semantically-similar reasoning traces from Qdrant **without**
-# ever creating a raw `QdrantClient` here.  All connectivity & retries
-# are delegated to the shared helper `qdrant_vector_memory.py`.
+# Retrieve reasoning traces by hybrid search: dense similarity from the
+# vector store (via the shared, retry-hardened `qdrant_vector_memory.py` –
+# never a raw `QdrantClient` here) fused with BM25 keyword matches from
+# `lexical_index.py`, so tickers and quoted phrases ("rate hike") hit.
+#
+# The two ranked lists are merged with reciprocal rank fusion:
+#     score(d) = Σ 1 / (RRF_K + rank_i(d))
+# Both retrievers run concurrently; results are plain dicts.
 # ===========================================================
 
 from __future__ import annotations
 
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 import os
+import threading
 
-from sentence_transformers import SentenceTransformer
+from core_layer.embedding_service import get_embedder
 
 # Centralised, retry-hardened helper -------------------------
 from agentic_ai.qdrant_vector_memory import query_similar
+from agentic_ai.lexical_index import BM25Index
+from agentic_ai.vectorize_reasoning import LOG_PATH, _point_id, _store
 
 # -----------------------------------------------------------
 # 🛠 Config (via env so you can switch models without editing)
@@ -25,8 +34,24 @@ from agentic_ai.qdrant_vector_memory import query_similar
 MODEL_NAME = os.getenv("TEX_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 COLLECTION  = os.getenv("TEX_REASONING_COLLECTION", "tex_reasoning_memory")
 TOP_K       = int(os.getenv("TEX_REASONING_TOP_K", "3"))
+FETCH_K     = int(os.getenv("TEX_HYBRID_FETCH_K", "50"))   # candidates per retriever before fusion
+RRF_K       = int(os.getenv("TEX_RRF_K", "60"))
+
+model = get_embedder(MODEL_NAME)
+
+_lexical: Optional[BM25Index] = None
+_lexical_lock = threading.Lock()
+_lexical_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lexical-search")
 
-model = SentenceTransformer(MODEL_NAME)
+
+def get_lexical_index() -> BM25Index:
+    """The BM25 index over the trace log (loaded from disk, then caught up on first use)."""
+    global _lexical
+    if _lexical is None:
+        with _lexical_lock:
+            if _lexical is None:
+                _lexical = BM25Index(LOG_PATH, point_id=_point_id, store=_store)
+    return _lexical
 
 
 def _encode(text: str) -> List[float]:
@@ -34,27 +59,74 @@ def _encode(text: str) -> List[float]:
     return model.encode(text, normalize_embeddings=True).tolist()
 
 
-def pretty_print(hits: List[Any], query: str) -> None:
+def _lexical_search(text: str, k: int):
+    index = get_lexical_index()
+    return index, index.search(text, top_k=k)
+
+
+def hybrid_search(text: str, top_k: int = TOP_K, fetch_k: int = FETCH_K, rrf_k: int = RRF_K) -> List[Dict[str, Any]]:
+    """
+    Top-k traces for `text` by reciprocal rank fusion of dense and BM25 hits.
+
+    Each result: id, score (RRF), text, timestamp, agent, confidence,
+    dense_rank / dense_score, lexical_rank / lexical_score (None when that
+    retriever missed it), and the full trace payload.
+    """
+    lexical_future = _lexical_pool.submit(_lexical_search, text, fetch_k)
+    dense = query_similar(_encode(text), top_k=fetch_k, with_payload=True)
+    try:
+        index, lexical = lexical_future.result()
+    except Exception as exc:
+        print(f"[QUERY REASONING] ⚠️ Lexical search failed – {exc}")
+        index, lexical = None, []
+
+    fused: Dict[str, Dict[str, Any]] = {}
+
+    def entry(key: str) -> Dict[str, Any]:
+        return fused.setdefault(key, {"id": key, "score": 0.0, "dense_rank": None, "dense_score": None,
+                                      "lexical_rank": None, "lexical_score": None, "payload": None})
+
+    for rank, hit in enumerate(dense, 1):
+        result = entry(str(hit.id))
+        result.update(dense_rank=rank, dense_score=float(hit.score), payload=hit.payload or {})
+        result["score"] += 1.0 / (rrf_k + rank)
+    for rank, (doc, score) in enumerate(lexical, 1):
+        result = entry(index.key(doc))
+        result.update(lexical_rank=rank, lexical_score=score, _doc=doc)
+        result["score"] += 1.0 / (rrf_k + rank)
+
+    results = sorted(fused.values(), key=lambda r: -r["score"])[:top_k]
+    for result in results:
+        doc = result.pop("_doc", None)
+        if result["payload"] is None:
+            result["payload"] = index.trace(doc) or {}  # lexical-only hit: read the trace back from the store
+        payload = result["payload"]
+        result.update(
+            text=(payload.get("output") or payload.get("input") or "").strip(),
+            timestamp=payload.get("timestamp"),
+            agent=payload.get("agent"),
+            confidence=payload.get("confidence"),
+        )
+    return results
+
+
+def pretty_print(results: List[Dict[str, Any]], query: str) -> None:
     print(f"\n🔍 Query: «{query}»")
-    if not hits:
+    if not results:
         print("  (no matches)")
         return
 
-    print("🧠 Most similar reasoning traces:\n")
-    for h in hits:
-        ts   = h.payload.get("timestamp", "unknown-time")
-        out  = h.payload.get("output", "(no-text)").strip()
-        conf = h.payload.get("confidence", "-")
-        agent = h.payload.get("agent", "-")
-
-        print(f" • [{ts}] {out}")
-        print(f"   ↳ confidence={conf}  agent={agent}  score={h.score:.4f}\n")
+    print("🧠 Most relevant reasoning traces:\n")
+    for r in results:
+        ranks = f"dense#{r['dense_rank'] or '-'} lexical#{r['lexical_rank'] or '-'}"
+        print(f" • [{r['timestamp'] or 'unknown-time'}] {r['text'] or '(no-text)'}")
+        print(f"   ↳ confidence={r['confidence'] if r['confidence'] is not None else '-'}  "
+              f"agent={r['agent'] or '-'}  rrf={r['score']:.4f}  ({ranks})\n")
 
 
-def query_reasoning_memory(text: str, top_k: int = TOP_K) -> None:
-    vec  = _encode(text)
-    hits = query_similar(vec, top_k=top_k, with_payload=True)
-    pretty_print(hits, text)
+def query_reasoning_memory(text: str, top_k: int = TOP_K) -> List[Dict[str, Any]]:
+    """Hybrid (dense + BM25) search over reasoning traces; see `hybrid_search`."""
+    return hybrid_search(text, top_k=top_k)
 
 
 # ------------------------------------------------------------------
@@ -64,4 +136,4 @@ if __name__ == "__main__":
     import sys
 
     query = " ".join(sys.argv[1:]) or "What did Tex say about market volatility?"
-    query_reasoning_memory(query)
\ No newline at end of file
+    pretty_print(query_reasoning_memory(query), query)
\ No newline at end of file
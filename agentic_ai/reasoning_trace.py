@@ -8,6 +8,8 @@ import json
 import os
 from datetime import datetime
 
+from core_layer.jsonl_reader import tail_jsonl
+
 REASONING_LOG = "memory_archive/reasoning_trace_log.jsonl"
 
 def log_reasoning_step(source, input_text, output_text, confidence=0.85, agent="TexCore"):
@@ -28,18 +30,12 @@ def log_reasoning_step(source, input_text, output_text, confidence=0.85, agent="
     print(f"[🧠] Reasoning logged by {agent}: {output_text[:80]}...")
 
 def get_recent_traces(n=10):
-    if not os.path.exists(REASONING_LOG):
-        return []
-
-    with open(REASONING_LOG, "r") as f:
-        lines = f.readlines()[-n:]
-        return [json.loads(line) for line in lines if line.strip()]
+    return tail_jsonl(REASONING_LOG, n)
 
 def trace_to_memory_vector(trace):
     """Simulated embedding vector for future use in local reasoning (LLM detachment prep)."""
-    from sentence_transformers import SentenceTransformer
-    model = SentenceTransformer('all-MiniLM-L6-v2')
-    return model.encode(trace["output"])
+    from core_layer.embedding_service import get_embedder
+    return get_embedder().encode(trace["output"])
 
 # === Example ===
 if __name__ == "__main__":
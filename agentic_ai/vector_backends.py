@@ -0,0 +1,778 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: agentic_ai/vector_backends.py
+# Purpose: Pluggable vector store backends (Qdrant server / local FAISS)
+# ============================================================
+
+"""Backends behind ``agentic_ai.qdrant_vector_memory``.
+
+Every backend implements the same small interface:
+
+    ensure_collection(collection, size)
+    ensure_payload_index(collection, field, kind)                kind: keyword | float
+    upsert(collection, ids, vectors, payloads=None, wait=True)   raises on failure
+    search(collection, vector, top_k, with_payload=True,
+           query_filter=None, score_threshold=None,
+           with_vectors=False)                                   → [ScoredPoint]
+    is_alive(collection)                                         → bool
+
+Collections can store quantized vectors (``TEX_VECTOR_QUANTIZATION`` for all,
+``TEX_VECTOR_QUANTIZATION_MAP`` as JSON per collection):
+
+    none     float32 vectors in the index
+    int8     scalar quantization, 4x smaller
+    binary   one bit per dimension, 32x smaller
+
+Quantized searches fetch ``oversampling`` times more candidates from the
+compact index and rescore them against the original float vectors. Qdrant
+keeps the originals on disk and the quantized copy in RAM. The FAISS index
+holds only the quantized codes, and rescoring reads the floats from the
+sidecar. On Qdrant the mode is applied when a collection is created. A FAISS
+collection switched to another mode is rebuilt from its sidecar on load.
+
+``query_filter`` is a backend-neutral dict of payload conditions, all of
+which must hold: ``{"agent": "tex"}`` (equality), ``{"type": ["a", "b"]}``
+(any of), ``{"ts": {"gte": t0, "lte": t1}}`` (range, either bound optional).
+
+``QdrantBackend`` talks to a Qdrant server: it only connects on first use,
+shares one keep-alive connection pool per process, and caches which
+collections exist. ``AsyncQdrantBackend`` is the same over ``AsyncQdrantClient``.
+``FaissBackend`` keeps everything on local disk under ``TEX_FAISS_DIR``:
+
+    <collection>.sqlite   sidecar store: point id, payload JSON, float32 vector
+    <collection>.faiss    HNSW (or flat) inner-product index over normalized
+                          vectors, so scores are cosine similarities like Qdrant's
+
+Payload indexes on the FAISS side are SQLite expression indexes over the
+sidecar's payload JSON. A filtered search whose filter matches at most
+``TEX_FAISS_EXACT_FILTER_MAX`` points scores exactly those points from the
+sidecar; broader filters search the ANN index with a growing over-fetch and
+drop non-matching rows.
+
+The sidecar is the source of truth. The FAISS file is an accelerator that is
+written at most every ``TEX_FAISS_FLUSH_INTERVAL`` seconds (and at exit), and
+anything missing from it after a crash is re-added from the sidecar on load.
+Re-upserting an existing id tombstones the old FAISS row; the index is
+rebuilt from the sidecar once tombstones pass ``TEX_FAISS_REBUILD_RATIO``.
+
+Several processes can share a collection. Every operation holds a
+``StoreLock`` on ``<collection>.lock`` (thread lock plus ``flock``), new rows
+are numbered from the sidecar's ``MAX(row) + 1`` inside a ``BEGIN IMMEDIATE``
+transaction, and each process replays rows the others added into its own
+in-memory index before using it. A rebuild renumbers the sidecar and bumps
+its ``generation``; other processes reload when they see the new generation,
+and an index file is only trusted if the sidecar records it as written for
+the current generation.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import json
+import time
+import atexit
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core_layer.memory_store import StoreLock
+
+try:
+    import faiss
+    FAISS_ENABLED = True
+except ImportError:
+    FAISS_ENABLED = False
+
+# -----------------------------------------------------------------------------
+# 🔧 Config (env overrideable)
+# -----------------------------------------------------------------------------
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "8"))
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "0") == "1"
+
+FAISS_DIR = os.getenv("TEX_FAISS_DIR", "memory_archive/.faiss")
+FAISS_INDEX_TYPE = os.getenv("TEX_FAISS_INDEX", "hnsw")  # hnsw | flat
+FAISS_HNSW_M = int(os.getenv("TEX_FAISS_HNSW_M", "32"))
+FAISS_EF_SEARCH = int(os.getenv("TEX_FAISS_EF_SEARCH", "64"))
+FAISS_FLUSH_INTERVAL = float(os.getenv("TEX_FAISS_FLUSH_INTERVAL", "5"))
+FAISS_REBUILD_RATIO = float(os.getenv("TEX_FAISS_REBUILD_RATIO", "0.2"))
+FAISS_EXACT_FILTER_MAX = int(os.getenv("TEX_FAISS_EXACT_FILTER_MAX", "20000"))  # brute-force filtered sets up to this size
+FAISS_REPLAY_CHUNK = 65536  # rows per batch when catching the in-memory index up with the sidecar
+FAISS_SQ_MIN_TRAIN = 1000  # fewer vectors than this → int8 range falls back to the full [-1, 1] of unit vectors
+
+QUANTIZATION_MODES = ("none", "int8", "binary")
+QUANTIZATION_DEFAULT = os.getenv("TEX_VECTOR_QUANTIZATION", "none")
+QUANTIZATION_BY_COLLECTION: Dict[str, str] = json.loads(os.getenv("TEX_VECTOR_QUANTIZATION_MAP", "{}") or "{}")
+OVERSAMPLING = {
+    "none": 1.0,
+    "int8": float(os.getenv("TEX_VECTOR_OVERSAMPLING_INT8", "2.0")),
+    "binary": float(os.getenv("TEX_VECTOR_OVERSAMPLING_BINARY", "4.0")),
+}
+
+_FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def quantization_for(collection: str) -> str:
+    mode = QUANTIZATION_BY_COLLECTION.get(collection, QUANTIZATION_DEFAULT)
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown vector quantization '{mode}' for '{collection}' (expected one of {QUANTIZATION_MODES})")
+    return mode
+
+
+def set_quantization(collection: str, mode: str) -> None:
+    """Per-collection override; takes effect when the collection is next created/loaded."""
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown vector quantization '{mode}' (expected one of {QUANTIZATION_MODES})")
+    QUANTIZATION_BY_COLLECTION[collection] = mode
+
+
+class ScoredPoint:
+    """Search hit with the attributes callers read from Qdrant's ScoredPoint."""
+
+    __slots__ = ("id", "score", "payload", "vector")
+
+    def __init__(self, id, score, payload=None, vector=None):
+        self.id = id
+        self.score = score
+        self.payload = payload
+        self.vector = vector
+
+    def __repr__(self):
+        return f"ScoredPoint(id={self.id!r}, score={self.score:.4f})"
+
+
+class VectorBackend:
+    name = "base"
+
+    def ensure_collection(self, collection: str, size: int) -> None:
+        raise NotImplementedError
+
+    def upsert(self, collection: str, ids: List[Any], vectors: List[List[float]],
+               payloads: Optional[List[Dict[str, Any]]] = None, wait: bool = True) -> None:
+        raise NotImplementedError
+
+    def ensure_payload_index(self, collection: str, field: str, kind: str = "keyword") -> None:
+        raise NotImplementedError
+
+    def search(self, collection: str, vector: List[float], top_k: int = 5, with_payload: bool = True,
+               query_filter: Optional[Dict[str, Any]] = None, score_threshold: Optional[float] = None,
+               with_vectors: bool = False) -> List[Any]:
+        raise NotImplementedError
+
+    def is_alive(self, collection: str) -> bool:
+        raise NotImplementedError
+
+
+# -----------------------------------------------------------------------------
+# 🛰️ Qdrant server
+# -----------------------------------------------------------------------------
+def _qdrant_client_kwargs(url: str, timeout: float, pool_size: int) -> Dict[str, Any]:
+    """One keep-alive HTTP pool per client; extra kwargs are handed to httpx by qdrant-client."""
+    import httpx
+
+    return {
+        "url": url,
+        "timeout": timeout,
+        "prefer_grpc": QDRANT_PREFER_GRPC,
+        "limits": httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+    }
+
+
+def _qdrant_filter(query_filter: Optional[Dict[str, Any]]):
+    """Translate the neutral filter dict into a Qdrant ``Filter`` (None when empty)."""
+    if not query_filter:
+        return None
+    from qdrant_client.http import models as qdrant
+
+    must = []
+    for field, cond in query_filter.items():
+        if isinstance(cond, dict):
+            must.append(qdrant.FieldCondition(key=field, range=qdrant.Range(gte=cond.get("gte"), lte=cond.get("lte"))))
+        elif isinstance(cond, (list, tuple, set)):
+            must.append(qdrant.FieldCondition(key=field, match=qdrant.MatchAny(any=list(cond))))
+        else:
+            must.append(qdrant.FieldCondition(key=field, match=qdrant.MatchValue(value=cond)))
+    return qdrant.Filter(must=must)
+
+
+def _qdrant_collection_config(collection: str, size: int) -> Dict[str, Any]:
+    """create_collection kwargs: cosine vectors plus, when quantized, a RAM-resident quantized copy."""
+    from qdrant_client.http import models as qdrant
+
+    mode = quantization_for(collection)
+    config: Dict[str, Any] = {
+        "vectors_config": qdrant.VectorParams(size=size, distance=qdrant.Distance.COSINE, on_disk=mode != "none"),
+    }
+    if mode == "int8":
+        config["quantization_config"] = qdrant.ScalarQuantization(
+            scalar=qdrant.ScalarQuantizationConfig(type=qdrant.ScalarType.INT8, quantile=0.99, always_ram=True))
+    elif mode == "binary":
+        config["quantization_config"] = qdrant.BinaryQuantization(
+            binary=qdrant.BinaryQuantizationConfig(always_ram=True))
+    return config
+
+
+def _qdrant_search_params(collection: str):
+    mode = quantization_for(collection)
+    if mode == "none":
+        return None
+    from qdrant_client.http import models as qdrant
+
+    return qdrant.SearchParams(quantization=qdrant.QuantizationSearchParams(
+        rescore=True, oversampling=OVERSAMPLING[mode]))
+
+
+def _qdrant_schema(kind: str):
+    from qdrant_client.http import models as qdrant
+
+    return {"keyword": qdrant.PayloadSchemaType.KEYWORD, "float": qdrant.PayloadSchemaType.FLOAT,
+            "integer": qdrant.PayloadSchemaType.INTEGER, "bool": qdrant.PayloadSchemaType.BOOL}[kind]
+
+
+class QdrantBackend(VectorBackend):
+    name = "qdrant"
+
+    def __init__(self, host: str, port: int, timeout: float, max_retries: int, retry_delay: float,
+                 pool_size: int = QDRANT_POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.pool_size = pool_size
+        self._client = None
+        self._lock = threading.Lock()
+        self._collections = set()  # collections known to exist — skips create_collection round trips
+        self._indexes = set()      # (collection, field) payload indexes already requested
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}" if ":" in self.host else f"http://{self.host}:{self.port}"
+
+    @property
+    def client(self):
+        """Connect on first use (with retry & backoff) instead of at import."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._connect()
+        return self._client
+
+    def _connect(self):
+        from qdrant_client import QdrantClient
+
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                client = QdrantClient(**_qdrant_client_kwargs(self.url, self.timeout, self.pool_size))
+                client.get_collections()
+                print(f"[QDRANT] ✅ Connected to {self.url}")
+                return client
+            except Exception as exc:
+                print(f"[QDRANT] ⚠️  Connection failed ({exc}) – retry {attempt}/{self.max_retries}")
+                if attempt == self.max_retries:
+                    raise ConnectionError("[QDRANT] ❌ Unable to connect after max retries") from exc
+                time.sleep(self.retry_delay * attempt)  # exponential backoff
+
+    def ensure_collection(self, collection, size):
+        if collection in self._collections:
+            return
+        from qdrant_client.http.exceptions import UnexpectedResponse
+
+        try:
+            if not self.client.collection_exists(collection):
+                print(f"[QDRANT] 🌀 Creating collection '{collection}' ({quantization_for(collection)} quantization)...")
+                self.client.create_collection(collection_name=collection, **_qdrant_collection_config(collection, size))
+                print(f"[QDRANT] ✅ Collection '{collection}' created successfully.")
+        except UnexpectedResponse as e:
+            if "already exists" not in str(e):
+                print(f"[QDRANT] ❌ Unexpected error: {e}")
+                raise e
+        self._collections.add(collection)
+
+    def upsert(self, collection, ids, vectors, payloads=None, wait=True):
+        from qdrant_client.http import models as qdrant
+
+        self.client.upsert(
+            collection_name=collection,
+            points=qdrant.Batch(ids=ids, vectors=vectors, payloads=payloads),
+            wait=wait,
+        )
+
+    def ensure_payload_index(self, collection, field, kind="keyword"):
+        if (collection, field) in self._indexes:
+            return
+        self.client.create_payload_index(collection_name=collection, field_name=field,
+                                         field_schema=_qdrant_schema(kind), wait=True)
+        self._indexes.add((collection, field))
+
+    def search(self, collection, vector, top_k=5, with_payload=True,
+               query_filter=None, score_threshold=None, with_vectors=False):
+        return self.client.search(
+            collection_name=collection,
+            query_vector=vector,
+            query_filter=_qdrant_filter(query_filter),
+            limit=top_k,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            score_threshold=score_threshold,
+            search_params=_qdrant_search_params(collection),
+        )
+
+    def is_alive(self, collection):
+        try:
+            self.client.get_collection(collection)
+            self._collections.add(collection)
+            return True
+        except Exception:
+            self._collections.discard(collection)
+            return False
+
+
+class AsyncQdrantBackend:
+    """asyncio twin of QdrantBackend built on qdrant-client's AsyncQdrantClient."""
+
+    name = "qdrant-async"
+
+    def __init__(self, host: str, port: int, timeout: float, max_retries: int, retry_delay: float,
+                 pool_size: int = QDRANT_POOL_SIZE):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.pool_size = pool_size
+        self._client = None
+        self._lock = None
+        self._collections = set()
+        self._indexes = set()
+
+    url = QdrantBackend.url
+
+    async def client(self):
+        import asyncio
+        from qdrant_client import AsyncQdrantClient
+
+        if self._client is not None:
+            return self._client
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            for attempt in range(1, self.max_retries + 1):
+                if self._client is not None:
+                    break
+                try:
+                    client = AsyncQdrantClient(**_qdrant_client_kwargs(self.url, self.timeout, self.pool_size))
+                    await client.get_collections()
+                    print(f"[QDRANT] ✅ Async client connected to {self.url}")
+                    self._client = client
+                except Exception as exc:
+                    print(f"[QDRANT] ⚠️  Async connection failed ({exc}) – retry {attempt}/{self.max_retries}")
+                    if attempt == self.max_retries:
+                        raise ConnectionError("[QDRANT] ❌ Unable to connect after max retries") from exc
+                    await asyncio.sleep(self.retry_delay * attempt)
+        return self._client
+
+    async def ensure_collection(self, collection, size):
+        if collection in self._collections:
+            return
+        client = await self.client()
+        if not await client.collection_exists(collection):
+            await client.create_collection(collection_name=collection, **_qdrant_collection_config(collection, size))
+            print(f"[QDRANT] ✅ Collection '{collection}' created successfully.")
+        self._collections.add(collection)
+
+    async def upsert(self, collection, ids, vectors, payloads=None, wait=True):
+        from qdrant_client.http import models as qdrant
+
+        client = await self.client()
+        await client.upsert(
+            collection_name=collection,
+            points=qdrant.Batch(ids=ids, vectors=vectors, payloads=payloads),
+            wait=wait,
+        )
+
+    async def ensure_payload_index(self, collection, field, kind="keyword"):
+        if (collection, field) in self._indexes:
+            return
+        client = await self.client()
+        await client.create_payload_index(collection_name=collection, field_name=field,
+                                          field_schema=_qdrant_schema(kind), wait=True)
+        self._indexes.add((collection, field))
+
+    async def search(self, collection, vector, top_k=5, with_payload=True,
+                     query_filter=None, score_threshold=None, with_vectors=False):
+        client = await self.client()
+        return await client.search(
+            collection_name=collection,
+            query_vector=vector,
+            query_filter=_qdrant_filter(query_filter),
+            limit=top_k,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            score_threshold=score_threshold,
+            search_params=_qdrant_search_params(collection),
+        )
+
+    async def is_alive(self, collection):
+        try:
+            await (await self.client()).get_collection(collection)
+            return True
+        except Exception:
+            return False
+
+
+# -----------------------------------------------------------------------------
+# 💾 Local FAISS + sidecar payload store
+# -----------------------------------------------------------------------------
+def _normalize(vectors) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, np.shape(vectors)[-1])
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def _payload_expr(field: str) -> str:
+    if not _FIELD_NAME.match(field):
+        raise ValueError(f"[FAISS] Unsupported payload field name: {field!r}")
+    return f"json_extract(payload, '$.{field}')"
+
+
+def _sql_filter(query_filter: Dict[str, Any]):
+    """Neutral filter dict → (WHERE clause, params) over the sidecar payload JSON."""
+    clauses, params = [], []
+    for field, cond in query_filter.items():
+        expr = _payload_expr(field)
+        if isinstance(cond, dict):
+            for op, sql in (("gte", ">="), ("lte", "<=")):
+                if cond.get(op) is not None:
+                    clauses.append(f"{expr} {sql} ?")
+                    params.append(cond[op])
+        elif isinstance(cond, (list, tuple, set)):
+            cond = list(cond)
+            clauses.append(f"{expr} IN ({','.join('?' * len(cond))})" if cond else "0")
+            params.extend(cond)
+        else:
+            clauses.append(f"{expr} = ?")
+            params.append(cond)
+    return " AND ".join(clauses) or "1", params
+
+
+class _FaissCollection:
+    def __init__(self, root: str, name: str, size: int, index_type: str, quantization: str = "none"):
+        self.name = name
+        self.size = size
+        self.index_type = index_type
+        self.quantization = quantization
+        self.binary = quantization == "binary"
+        suffix = "" if quantization == "none" else f".{quantization}"
+        self.index_path = os.path.join(root, f"{name}{suffix}.faiss")
+        self.index_key = f"index:{os.path.basename(self.index_path)}"  # meta: generation the file was written at
+        self.lock = StoreLock(os.path.join(root, f"{name}.lock"))
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+        self.db = sqlite3.connect(os.path.join(root, f"{name}.sqlite"), check_same_thread=False, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS points ("
+            " point_id TEXT PRIMARY KEY, row INTEGER NOT NULL, payload TEXT, vector BLOB NOT NULL)"
+        )
+        self.db.execute("CREATE UNIQUE INDEX IF NOT EXISTS points_row ON points(row)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        self.db.commit()
+        with self.lock:
+            if self._meta("live") is None:
+                self._set_meta("live", self.db.execute("SELECT COUNT(*) FROM points").fetchone()[0])
+                self.db.commit()
+            self._load()
+
+    def _meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _new_index(self):
+        flat = self.index_type == "flat"
+        if self.binary and self.size % 8:
+            raise ValueError(f"[FAISS] Binary quantization needs a dimension divisible by 8 (got {self.size})")
+        if self.binary:  # Hamming distance over sign bits
+            index = faiss.IndexBinaryFlat(self.size) if flat else faiss.IndexBinaryHNSW(self.size, FAISS_HNSW_M)
+        elif self.quantization == "int8":
+            qtype = faiss.ScalarQuantizer.QT_8bit
+            index = (faiss.IndexScalarQuantizer(self.size, qtype, faiss.METRIC_INNER_PRODUCT) if flat else
+                     faiss.IndexHNSWSQ(self.size, qtype, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT))
+        else:
+            index = faiss.IndexFlatIP(self.size) if flat else \
+                faiss.IndexHNSWFlat(self.size, FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        if hasattr(index, "hnsw"):
+            index.hnsw.efSearch = FAISS_EF_SEARCH
+        return index
+
+    def _index_add(self, vectors):
+        if self.binary:
+            self.index.add(np.packbits(vectors > 0, axis=1))
+            return
+        if not self.index.is_trained:
+            # int8 learns per-dimension ranges; too few vectors would clip later ones, so pad to [-1, 1].
+            sample = vectors if len(vectors) >= FAISS_SQ_MIN_TRAIN else \
+                np.vstack([vectors, -np.ones((1, self.size), np.float32), np.ones((1, self.size), np.float32)])
+            self.index.train(sample)
+        self.index.add(vectors)
+
+    def _index_search(self, query, k):
+        """(scores, rows) from the index; for binary the score is the negated Hamming distance."""
+        if self.binary:
+            distances, rows = self.index.search(np.packbits(query > 0, axis=1), k)
+            return -distances.astype(np.float32), rows
+        return self.index.search(query, k)
+
+    def _load(self):
+        """(Re)load the index file if it was written for the sidecar's current generation, then replay."""
+        self.generation = self._meta("generation", 0)
+        self.index = None
+        if os.path.exists(self.index_path) and self._meta(self.index_key, 0) == self.generation:
+            try:
+                self.index = faiss.read_index_binary(self.index_path) if self.binary else faiss.read_index(self.index_path)
+                if self.index.d != self.size:
+                    self.index = None
+            except RuntimeError as e:
+                print(f"[FAISS] ⚠️ Index for '{self.name}' unreadable ({e}) — rebuilding from sidecar.")
+                self.index = None
+        if self.index is None:
+            self.index = self._new_index()
+        if hasattr(self.index, "hnsw"):
+            self.index.hnsw.efSearch = FAISS_EF_SEARCH
+        self.dirty = False
+        self._replay()
+
+    def _replay(self):
+        """Add sidecar rows the index is behind on (crash before flush, or another process's upserts).
+
+        Index positions are sidecar rows, so rows that were already tombstoned
+        get zero-vector placeholders; searches drop them like any tombstone.
+        """
+        self.live = self._meta("live", 0)
+        end = self.db.execute("SELECT COALESCE(MAX(row), -1) FROM points").fetchone()[0] + 1
+        while self.index.ntotal < end:
+            start = self.index.ntotal
+            block = np.zeros((min(end - start, FAISS_REPLAY_CHUNK), self.size), np.float32)
+            for row, vec in self.db.execute("SELECT row, vector FROM points WHERE row >= ? AND row < ?",
+                                            (start, start + len(block))):
+                block[row - start] = np.frombuffer(vec, dtype=np.float32)
+            self._index_add(block)
+            self.dirty = True
+
+    def _sync(self):
+        """Catch up with the sidecar before touching the index; call with ``self.lock`` held."""
+        if self._meta("generation", 0) != self.generation:
+            self._load()  # another process rebuilt and renumbered the sidecar
+        else:
+            self._replay()
+
+    def rebuild(self):
+        """Re-create the FAISS index from the sidecar, dropping tombstoned rows.
+
+        The renumbering commits together with a new sidecar generation. The old
+        index file stops matching that generation, so if we crash before the
+        flush below, ``_load`` rebuilds from the sidecar instead of trusting it.
+        """
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self.db.execute("SELECT point_id, vector FROM points ORDER BY row").fetchall()
+                self.db.execute("UPDATE points SET row = -row - 1")  # dodge the unique index while renumbering
+                self.db.executemany("UPDATE points SET row = ? WHERE point_id = ?",
+                                    [(i, pid) for i, (pid, _) in enumerate(rows)])
+                generation = self._meta("generation", 0) + 1
+                self._set_meta("generation", generation)
+                self._set_meta("live", len(rows))
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+            self.generation = generation
+            self.index = self._new_index()
+            if rows:
+                self._index_add(np.stack([np.frombuffer(v, dtype=np.float32) for _, v in rows]))
+            self.live = len(rows)
+            self.dirty = True
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            self._sync()  # never write an index that is behind another process's
+            if not self.dirty:
+                return
+            tmp = self.index_path + ".tmp"
+            (faiss.write_index_binary if self.binary else faiss.write_index)(self.index, tmp)
+            os.replace(tmp, self.index_path)
+            self._set_meta(self.index_key, self.generation)
+            self.db.commit()
+            self.dirty = False
+            self.last_flush = time.monotonic()
+
+    def upsert(self, ids, vectors, payloads, wait):
+        vectors = _normalize(vectors)
+        payloads = payloads or [None] * len(ids)
+        keys = [str(i) for i in ids]
+        with self.lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self._sync()
+                first = self.index.ntotal  # == MAX(row) + 1 once synced
+                existing = set()
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    existing.update(r[0] for r in self.db.execute(
+                        f"SELECT point_id FROM points WHERE point_id IN ({','.join('?' * len(chunk))})", chunk))
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO points (point_id, row, payload, vector) VALUES (?, ?, ?, ?)",
+                    [(key, first + i, json.dumps(payload, default=str) if payload is not None else None, vec.tobytes())
+                     for i, (key, payload, vec) in enumerate(zip(keys, payloads, vectors))],
+                )
+                live = self.live + len(set(keys)) - len(existing)
+                self._set_meta("live", live)
+                self.db.commit()
+            except BaseException:
+                self.db.rollback()
+                raise
+            self._index_add(vectors)
+            self.live = live
+            self.dirty = True
+            tombstones = self.index.ntotal - self.live
+            if tombstones > FAISS_REBUILD_RATIO * max(self.index.ntotal, 1):
+                self.rebuild()
+            elif wait and time.monotonic() - self.last_flush >= FAISS_FLUSH_INTERVAL:
+                self.flush()
+
+    def ensure_payload_index(self, field):
+        with self.lock:
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS points_payload_{field} ON points({_payload_expr(field)})")
+            self.db.commit()
+
+    def search(self, vector, top_k, with_payload, query_filter=None, score_threshold=None, with_vectors=False):
+        query = _normalize(vector)
+        where, params = _sql_filter(query_filter) if query_filter else ("1", [])
+        with self.lock:
+            self._sync()
+            total = self.index.ntotal
+            if not total:
+                return []
+            matched = self.live
+            if query_filter:
+                matched = self.db.execute(f"SELECT COUNT(*) FROM points WHERE {where}", params).fetchone()[0]
+                if matched <= FAISS_EXACT_FILTER_MAX:
+                    return self._exact_search(query, top_k, where, params, with_payload, score_threshold, with_vectors)
+
+            # Over-fetch past tombstones, the expected share of rows the filter rejects and,
+            # for quantized indexes, enough extra candidates for float rescoring to reorder.
+            rescore = self.quantization != "none"
+            wanted = int(np.ceil(top_k * OVERSAMPLING[self.quantization]))
+            k = min(total, wanted * max(1, self.live // max(matched, 1)) + (total - self.live))
+            while True:
+                scores, rows = self._index_search(query, k)
+                ranked = [(int(r), float(s)) for r, s in zip(rows[0], scores[0]) if r >= 0]
+                found = self._rows([r for r, _ in ranked], where, params, with_vectors or rescore)
+                if len(found) >= wanted or k >= total:
+                    break
+                k = min(total, k * 2)
+
+        if rescore and found:
+            rows = list(found)
+            exact = np.stack([np.frombuffer(found[r][2], dtype=np.float32) for r in rows]) @ query[0]
+            ranked = sorted(zip(rows, exact.tolist()), key=lambda item: -item[1])
+            if not with_vectors:
+                found = {r: (pid, payload, None) for r, (pid, payload, _) in found.items()}
+
+        hits = []
+        for row, score in ranked:
+            if row not in found:
+                continue  # tombstoned by a later upsert of the same id, or filtered out
+            if score_threshold is not None and score < score_threshold:
+                break
+            pid, payload, vec = found[row]
+            hits.append(self._hit(pid, score, payload, vec, with_payload))
+            if len(hits) == top_k:
+                break
+        return hits
+
+    def _rows(self, rows, where, params, with_vectors):
+        found = {}
+        columns = "row, point_id, payload, vector" if with_vectors else "row, point_id, payload, NULL"
+        for i in range(0, len(rows), 500):
+            chunk = rows[i:i + 500]
+            for row, pid, payload, vec in self.db.execute(
+                    f"SELECT {columns} FROM points WHERE row IN ({','.join('?' * len(chunk))}) AND {where}",
+                    chunk + params):
+                found[row] = (pid, payload, vec)
+        return found
+
+    def _exact_search(self, query, top_k, where, params, with_payload, score_threshold, with_vectors):
+        rows = self.db.execute(f"SELECT point_id, payload, vector FROM points WHERE {where}", params).fetchall()
+        if not rows:
+            return []
+        scores = np.stack([np.frombuffer(v, dtype=np.float32) for _, _, v in rows]) @ query[0]
+        order = np.argsort(-scores)[:top_k]
+        return [self._hit(rows[i][0], float(scores[i]), rows[i][1], rows[i][2] if with_vectors else None, with_payload)
+                for i in order if score_threshold is None or scores[i] >= score_threshold]
+
+    @staticmethod
+    def _hit(pid, score, payload, vec, with_payload):
+        return ScoredPoint(_external_id(pid), score,
+                           json.loads(payload) if with_payload and payload else None,
+                           np.frombuffer(vec, dtype=np.float32).tolist() if vec is not None else None)
+
+
+def _external_id(point_id: str):
+    return int(point_id) if point_id.isdigit() else point_id
+
+
+class FaissBackend(VectorBackend):
+    name = "faiss"
+
+    def __init__(self, root: str = FAISS_DIR, index_type: str = FAISS_INDEX_TYPE):
+        if not FAISS_ENABLED:
+            raise ImportError("faiss is not installed (pip install faiss-cpu)")
+        self.root = root
+        self.index_type = index_type
+        self._collections: Dict[str, _FaissCollection] = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        atexit.register(self.flush)
+
+    def _collection(self, collection, size=None):
+        with self._lock:
+            coll = self._collections.get(collection)
+            if coll is None:
+                if size is None:
+                    raise KeyError(f"[FAISS] Collection '{collection}' was never ensured")
+                coll = self._collections[collection] = _FaissCollection(self.root, collection, size, self.index_type,
+                                                                        quantization_for(collection))
+            return coll
+
+    def ensure_collection(self, collection, size):
+        self._collection(collection, size)
+
+    def upsert(self, collection, ids, vectors, payloads=None, wait=True):
+        if len(ids):
+            self._collection(collection, np.shape(vectors)[-1]).upsert(ids, vectors, payloads, wait)
+
+    def ensure_payload_index(self, collection, field, kind="keyword"):
+        self._collection(collection).ensure_payload_index(field)  # SQLite compares by value; kind is informational
+
+    def search(self, collection, vector, top_k=5, with_payload=True,
+               query_filter=None, score_threshold=None, with_vectors=False):
+        return self._collection(collection, len(vector)).search(vector, top_k, with_payload,
+                                                                query_filter, score_threshold, with_vectors)
+
+    def is_alive(self, collection):
+        return os.access(self.root, os.W_OK)
+
+    def flush(self):
+        for coll in list(self._collections.values()):
+            try:
+                coll.flush()
+            except Exception as e:
+                print(f"[FAISS] ❌ Flush failed for '{coll.name}': {e}")
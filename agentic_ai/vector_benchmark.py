@@ -0,0 +1,126 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: agentic_ai/vector_benchmark.py
+# Purpose: Recall / latency / size comparison of vector quantization modes
+# ============================================================
+
+"""Benchmark the FAISS backend's quantization modes on our own trace log.
+
+    python -m agentic_ai.vector_benchmark --limit 50000 --queries 500 --index hnsw
+
+The last ``--queries`` traces are held out as queries; the rest are indexed
+once per mode (``none``, ``int8``, ``binary``) in a throwaway directory.
+Ground truth is exact cosine top-k over the float32 embeddings, so
+``recall@k`` measures what quantization (and HNSW) loses after rescoring.
+Sizes are the on-disk index files, i.e. what the index holds in RAM; the
+float vectors used for rescoring stay in the SQLite sidecar.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+import numpy as np
+
+from core_layer.embedding_service import get_embedder
+from core_layer.jsonl_reader import iter_jsonl_range
+from agentic_ai.vector_backends import FaissBackend, OVERSAMPLING, QUANTIZATION_MODES, set_quantization
+from agentic_ai.vectorize_reasoning import LOG_PATH, EMBED_MODEL
+
+BENCH_COLLECTION = "quantization_benchmark"
+
+
+def load_trace_texts(path, limit):
+    texts = []
+    for _, trace in iter_jsonl_range(str(path)):
+        text = (trace.get("output") or trace.get("input") or "").strip() if isinstance(trace, dict) else ""
+        if text:
+            texts.append(text)
+            if len(texts) >= limit:
+                break
+    return texts
+
+
+def exact_top_k(corpus, queries, k):
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, min(k, corpus.shape[0] - 1), axis=1)[:, :k]
+    order = np.take_along_axis(scores, top, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(top, order, axis=1)
+
+
+def run_mode(mode, corpus, queries, truth, k, index_type, batch=1000):
+    root = tempfile.mkdtemp(prefix=f"tex_vecbench_{mode}_")
+    try:
+        set_quantization(BENCH_COLLECTION, mode)
+        backend = FaissBackend(root=root, index_type=index_type)
+        backend.ensure_collection(BENCH_COLLECTION, corpus.shape[1])
+        started = time.perf_counter()
+        for i in range(0, len(corpus), batch):
+            backend.upsert(BENCH_COLLECTION, list(range(i, min(i + batch, len(corpus)))), corpus[i:i + batch], wait=False)
+        backend.flush()
+        build_s = time.perf_counter() - started
+
+        latencies, recalls = [], []
+        for query, expected in zip(queries, truth):
+            started = time.perf_counter()
+            hits = backend.search(BENCH_COLLECTION, query.tolist(), top_k=k, with_payload=False)
+            latencies.append((time.perf_counter() - started) * 1000)
+            recalls.append(len({hit.id for hit in hits} & set(expected.tolist())) / k)
+
+        index_bytes = os.path.getsize(backend._collection(BENCH_COLLECTION).index_path)
+        return {
+            "mode": mode,
+            "oversampling": OVERSAMPLING[mode],
+            f"recall@{k}": round(float(np.mean(recalls)), 4),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+            "build_s": round(build_s, 2),
+            "index_mib": round(index_bytes / (1024 * 1024), 2),
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--log", default=str(LOG_PATH), help="reasoning trace log (JSONL)")
+    parser.add_argument("--limit", type=int, default=20000, help="traces to read, queries included")
+    parser.add_argument("--queries", type=int, default=200, help="held-out query traces")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--index", choices=("hnsw", "flat"), default="hnsw")
+    parser.add_argument("--modes", default=",".join(QUANTIZATION_MODES))
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    texts = load_trace_texts(args.log, args.limit)
+    if len(texts) <= args.queries + args.k:
+        print(f"[VECTOR BENCH] ⚠️ Only {len(texts)} traces in {args.log} — need more than {args.queries + args.k}.")
+        return 1
+
+    print(f"[VECTOR BENCH] 🔣 Embedding {len(texts)} traces with {EMBED_MODEL}...")
+    vectors = get_embedder(EMBED_MODEL).encode(texts, batch_size=256, normalize_embeddings=True)
+    corpus, queries = vectors[:-args.queries], vectors[-args.queries:]
+    truth = exact_top_k(corpus, queries, args.k)
+    float_mib = corpus.nbytes / (1024 * 1024)
+
+    results = []
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        result = run_mode(mode, corpus, queries, truth, args.k, args.index)
+        result["reduction"] = round(float_mib / max(result["index_mib"], 1e-9), 1)
+        results.append(result)
+        if not args.json:
+            print(f"[VECTOR BENCH] {mode:>6}  recall@{args.k}={result[f'recall@{args.k}']:.4f}  "
+                  f"p50={result['p50_ms']:.2f}ms  p95={result['p95_ms']:.2f}ms  "
+                  f"index={result['index_mib']:.1f}MiB ({result['reduction']}x vs {float_mib:.1f}MiB float32)")
+    if args.json:
+        print(json.dumps({"corpus": len(corpus), "queries": len(queries), "index": args.index,
+                          "float32_mib": round(float_mib, 2), "results": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
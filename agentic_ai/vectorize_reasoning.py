@@ -15,20 +15,30 @@
 #        • retries on failure
 #        • guarantees the collection exists
 # 2. Model / paths are configurable via env-vars.
+# 3. `batch_index` reads the log through the memory store from an
+#    entry-number watermark (stable across segment rolls), batch-encodes,
+#    and pipelines upserts with bounded concurrency; point IDs are
+#    content-derived so reruns are idempotent.
 # ===========================================================
 
 from __future__ import annotations
 
 import json
 import os
+import uuid
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Dict, Any
 
-from sentence_transformers import SentenceTransformer
+from core_layer.embedding_service import get_embedder
+from core_layer.memory_store import MemoryStore
 
 from agentic_ai.qdrant_vector_memory import (
     upsert_embeddings,
+    enqueue_embeddings,
     _ensure_collection,          # re-use the idempotent bootstrap
 )
 
@@ -38,49 +48,120 @@ from agentic_ai.qdrant_vector_memory import (
 LOG_PATH      = Path(os.getenv("TEX_TRACE_LOG", "memory_archive/reasoning_trace_log.jsonl"))
 COLLECTION    = os.getenv("TEX_REASONING_COLLECTION", "tex_reasoning_memory")
 EMBED_MODEL   = os.getenv("TEX_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+CHECKPOINT    = Path(os.getenv("TEX_TRACE_INDEX_CHECKPOINT", "memory_archive/.reasoning_index.checkpoint.json"))
+INDEX_BATCH   = int(os.getenv("TEX_INDEX_BATCH", "256"))        # texts per encode + upsert
+INDEX_WORKERS = int(os.getenv("TEX_INDEX_CONCURRENCY", "4"))    # upserts in flight
+
+# The trace log is a memory-store domain: <root>/<domain>.jsonl plus rolled segments
+TRACE_DOMAIN  = LOG_PATH.name[:-len(".jsonl")] if LOG_PATH.name.endswith(".jsonl") else LOG_PATH.name
+_store        = MemoryStore(str(LOG_PATH.parent))
 
 # ---------------------------------------------------------------------
-# 🔣 Embedding model
+# 🔣 Embedding model (process-wide, loaded on first encode)
 # ---------------------------------------------------------------------
-embedder = SentenceTransformer(EMBED_MODEL)
-VECTOR_DIM = embedder.get_sentence_embedding_dimension()
+embedder = get_embedder(EMBED_MODEL)
 
 # ---------------------------------------------------------------------
 # 🚀 Batch indexing
 # ---------------------------------------------------------------------
-def _load_trace_lines() -> List[Dict[str, Any]]:
-    if not LOG_PATH.exists():
-        print(f"[⚠️] No trace log found at {LOG_PATH}")
-        return []
-    with LOG_PATH.open("r", encoding="utf-8") as f:
-        return [json.loads(line) for line in f if line.strip()]
-
-
 def _vec(text: str) -> List[float]:
     return embedder.encode(text, normalize_embeddings=True).tolist()
 
 
-def batch_index() -> None:
+def _point_id(payload: Dict[str, Any]) -> str:
+    """Deterministic UUID from the payload content – the same trace always maps to the same point."""
+    digest = hashlib.blake2b(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"),
+                             digest_size=16).digest()
+    return str(uuid.UUID(bytes=digest))
+
+
+def _load_checkpoint() -> int:
+    """Entry number already indexed; 0 when the log shrank or the checkpoint is for something else."""
+    if not CHECKPOINT.exists():
+        return 0
+    try:
+        state = json.loads(CHECKPOINT.read_text())
+    except (OSError, ValueError):
+        return 0
+    if state.get("root") != str(LOG_PATH.parent) or state.get("domain") != TRACE_DOMAIN or "position" not in state:
+        print("[🟡] Checkpoint is for another log or predates entry-number checkpoints – indexing from the start")
+        return 0
+    if state["position"] > _store.count(TRACE_DOMAIN):
+        print("[🟡] Trace log shrank – indexing it from the start")
+        return 0
+    return state["position"]
+
+
+def _save_checkpoint(position: int) -> None:
+    CHECKPOINT.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CHECKPOINT.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"root": str(LOG_PATH.parent), "domain": TRACE_DOMAIN, "position": position}))
+    os.replace(tmp, CHECKPOINT)
+
+
+def _iter_batches(start: int, batch_size: int):
+    """Yield (next entry number, [(text, trace)]) chunks of non-empty traces from entry `start`."""
+    stop = _store.count(TRACE_DOMAIN)
+    for lo in range(start, stop, batch_size):
+        hi = min(lo + batch_size, stop)
+        batch = []
+        for trace in _store.slice(TRACE_DOMAIN, lo, hi):
+            text = (trace.get("output") or trace.get("input") or "").strip() if isinstance(trace, dict) else ""
+            if text:
+                batch.append((text, trace))
+        yield hi, batch
+
+
+def batch_index(batch_size: int = INDEX_BATCH, concurrency: int = INDEX_WORKERS) -> int:
+    """
+    Index lines appended since the last run; returns how many traces were upserted.
+
+    Batches are encoded on this thread while up to `concurrency` upserts run
+    in the pool. The watermark only advances past a batch once it and every
+    batch before it were stored, so a crash or failed upsert resumes there.
+    """
+    if not _store.count(TRACE_DOMAIN):
+        print(f"[⚠️] No trace log found at {LOG_PATH}")
+        return 0
     _ensure_collection()                     # idempotent
-    lines = _load_trace_lines()
-    if not lines:
-        return
-
-    ids, vecs, payloads = [], [], []
-    for trace in lines:
-        text = (trace.get("output") or trace.get("input") or "").strip()
-        if not text:
-            continue
-
-        ids.append(trace.get("id") or len(ids))     # fallback id
-        vecs.append(_vec(text))
-        payloads.append(trace)
-
-    if ids:
-        upsert_embeddings(ids, vecs, payloads)
-        print(f"[🧠] Indexed {len(ids)} reasoning traces → Qdrant")
+
+    start = _load_checkpoint()
+    indexed, watermark, failed = 0, start, False
+    in_flight = deque()
+
+    def settle(max_in_flight: int) -> None:
+        nonlocal indexed, watermark, failed
+        while in_flight and (len(in_flight) > max_in_flight or in_flight[0][0].done()):
+            future, end, n = in_flight.popleft()
+            if not future.result():
+                failed = True
+            if failed:
+                continue                     # never advance past a failed batch
+            indexed += n
+            watermark = end
+            _save_checkpoint(watermark)
+
+    with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix="reasoning-index") as pool:
+        for end, batch in _iter_batches(start, batch_size):
+            if failed:
+                break
+            if not batch:
+                in_flight.append((pool.submit(lambda: True), end, 0))
+            else:
+                vecs = embedder.encode([t for t, _ in batch], batch_size=batch_size, normalize_embeddings=True)
+                payloads = [trace for _, trace in batch]
+                in_flight.append((pool.submit(upsert_embeddings, [_point_id(p) for p in payloads],
+                                              vecs.tolist(), payloads), end, len(batch)))
+            settle(max(concurrency, 1))
+        settle(0)
+
+    if failed:
+        print(f"[❌] Indexing stopped at entry {watermark} after {indexed} traces – rerun to resume")
+    elif indexed:
+        print(f"[🧠] Indexed {indexed} reasoning traces → Qdrant (watermark {watermark})")
     else:
-        print("[🟡] Nothing to index – no text payloads found")
+        print("[🟡] Nothing new to index")
+    return indexed
 
 
 # ---------------------------------------------------------------------
@@ -88,22 +169,22 @@ def batch_index() -> None:
 # ---------------------------------------------------------------------
 def store_reasoning(text: str) -> None:
     """
-    Vectorise `text` and push it to Qdrant immediately.
-    Call this from your live pipeline (e.g. inside tex_core).
+    Vectorise `text` and queue it for a batched background upsert.
+    Call this from your live pipeline (e.g. inside tex_core) – it never
+    waits on a Qdrant round trip unless the upsert queue is full.
     """
-    _ensure_collection()
-
     vec = _vec(text)
     now = datetime.now(timezone.utc)
-    upsert_embeddings(
-        ids      = [int(now.timestamp() * 1000)],     # millisecond epoch
+    payload = {
+        "output": text,
+        "timestamp": now.isoformat(timespec="seconds")
+    }
+    enqueue_embeddings(
+        ids      = [_point_id(payload)],
         vectors  = [vec],
-        payloads = [{
-            "output": text,
-            "timestamp": now.isoformat(timespec="seconds")
-        }],
+        payloads = [payload],
     )
-    print("[VECTOR STORAGE] 🧠 Stored live reasoning vector → Qdrant")
+    print("[VECTOR STORAGE] 🧠 Queued live reasoning vector → Qdrant")
 
 
 # ---------------------------------------------------------------------
@@ -25,6 +25,7 @@ from core_layer.emotion_heuristics import evaluate_emotion_state
 from core_layer.tex_self_eval_matrix import TexSelfEvalMatrix
 from core_layer.tex_consciousness_matrix import TexConsciousnessMatrix
 from core_layer.meta_coherence_loop import MetaCoherenceLoop
+from core_layer.stage_profiler import CycleTrace
 from core_layer.goal_engine import (
     save_new_goal,
     clear_all_goals,
@@ -172,24 +173,31 @@ class TexConversationalBrain:
         
     def start_breathing_cycle(self):
         def breathing_loop():
+            trace = CycleTrace("breathing")
             while True:
+                trace.lap("think")
                 thought, emotional_state = think(self)
+                trace.lap("speech")
                 cognitive_output, reasoned_emotion = generate_reasoned_speech(self)
                 if decide_to_speak(reasoned_emotion):
                     self.speak(cognitive_output, reasoned_emotion)
                 else:
                     print("[TEX] 🤐 Holding silence — internal volatility detected.")
 
+                trace.lap("coherence_log")
                 self.coherence_tracker.log_thought(self.last_spoken_thought)
+                trace.lap("debate")
                 # ✅ AEI: Internal Debate Chamber
                 try:
                     run_internal_debate(self.cycle_counter)
                 except Exception as e:
                     print(f"[INTERNAL DEBATE ERROR] {e}")
 
+                trace.lap("bias")
                 # ✅ AEI: Bias Awareness Logger
                 monitor_bias_drift(self.cycle_counter)  
 
+                trace.lap("coherence_eval")
                 if self.cycle_counter % 3 == 0:
                     try:
                         coherence_score = self.coherence_tracker.evaluate()
@@ -197,6 +205,7 @@ class TexConversationalBrain:
                     except Exception as e:
                         print(f"[COHERENCE ERROR] {e}")
 
+                trace.lap("store_memory")
                 self.memory_consolidator.store_cycle_memory(
                     cycle_id=self.cycle_counter,
                     reasoning=self.last_spoken_thought,
@@ -205,6 +214,7 @@ class TexConversationalBrain:
                     coherence=TEXPULSE.get("coherence"),
                     goals=get_active_goals()
                 )
+                trace.lap("mutators")
                 # ✅ Stability Mutation Trigger
                 try:
                     stability_result = self.stability_mutator.evaluate(
@@ -227,6 +237,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[EXPLORATION MUTATOR ERROR] {e}")    
                 if self.cycle_counter % 5 == 0:
+                    trace.lap("periodic")
                     self.memory_consolidator.consolidate()
                     try:
                         self_heal_memory()
@@ -319,6 +330,7 @@ class TexConversationalBrain:
 
                         except Exception as e:
                             print(f"[MUTATION SIM ERROR] {e}")
+                trace.lap("vortex")
                 # ✅ VORTEX STRATEGIC EXPLANATION LAYER
                 try:
                     mutation_risk = self.future_engine.last_future_report.get("mutation_risk", 0.0)
@@ -341,6 +353,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[VORTEX ERROR] Could not evaluate internal state: {e}")
 
+                trace.lap("self_eval")
                 try:
                     self.evaluator.evaluate({
                         "thought": self.last_spoken_thought,
@@ -352,12 +365,14 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[SELF EVAL] ⚠️ Error during self-evaluation: {e}")
 
+                trace.lap("goal_inference")
                 try:
                     for goal in get_active_goals():
                         self.goal_inferencer.infer_reason(goal, TEXPULSE.get("emotional_state"), TEXPULSE.get("urgency"), 0.75)
                 except Exception as e:
                     print(f"[GOAL INFERENCE ERROR] {e}")
 
+                trace.lap("codex")
                 try:
                     self.codex_sync.validate_codex()
                 except Exception as e:
@@ -378,6 +393,7 @@ class TexConversationalBrain:
                         )
                 except Exception as e:
                     print(f"[CODEX MUTATION LOGGER ERROR] {e}")
+                trace.lap("meta_goals")
                 # ✅ AEI: Meta Goal Fusion
                 try:
                     fused = fuse_goals()
@@ -386,6 +402,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[META GOAL FUSER ERROR] {e}")
 
+                trace.lap("ontology")
                 # ✅ AEI: Ontology Mapping
                 try:
                     mappings = map_ontology()
@@ -394,6 +411,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[ONTOLOGY MAPPER ERROR] {e}")
                 
+                trace.lap("reflexes")
                 # ✅ AEI: Quantum Reflex Trigger
                 try:
                     contradiction_score = 0.85 if self.cycle_counter % 4 == 0 else 0.3  # Simulated example
@@ -412,6 +430,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[REGRET REFLEX ERROR] {e}")
 
+                trace.lap("forecast_drift")
                 try:
                     foresight = self.future_engine.last_future_report.get("foresight", {})
                     print(f"[STRATEGIC FORESIGHT] 🔮 Projected: {foresight.get('projected_future')} | Confidence: {foresight.get('confidence')}")
@@ -431,6 +450,7 @@ class TexConversationalBrain:
                     print(f"[TEST] Forecast drift log failed: {e}")
 
 
+                trace.lap("fork_mutation")
                 # === Mutation Trigger: Fork Alpha Strategies ===
                 variants = self.fork_mutator.mutate_strategies(
                     self.future_engine.last_future_report.get("portfolio", {}),
@@ -499,6 +519,7 @@ class TexConversationalBrain:
                     self.codex_compiler.compile(fused_fragments, context="fork_mutation_reflection")
                 except Exception as e:
                     print(f"[CODEX COMPILER ERROR] {e}")
+                trace.lap("sandbox")
                 # ✅ Run sandbox validation before proceeding
                 try:
                     strategy_label = dominant_variant.get("strategy_label", "balanced")  # Placeholder
@@ -559,6 +580,7 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[SANDBOX VALIDATION ERROR] {e}")
 
+                trace.lap("live_sync")
                 # ✅ Sync cognition to dashboard — fallback if Tex hasn’t spoken this cycle
                 try:
                     live_thought = self.last_spoken_thought or "🧠 No explicit output this cycle. Continuing autonomous reasoning..."
@@ -566,17 +588,20 @@ class TexConversationalBrain:
                 except Exception as e:
                     print(f"[LIVE DASHBOARD SYNC ERROR] {e}")
 
+                trace.lap("emotional_drift")
                 # 🌀 Emotional drift should happen once per cycle
                 try:
                     drift_emotional_state()
                 except Exception as e:
                     print(f"[EMOTIONAL DRIFT ERROR] {e}")
 
+                trace.lap("self_debug")
                 try:
                     self.debugger.scan_for_contradictions()
                 except Exception as e:
                     print(f"[SELF-DEBUG ERROR] {e}")
 
+                trace.end()
                 self.cycle_counter += 1
                 time.sleep(3)  # Adjust as needed for cognition pacing
                 
@@ -12,6 +12,10 @@ from core_layer.meta_coherence_loop import MetaCoherenceLoop
 from core_layer.memory_consolidator import MemoryConsolidator
 
 COLLAPSE_LOG = "memory_archive/memory_collapse_log.jsonl"
+# Coherence is embedding cosine (core_layer.thought_similarity). The old 0.4 cut
+# sat just above what difflib gave unrelated thoughts (~0.27); 0.25 keeps the
+# same margin over unrelated cosine (~0.1).
+COLLAPSE_THRESHOLD = float(os.getenv("TEX_COLLAPSE_THRESHOLD", "0.25"))
 
 class MemoryCollapseDaemon:
     def __init__(self):
@@ -20,7 +24,7 @@ class MemoryCollapseDaemon:
 
     def detect_fracture(self):
         score = self.coherence.evaluate()
-        if score < 0.4:
+        if score < COLLAPSE_THRESHOLD:
             print(f"[MEMORY COLLAPSE] ⚠️ Coherence dropped to {score:.3f} — initiating purge")
             self._collapse()
         else:
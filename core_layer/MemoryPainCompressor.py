@@ -16,6 +16,7 @@ class MemoryPainCompressor:
         self.baseline_emotion = TEXPULSE.get("emotional_state", "neutral")
 
     def compress_pain_from(self, collapse_event: dict):
+        self.baseline_emotion = TEXPULSE.get("emotional_state", self.baseline_emotion)
         regret = 0.3 if "purged_threads" in collapse_event else 0.1
         intensity = 0.2 + regret
 
@@ -18,12 +18,14 @@ class TimeForkRepeater:
     def loop_event(self, base_event, iterations=5):
         print(f"[TIMEFORK] ⏳ Repeating event: '{base_event['event']}' for {iterations} forks...")
 
+        forks = []
         for i in range(iterations):
             fork = self._mutate(base_event, i)
-            self.variants.append(fork)
+            forks.append(fork)
             store_to_memory("time_fork_repeat", fork)
             self._log_fork(fork)
 
+        self.variants = forks  # latest loop only: the repeater is long-lived
         return self.variants
 
     def _mutate(self, event, index):
@@ -0,0 +1,245 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/cycle_scheduler.py
+# Purpose: Dependency-aware, deadline-bounded stage scheduler for cognitive cycles
+# ============================================================
+
+"""Run one cognitive cycle as a graph of stages on a thread pool.
+
+Each ``Stage`` declares the context keys it reads (``inputs``) and writes
+(``outputs``). A stage can also declare plain ordering constraints
+(``after``). The stage function receives the cycle context dict and returns
+a dict of its outputs, or nothing. Only the scheduler thread merges outputs
+into the context.
+
+A stage starts as soon as everything it depends on has finished:
+    inputs   every producing stage finished ``ok`` and the keys are present;
+             a stage may leave an output out on purpose (the reflex gate
+             does this) to skip everything downstream
+    after    the named stages finished, whatever their status
+
+Per cycle, a stage ends with one of these statuses:
+    ok                ran and returned
+    not_due           ``every=N`` and this cycle is not a multiple of N
+    skipped_inputs    a producer failed or an input key is missing
+    skipped_deadline  optional stage whose typical run time (EWMA) no longer
+                      fits the budget
+    busy              its previous run overran and is still going
+    timeout           still running past its own ``timeout``
+    overrun           optional stage still running when the budget ran out
+    error             raised, and the exception was logged
+
+Only optional stages give way to the budget. A ``skippable=False`` stage is
+always started once its dependencies settle and is waited for up to its own
+``timeout``, so a required chain can stretch a cycle past the budget rather
+than silently not run.
+
+A stage's first run is not folded into its EWMA: it usually pays for lazy
+imports or model loads that later runs never see. The EWMA is clamped to
+the stage's ``timeout`` and decays by
+``TEX_STAGE_SKIP_DECAY`` every time the stage is skipped for the deadline,
+so one slow run cannot starve a stage for good: it is retried once its
+estimate fits again, and the new measurement takes over. A stage that sits
+behind a required chain finishing late would still lose every cycle, so
+after ``TEX_STAGE_MAX_SKIPS`` deadline skips in a row it is started anyway
+and waited for like a required stage.
+
+Every stage run is recorded by ``core_layer.stage_profiler`` under the
+scheduler's name, so per-stage percentiles are available beside the
+per-cycle report.
+
+Threads cannot be cancelled. A stage that timed out or overran keeps running
+in the background, its late outputs are dropped, and it reports ``busy``
+until it finishes, so slow stages never pile up.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from core_layer.stage_profiler import profile_stage
+
+# === Config (env overrideable)
+CYCLE_BUDGET = float(os.getenv("TEX_CYCLE_BUDGET", "1.0"))     # seconds per cycle (1 Hz)
+CYCLE_WORKERS = int(os.getenv("TEX_CYCLE_WORKERS", "8"))
+STAGE_TIMEOUT = float(os.getenv("TEX_STAGE_TIMEOUT", "0.8"))
+EWMA_ALPHA = 0.3
+SKIP_DECAY = float(os.getenv("TEX_STAGE_SKIP_DECAY", "0.8"))
+MAX_SKIPS = int(os.getenv("TEX_STAGE_MAX_SKIPS", "5"))          # deadline skips in a row before a forced run
+
+
+class Stage:
+    def __init__(self, name, fn, inputs=(), outputs=(), after=(), timeout=STAGE_TIMEOUT, every=1, skippable=True):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.after = tuple(after)
+        self.timeout = timeout
+        self.every = max(int(every), 1)
+        self.skippable = skippable
+        self.producers = ()  # resolved by the scheduler
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, inputs={self.inputs}, outputs={self.outputs})"
+
+
+class CycleScheduler:
+    def __init__(self, stages, budget=CYCLE_BUDGET, max_workers=CYCLE_WORKERS, name="cycle"):
+        self.stages = {}
+        self.budget = budget
+        self.name = name
+        producers = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            for key in stage.outputs:
+                if key in producers:
+                    raise ValueError(f"Output '{key}' produced by both {producers[key]} and {stage.name}")
+                producers[key] = stage.name
+            self.stages[stage.name] = stage
+        for stage in self.stages.values():
+            stage.producers = tuple(sorted({producers[k] for k in stage.inputs if k in producers}))
+            unknown = [a for a in stage.after if a not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} runs after unknown stages {unknown}")
+        self._check_acyclic()
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-stage")
+        self._in_flight = set()
+        self._lock = threading.Lock()
+        self.expected = {name: 0.0 for name in self.stages}  # EWMA of run time per stage
+        self._runs = {name: 0 for name in self.stages}
+        self._skips = {name: 0 for name in self.stages}  # consecutive deadline skips
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Stage dependency cycle: {' → '.join(path + [name])}")
+            state[name] = "visiting"
+            stage = self.stages[name]
+            for dep in stage.producers + stage.after:
+                visit(dep, path + [name])
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name, [])
+
+    def _finished(self, name, started, future):
+        duration = min(time.monotonic() - started, self.stages[name].timeout)
+        with self._lock:
+            self._in_flight.discard(name)
+            self._runs[name] += 1
+            if self._runs[name] > 1:  # the first run is a cold start
+                self.expected[name] = (1 - EWMA_ALPHA) * self.expected[name] + EWMA_ALPHA * duration
+
+    def _run(self, stage, ctx):
+        with profile_stage(self.name, stage.name):
+            return stage.fn(ctx)
+
+    def _start(self, stage, ctx):
+        started = time.monotonic()
+        with self._lock:
+            self._in_flight.add(stage.name)
+        future = self._pool.submit(self._run, stage, ctx)
+        future.add_done_callback(lambda f, n=stage.name, s=started: self._finished(n, s, f))
+        return future, started
+
+    def _gate(self, stage, ctx, status, cycle, deadline, required):
+        """Status to record without running ``stage``, or None to run it (forced runs join ``required``)."""
+        if cycle % stage.every:
+            return "not_due"
+        if any(status[p] != "ok" for p in stage.producers) or any(k not in ctx for k in stage.inputs):
+            return "skipped_inputs"
+        with self._lock:
+            if stage.name in self._in_flight:
+                return "busy"
+            if stage.skippable and time.monotonic() + self.expected[stage.name] > deadline:
+                if self._skips[stage.name] < MAX_SKIPS:
+                    self._skips[stage.name] += 1
+                    self.expected[stage.name] *= SKIP_DECAY
+                    return "skipped_deadline"
+                required.add(stage.name)  # starved long enough: run it and wait for it this cycle
+            self._skips[stage.name] = 0
+        return None
+
+    def run_cycle(self, ctx, cycle=0):
+        """
+        Run every stage once against ``ctx`` (updated in place with outputs).
+        Returns ``{"status": {stage: status}, "durations": {stage: seconds}, "elapsed": seconds}``.
+        """
+        start = time.monotonic()
+        deadline = start + self.budget
+        status, durations = {}, {}
+        pending = list(self.stages)
+        running = {}
+        required = {name for name, stage in self.stages.items() if not stage.skippable}
+
+        while True:
+            progressed = True
+            while progressed:
+                progressed = False
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(dep not in status for dep in stage.producers + stage.after):
+                        continue
+                    pending.remove(name)
+                    progressed = True
+                    verdict = self._gate(stage, ctx, status, cycle, deadline, required)
+                    if verdict is not None:
+                        status[name] = verdict
+                        continue
+                    future, started = self._start(stage, ctx)
+                    running[future] = (name, started)
+
+            if not running:
+                break
+            now = time.monotonic()
+            wake = [s + self.stages[n].timeout for n, s in running.values()]
+            if now < deadline:
+                wake.append(deadline)
+            done, _ = wait(list(running), timeout=max(0.0, min(wake) - now), return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for future in done:
+                name, started = running.pop(future)
+                durations[name] = now - started
+                try:
+                    outputs = future.result() or {}
+                    ctx.update({k: v for k, v in outputs.items() if k in self.stages[name].outputs})
+                    status[name] = "ok"
+                except Exception as e:
+                    print(f"[CYCLE SCHEDULER] ❌ Stage '{name}' failed: {e}")
+                    status[name] = "error"
+            for future, (name, started) in list(running.items()):
+                if now >= started + self.stages[name].timeout:
+                    running.pop(future)
+                    durations[name] = now - started
+                    status[name] = "timeout"
+            if now >= deadline:
+                # Optional stages give up their slot; required ones are waited for (up to their timeout).
+                for future, (name, started) in list(running.items()):
+                    if name not in required:
+                        running.pop(future)
+                        durations[name] = now - started
+                        status[name] = "overrun"
+
+        for name in pending:  # unreachable unless a dependency never resolved
+            status[name] = "skipped_inputs"
+        return {"status": status, "durations": durations, "elapsed": time.monotonic() - start}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+
+def summarize(report):
+    """One-line digest of a cycle report: slowest stages plus anything that didn't run."""
+    slow = sorted(report["durations"].items(), key=lambda kv: -kv[1])[:3]
+    parts = [f"{name} {seconds * 1000:.0f}ms" for name, seconds in slow]
+    skipped = [f"{name}:{state}" for name, state in report["status"].items() if state not in ("ok", "not_due")]
+    return " | ".join(parts) + (f" | {', '.join(skipped)}" if skipped else "")
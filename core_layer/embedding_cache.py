@@ -0,0 +1,182 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/embedding_cache.py
+# Purpose: Content-addressed embedding cache (in-memory LRU + SQLite on disk)
+# ============================================================
+
+"""Embedding cache used by ``core_layer.embedding_service``.
+
+Entries are keyed by a 128-bit hash of ``(model name, normalized text)``,
+where normalizing collapses whitespace runs and trims the ends. Vectors are
+cached un-normalized as float32; the service applies L2 normalization on the
+way out when asked.
+
+Two tiers:
+    memory   OrderedDict LRU of the most recently used vectors
+    disk     SQLite (WAL, safe across processes) at ``TEX_EMBED_CACHE_PATH``,
+             with a ``last_used`` column for size-based eviction once the
+             stored vectors exceed ``TEX_EMBED_CACHE_MAX_BYTES``
+
+Hits never write on the read path. ``last_used`` touches are buffered in
+memory and written in one statement with the next ``put_many`` commit,
+before an eviction pass, at close, or once ``TEX_EMBED_CACHE_TOUCH_BATCH``
+of them (or ``TEX_EMBED_CACHE_TOUCH_SECONDS``) have piled up.
+
+``stats`` counts memory hits, disk hits, misses and evictions.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# === Config (env overrideable)
+EMBED_CACHE_ENABLED = os.getenv("TEX_EMBED_CACHE", "1") == "1"
+EMBED_CACHE_PATH = os.getenv("TEX_EMBED_CACHE_PATH", "memory_archive/.embedding_cache.sqlite")
+EMBED_CACHE_LRU = int(os.getenv("TEX_EMBED_CACHE_LRU", "20000"))
+EMBED_CACHE_MAX_BYTES = int(os.getenv("TEX_EMBED_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+EMBED_CACHE_TOUCH_BATCH = int(os.getenv("TEX_EMBED_CACHE_TOUCH_BATCH", "1000"))
+EMBED_CACHE_TOUCH_SECONDS = float(os.getenv("TEX_EMBED_CACHE_TOUCH_SECONDS", "30"))
+EVICT_TO = 0.9  # fraction of max bytes kept after an eviction pass
+SQLITE_BATCH = 500  # keys per IN (...) lookup, under SQLite's variable limit
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def cache_key(model_name, text):
+    return hashlib.blake2b(f"{model_name}\0{normalize_text(text)}".encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    def __init__(self, model_name, path=EMBED_CACHE_PATH, lru_size=EMBED_CACHE_LRU, max_bytes=EMBED_CACHE_MAX_BYTES):
+        self.model_name = model_name
+        self.path = path
+        self.lru_size = lru_size
+        self.max_bytes = max_bytes
+        self._lru = OrderedDict()
+        self._touched = {}  # key → last_used not yet written to the disk tier
+        self._touched_since = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " key BLOB PRIMARY KEY, dim INTEGER NOT NULL, vec BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings(last_used)")
+            self._db.commit()
+            self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+
+    def _remember(self, key, vec):
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _select(self, columns, keys):
+        rows = []
+        for i in range(0, len(keys), SQLITE_BATCH):
+            chunk = keys[i:i + SQLITE_BATCH]
+            rows.extend(self._db.execute(
+                f"SELECT {columns} FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return rows
+
+    def _flush_touches(self):
+        """Write buffered ``last_used`` touches (caller commits)."""
+        if self._touched and self._db is not None:
+            self._db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?",
+                                 [(ts, key) for key, ts in self._touched.items()])
+        self._touched.clear()
+        self._touched_since = time.monotonic()
+
+    def get_many(self, texts):
+        """Cached vectors for ``texts`` (None where missing), in order."""
+        keys = [cache_key(self.model_name, t) for t in texts]
+        found = {}
+        with self._lock:
+            for key in keys:
+                vec = self._lru.get(key)
+                if vec is not None:
+                    self._lru.move_to_end(key)
+                    found[key] = vec
+            self.stats["memory_hits"] += sum(1 for key in keys if key in found)
+
+            wanted = list({key for key in keys if key not in found})
+            if wanted and self._db is not None:
+                rows = self._select("key, vec", wanted)
+                for key, blob in rows:
+                    vec = np.frombuffer(blob, dtype=np.float32).copy()
+                    found[key] = vec
+                    self._remember(key, vec)
+                self.stats["disk_hits"] += len(rows)
+            self.stats["misses"] += sum(1 for key in keys if key not in found)
+
+            if self._db is not None and found:
+                now = time.time()
+                self._touched.update((key, now) for key in found)
+                if (len(self._touched) >= EMBED_CACHE_TOUCH_BATCH
+                        or time.monotonic() - self._touched_since >= EMBED_CACHE_TOUCH_SECONDS):
+                    self._flush_touches()
+                    self._db.commit()
+        return [found.get(key) for key in keys]
+
+    def put_many(self, texts, vectors):
+        rows, now = [], time.time()
+        with self._lock:
+            for text, vec in zip(texts, vectors):
+                vec = np.asarray(vec, dtype=np.float32)
+                key = cache_key(self.model_name, text)
+                self._remember(key, vec)
+                rows.append((key, vec.shape[0], vec.tobytes(), now))
+            self.stats["stored"] += len(rows)
+            if self._db is None or not rows:
+                return
+            # Content-addressed: a key already on disk holds the same vector, so only
+            # new keys are inserted (and counted); known ones are just touched.
+            rows = list({r[0]: r for r in rows}.values())
+            existing = {key for (key,) in self._select("key", [r[0] for r in rows])}
+            new_rows = [r for r in rows if r[0] not in existing]
+            self._db.executemany("INSERT OR IGNORE INTO embeddings (key, dim, vec, last_used) VALUES (?, ?, ?, ?)",
+                                 new_rows)
+            self._touched.update((key, now) for key in existing)
+            self._flush_touches()
+            self._db.commit()
+            self._disk_bytes += sum(len(r[2]) for r in new_rows)
+            if self._disk_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used rows until the disk tier is back under ``EVICT_TO`` of the cap."""
+        total, count = self._db.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0), COUNT(*) FROM embeddings").fetchone()
+        if total <= self.max_bytes or not count:
+            self._disk_bytes = total
+            return
+        excess = total - int(self.max_bytes * EVICT_TO)
+        drop = min(count, -(-excess * count // total))  # ceil(excess / avg row size)
+        self._db.execute(
+            "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)", (drop,))
+        self._db.commit()
+        self.stats["evicted"] += drop
+        self._disk_bytes = self._db.execute("SELECT COALESCE(SUM(LENGTH(vec)), 0) FROM embeddings").fetchone()[0]
+        print(f"[EMBED CACHE] 🧹 Evicted {drop} cached embeddings ({excess / (1024 * 1024):.1f} MiB over).")
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._flush_touches()
+                self._db.commit()
+                self._db.close()
+                self._db = None
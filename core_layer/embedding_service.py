@@ -0,0 +1,373 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/embedding_service.py
+# Purpose: One lazily-loaded sentence embedding model per process, with micro-batching
+# ============================================================
+
+"""Shared embedding service.
+
+``get_embedder()`` hands every module the same ``Embedder`` for a model name.
+The SentenceTransformer is only loaded on the first ``encode`` (or dimension
+lookup), never at import. Concurrent ``encode`` calls from different threads
+are coalesced by a micro-batcher into one forward pass: a request waits at
+most ``TEX_EMBEDDING_MAX_WAIT`` seconds for others to join, up to
+``TEX_EMBEDDING_MAX_BATCH`` texts.
+
+``encode`` accepts the SentenceTransformer keyword names the call sites
+already use (``batch_size``, ``normalize_embeddings``) and returns float32
+NumPy arrays: 1-D for a single string, 2-D for a list. Any other
+SentenceTransformer option (``convert_to_tensor``, ``device``, ...) raises
+``TypeError`` rather than being silently ignored. ``batch_size`` caps the
+forward-pass batch of the call it came with; coalesced requests run at the
+smallest ``batch_size`` among them.
+
+Out-of-process mode (``TEX_EMBEDDING_MODE=socket``) keeps the model in one
+worker process shared by every Tex process on the machine:
+
+    python -m core_layer.embedding_service --serve
+
+Clients talk to it over a local Unix socket (``TEX_EMBEDDING_SOCKET``, by
+default inside a 0700 per-user runtime directory). Both sides must share an
+explicit ``TEX_EMBEDDING_AUTHKEY``: there is no default key, and socket mode
+is refused without one. Messages are JSON headers plus raw float32 bytes,
+never pickles. If the worker is unreachable or rejects the key, clients fall
+back to a local model.
+
+Every Embedder checks the content-addressed ``core_layer.embedding_cache``
+first and only sends cache misses (deduplicated) to the model.
+"""
+
+import os
+import sys
+import json
+import stat
+import queue
+import socket
+import tempfile
+import threading
+from concurrent.futures import Future
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+import numpy as np
+
+from core_layer.embedding_cache import EmbeddingCache, EMBED_CACHE_ENABLED
+
+# === Config (env overrideable)
+EMBEDDING_MODEL = os.getenv("TEX_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+EMBEDDING_MODE = os.getenv("TEX_EMBEDDING_MODE", "local")  # local | socket
+RUNTIME_DIR = os.getenv("XDG_RUNTIME_DIR") or os.path.join(tempfile.gettempdir(), f"tex-{os.getuid()}")
+EMBEDDING_SOCKET = os.getenv("TEX_EMBEDDING_SOCKET", os.path.join(RUNTIME_DIR, "tex_embedding.sock"))
+EMBEDDING_AUTHKEY = os.getenv("TEX_EMBEDDING_AUTHKEY", "").encode("utf-8") or None  # required for socket mode
+MAX_BATCH = int(os.getenv("TEX_EMBEDDING_MAX_BATCH", "64"))
+MAX_WAIT = float(os.getenv("TEX_EMBEDDING_MAX_WAIT", "0.005"))
+
+
+class _LocalModel:
+    """Loads the SentenceTransformer on first use and encodes whole batches."""
+
+    def __init__(self, model_name):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    print(f"[EMBEDDING] 🔣 Loading {self.model_name}...")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def dimension(self):
+        return self._get().get_sentence_embedding_dimension()
+
+    def encode(self, texts, normalize, batch_size):
+        vectors = self._get().encode(texts, batch_size=batch_size, normalize_embeddings=normalize,
+                                     convert_to_numpy=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32)
+
+
+class MicroBatcher:
+    """Coalesces concurrent encode requests into batched calls on one worker thread."""
+
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait=MAX_WAIT):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "batches": 0, "texts": 0}
+
+    def submit(self, texts, normalize, batch_size=None):
+        """Queue ``texts``; returns a Future resolving to a float32 (len(texts), dim) array."""
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((list(texts), normalize, batch_size, future))
+        return future
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            size = len(batch[0][0])
+            while size < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=self.max_wait)
+                except queue.Empty:
+                    break
+                batch.append(item)
+                size += len(item[0])
+            for normalize in (False, True):
+                group = [req for req in batch if req[1] == normalize]
+                if group:
+                    self._encode_group(group, normalize)
+
+    def _encode_group(self, group, normalize):
+        texts = [t for req in group for t in req[0]]
+        batch_size = min(req[2] or self.max_batch for req in group)
+        try:
+            vectors = self.model.encode(texts, normalize, max(batch_size, 1)) if texts else None
+        except Exception as e:
+            for *_, future in group:
+                future.set_exception(e)
+            return
+        self.stats["requests"] += len(group)
+        self.stats["batches"] += 1
+        self.stats["texts"] += len(texts)
+        start = 0
+        for req_texts, _, _, future in group:
+            if vectors is None:
+                future.set_result(np.zeros((0, 0), dtype=np.float32))
+            else:
+                future.set_result(vectors[start:start + len(req_texts)])
+            start += len(req_texts)
+
+
+# === Wire format: one JSON header message, plus one raw float32 message for vectors
+def _send_header(conn, header):
+    conn.send_bytes(json.dumps(header).encode("utf-8"))
+
+
+def _recv_header(conn):
+    header = json.loads(conn.recv_bytes())
+    if not isinstance(header, dict):
+        raise ValueError("malformed embedding message")
+    return header
+
+
+def _private_dir(path):
+    """Create ``path`` as a 0700 directory, or refuse one that other users could write to."""
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    st = os.stat(path)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path} must be owned by uid {os.getuid()} with mode 0700")
+
+
+class _SocketModel:
+    """Client side of the out-of-process worker; one connection per thread."""
+
+    def __init__(self, model_name, address=EMBEDDING_SOCKET, authkey=EMBEDDING_AUTHKEY):
+        self.model_name = model_name
+        self.address = address
+        self.authkey = authkey
+        self._local = threading.local()
+
+    def _call(self, request):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, family="AF_UNIX", authkey=self.authkey)
+        try:
+            _send_header(conn, request)
+            header = _recv_header(conn)
+            if not header.get("ok"):
+                raise RuntimeError(f"Embedding worker error: {header.get('error')}")
+            if "shape" not in header:
+                return header["result"]
+            vectors = np.frombuffer(conn.recv_bytes(), dtype=np.float32)
+            return vectors.reshape(header["shape"])
+        except (EOFError, OSError, ValueError):
+            self._local.conn = None
+            raise
+
+    def dimension(self):
+        return self._call({"op": "dim", "model": self.model_name})
+
+    def encode(self, texts, normalize, batch_size):
+        return self._call({"op": "encode", "model": self.model_name, "texts": list(texts), "normalize": normalize,
+                           "batch_size": batch_size})
+
+
+class Embedder:
+    """Drop-in for the subset of SentenceTransformer the project uses."""
+
+    def __init__(self, model_name=EMBEDDING_MODEL, mode=EMBEDDING_MODE, cache=None):
+        self.model_name = model_name
+        self.mode = mode
+        self._local = MicroBatcher(_LocalModel(model_name))
+        self._remote = None
+        if mode == "socket":
+            if EMBEDDING_AUTHKEY is None:
+                print("[EMBEDDING] ⚠️ TEX_EMBEDDING_AUTHKEY is not set — socket mode disabled, using local model.")
+            else:
+                self._remote = _SocketModel(model_name)
+        self._dim = None
+        if cache is None and EMBED_CACHE_ENABLED:
+            try:
+                cache = EmbeddingCache(model_name)
+            except Exception as e:
+                print(f"[EMBEDDING] ⚠️ Embedding cache unavailable ({e}) — encoding without it.")
+        self.cache = cache
+
+    def _use_remote(self, call):
+        if self._remote is None:
+            return None
+        try:
+            return call(self._remote)
+        except AuthenticationError as e:
+            print(f"[EMBEDDING] ⚠️ Worker at {self._remote.address} rejected the auth key ({e}) — using local model.")
+            self._remote = None
+            return None
+        except (OSError, EOFError, ValueError) as e:
+            print(f"[EMBEDDING] ⚠️ Worker at {self._remote.address} unreachable ({e}) — using local model.")
+            self._remote = None
+            return None
+
+    def get_sentence_embedding_dimension(self):
+        if self._dim is None:
+            dim = self._use_remote(lambda remote: remote.dimension())
+            self._dim = dim if dim is not None else self._local.model.dimension()
+        return self._dim
+
+    def encode(self, sentences, *, batch_size=None, normalize_embeddings=False):
+        """Embed a string (→ 1-D array) or a list of strings (→ 2-D float32 array)."""
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        if self.cache is None:
+            vectors = self._encode(texts, normalize_embeddings, batch_size)
+        else:
+            # Cache holds raw vectors; normalization is applied per call below.
+            cached = self.cache.get_many(texts)
+            missing = list(dict.fromkeys(t for t, vec in zip(texts, cached) if vec is None))
+            if missing:
+                fresh = dict(zip(missing, self._encode(missing, False, batch_size)))
+                self.cache.put_many(missing, [fresh[t] for t in missing])
+                cached = [vec if vec is not None else fresh[t] for t, vec in zip(texts, cached)]
+            vectors = np.stack(cached).astype(np.float32, copy=False)
+            if normalize_embeddings:
+                vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        return vectors[0] if single else vectors
+
+    def _encode(self, texts, normalize, batch_size):
+        vectors = self._use_remote(lambda remote: remote.encode(texts, normalize, batch_size))
+        if vectors is None:
+            vectors = self._local.submit(texts, normalize, batch_size).result()
+        return vectors
+
+
+_embedders = {}
+_embedders_lock = threading.Lock()
+
+def get_embedder(model_name=EMBEDDING_MODEL):
+    """The process-wide Embedder for ``model_name`` (created on first request)."""
+    with _embedders_lock:
+        embedder = _embedders.get(model_name)
+        if embedder is None:
+            embedder = _embedders[model_name] = Embedder(model_name)
+        return embedder
+
+def encode(texts, model_name=EMBEDDING_MODEL, normalize=True):
+    return get_embedder(model_name).encode(texts, normalize_embeddings=normalize)
+
+
+# === Out-of-process worker
+_worker_batchers = {}
+
+def _worker_batcher(model_name):
+    with _embedders_lock:
+        batcher = _worker_batchers.get(model_name)
+        if batcher is None:
+            batcher = _worker_batchers[model_name] = MicroBatcher(_LocalModel(model_name))
+        return batcher
+
+def _serve_connection(conn):
+    try:
+        while True:
+            try:
+                request = _recv_header(conn)
+            except EOFError:
+                return
+            except ValueError as e:
+                _send_header(conn, {"ok": False, "error": f"bad request: {e}"})
+                continue
+            try:
+                batcher = _worker_batcher(str(request["model"]))
+                if request["op"] == "dim":
+                    _send_header(conn, {"ok": True, "result": batcher.model.dimension()})
+                elif request["op"] == "encode":
+                    texts = [str(t) for t in request["texts"]]
+                    batch_size = int(request["batch_size"]) if request.get("batch_size") else None
+                    vectors = np.ascontiguousarray(
+                        batcher.submit(texts, bool(request["normalize"]), batch_size).result(), dtype=np.float32)
+                    _send_header(conn, {"ok": True, "shape": list(vectors.shape)})
+                    conn.send_bytes(vectors.tobytes())
+                else:
+                    _send_header(conn, {"ok": False, "error": f"unknown op {request['op']!r}"})
+            except Exception as e:
+                _send_header(conn, {"ok": False, "error": str(e)})
+    finally:
+        conn.close()
+
+def _claim_socket(address):
+    """Remove ``address`` only if it is a stale socket; refuse anything else."""
+    try:
+        st = os.lstat(address)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise FileExistsError(f"{address} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(address)
+    except ConnectionRefusedError:
+        os.remove(address)  # left behind by a worker that died
+        return
+    finally:
+        probe.close()
+    raise RuntimeError(f"An embedding worker is already listening on {address}")
+
+def serve(address=EMBEDDING_SOCKET, authkey=EMBEDDING_AUTHKEY, preload=EMBEDDING_MODEL):
+    """Run the embedding worker: one thread per client, all sharing one batcher per model."""
+    if not authkey:
+        raise RuntimeError("Set TEX_EMBEDDING_AUTHKEY (shared with the clients) before starting the worker")
+    _private_dir(os.path.dirname(os.path.abspath(address)))
+    _claim_socket(address)
+    if preload:
+        _worker_batcher(preload).model.dimension()
+    with Listener(address, family="AF_UNIX", authkey=authkey) as listener:
+        os.chmod(address, 0o600)
+        print(f"[EMBEDDING] 🛰️ Worker listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:
+                print(f"[EMBEDDING] ⚠️ Rejected worker connection: {e}")
+                continue
+            threading.Thread(target=_serve_connection, args=(conn,), name="embedding-client", daemon=True).start()
+
+
+if __name__ == "__main__":
+    if "--serve" in sys.argv:
+        serve()
+    else:
+        print(encode(" ".join(sys.argv[1:]) or "Tex embedding service check.")[:8])
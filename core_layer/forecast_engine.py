@@ -15,24 +15,13 @@ def forecast_market_sentiment(agent_name="tex_newsapi_stream", window_minutes=10
     Generates a short-term market sentiment forecast 
     based on urgency values in recent memory entries.
     """
-    # Pull the last ~20 memories from RAM (filtered by agent)
-    recent_entries = recall_recent(n=20)
+    # Pull the last ~20 memories for this agent from RAM, already windowed by time
+    recent_entries = recall_recent(n=20, within_minutes=window_minutes, agent=agent_name)
 
-    # Filter by agent and by recency if timestamps available
-    cutoff = datetime.now(timezone.utc) - timedelta(minutes=window_minutes)
     filtered = []
-
     for entry in recent_entries:
-        try:
-            ts = datetime.fromisoformat(entry["timestamp"])
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=timezone.utc)
-            if ts >= cutoff and entry.get("agent") == agent_name:
-                urgency = entry.get("data", {}).get("urgency", 0.5)
-                filtered.append(urgency)
-        except Exception as e:
-            print(f"[FORECAST WARNING] ⚠️ Bad memory skipped: {e}")
-            continue
+        data = entry.get("data", {})
+        filtered.append(data.get("urgency", 0.5) if isinstance(data, dict) else 0.5)
 
     if not filtered:
         return {"prediction": "neutral", "confidence": 0.0, "avg_urgency": 0.5, "timestamp": datetime.now(timezone.utc).isoformat()}
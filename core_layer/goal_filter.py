@@ -5,14 +5,14 @@
 # ============================================================
 
 from datetime import datetime, timezone, timedelta
-from sentence_transformers import SentenceTransformer, util
-import torch
 import json
 import os
 
+from core_layer.embedding_service import get_embedder
+
 # === Config ===
 GOAL_FILE = "memory_archive/autonomous_goals.jsonl"
-MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+MODEL = get_embedder()
 SIM_THRESHOLD = 0.8
 GOAL_EXPIRY_HOURS = 24
 
@@ -41,13 +41,9 @@ def filter_goals():
     if not texts:
         return []
 
-    embeddings = MODEL.encode(texts, convert_to_tensor=True)
-
-    # === 🛡 Force embeddings to CPU before numpy conversion (MPS fix)
-    if embeddings.device.type != "cpu":
-        embeddings = embeddings.cpu()
-
-    similarity_matrix = util.pytorch_cos_sim(embeddings, embeddings).numpy()
+    # Normalised NumPy embeddings: cosine similarity is a plain dot product (no device shuffling)
+    embeddings = MODEL.encode(texts, normalize_embeddings=True)
+    similarity_matrix = embeddings @ embeddings.T
 
     for i, g1 in enumerate(goals):
         if i in seen:
@@ -8,10 +8,10 @@ import os
 import json
 from datetime import datetime
 import random
-import torch
-from sentence_transformers import SentenceTransformer
 from qdrant_client import QdrantClient
 
+from core_layer.embedding_service import get_embedder
+
 # === Config ===
 QDRANT_COLLECTION = "tex_reasoning_memory"
 GOAL_OUTPUT = "memory_archive/autonomous_goals.jsonl"
@@ -19,7 +19,7 @@ MEMORY_LOG = "memory_archive/evaluation_history.json"
 GOAL_SEED_SOURCE = "InternalMemory"
 
 # === Live Systems
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+embedder = get_embedder()
 client = QdrantClient(host="localhost", port=6333)
 
 # === Static Trigger Themes (Still Active but Optional)
@@ -47,7 +47,7 @@ def assign_urgency(goal_text, source, emotion="neutral", urgency_raw=0.5):
 # === Query vector memory for top related reasoning
 def query_vector_memory_for_goals(query_text="adaptive strategy", top_k=10):
     try:
-        vector = embedder.encode(query_text, convert_to_tensor=True).cpu().numpy().tolist()
+        vector = embedder.encode(query_text).tolist()
         results = client.search(collection_name=QDRANT_COLLECTION, query_vector=vector, limit=top_k)
         return results
     except Exception as e:
@@ -8,6 +8,8 @@ import os
 import json
 from datetime import datetime, timezone
 
+from core_layer.jsonl_reader import tail_jsonl
+
 MEMORY_DIR = "memory_archive"
 AGENTS = ["tex", "AeonDelta", "tex_child_001", "tex_child_002"]
 TIMEOUT_SECONDS = 300  # Alert if no update in last 5 minutes
@@ -18,12 +20,10 @@ def read_latest_timestamp(agent_name):
         return None
 
     try:
-        with open(file_path, "r") as f:
-            lines = f.readlines()
-            if not lines:
-                return None
-            last_entry = json.loads(lines[-1])
-            return last_entry.get("timestamp")
+        last = tail_jsonl(file_path, 1)
+        if not last:
+            return None
+        return last[0].get("timestamp")
     except Exception as e:
         print(f"[HEARTBEAT] ⚠️ Failed to read {agent_name}: {e}")
         return None
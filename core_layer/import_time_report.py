@@ -0,0 +1,122 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/import_time_report.py
+# Purpose: `-X importtime` profiler report for Tex entry points
+# ============================================================
+
+"""Show where cold-start time goes when a module is imported.
+
+    python -m core_layer.import_time_report                   # tex_orchestrator
+    python -m core_layer.import_time_report tex_brain_modules.sovereign_integration_bridge --min-ms 50
+    python -m core_layer.import_time_report tex_orchestrator --top 20 --json
+
+The target is imported in a fresh interpreter with ``-X importtime``. The
+stderr log is parsed into the import tree: CPython prints each module after
+its children, indented two spaces per nesting level. The report has the
+slowest modules by self time and the tree pruned to subtrees of at least
+``--min-ms`` cumulative.
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+_PREFIX = "import time:"
+
+
+class ImportNode:
+    __slots__ = ("name", "self_us", "cumulative_us", "children")
+
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+    def as_dict(self, min_us=0):
+        return {
+            "module": self.name,
+            "self_ms": round(self.self_us / 1000, 3),
+            "cumulative_ms": round(self.cumulative_us / 1000, 3),
+            "children": [c.as_dict(min_us) for c in self.children if c.cumulative_us >= min_us],
+        }
+
+
+def parse_importtime(lines):
+    """Parse ``-X importtime`` output into the list of top-level ``ImportNode``s, in import order."""
+    pending = {}  # depth → nodes finished at that depth whose parent hasn't been printed yet
+    for line in lines:
+        if not line.startswith(_PREFIX):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len(_PREFIX):].split("|", 2)
+            node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        except ValueError:
+            continue  # the header row, or a line interleaved with other stderr output
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def profile_import(module, python=sys.executable, cwd=None):
+    """Import ``module`` in a fresh interpreter with ``-X importtime``; returns (roots, total cumulative µs)."""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    roots = parse_importtime(result.stderr.splitlines())
+    if result.returncode != 0:
+        tail = [l for l in result.stderr.splitlines() if not l.startswith(_PREFIX)][-3:]
+        print(f"[IMPORT TIME] ⚠️ import {module} failed: {' / '.join(tail)}")
+    return roots, sum(r.cumulative_us for r in roots)
+
+
+def _walk(nodes):
+    for node in nodes:
+        yield node
+        yield from _walk(node.children)
+
+
+def _print_tree(nodes, min_us, indent=0):
+    for node in sorted(nodes, key=lambda n: -n.cumulative_us):
+        if node.cumulative_us < min_us:
+            continue
+        print(f"{node.cumulative_us / 1000:>10.1f} {node.self_us / 1000:>9.1f}  {'  ' * indent}{node.name}")
+        _print_tree(node.children, min_us, indent + 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="tex_orchestrator", help="module to import")
+    parser.add_argument("--min-ms", type=float, default=20.0, help="hide subtrees cheaper than this")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules by self time")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--json", action="store_true", help="print the pruned tree as JSON")
+    args = parser.parse_args(argv)
+
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    roots, total_us = profile_import(args.module, args.python, cwd)
+    if not roots:
+        print(f"[IMPORT TIME] ⚠️ No importtime output for {args.module}.")
+        return 1
+    min_us = args.min_ms * 1000
+    if args.json:
+        print(json.dumps({"module": args.module, "total_ms": round(total_us / 1000, 3),
+                          "tree": [r.as_dict(min_us) for r in roots if r.cumulative_us >= min_us]}, indent=2))
+        return 0
+
+    nodes = list(_walk(roots))
+    print(f"[IMPORT TIME] ⏱️ import {args.module}: {total_us / 1e6:.2f}s across {len(nodes)} modules")
+    print(f"\nSlowest {args.top} by self time:")
+    for node in sorted(nodes, key=lambda n: -n.self_us)[:args.top]:
+        print(f"{node.self_us / 1000:>10.1f} ms  {node.name}")
+    print(f"\nImport tree (subtrees ≥ {args.min_ms:g} ms; cumulative ms, self ms):")
+    _print_tree(roots, min_us)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
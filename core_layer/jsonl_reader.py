@@ -0,0 +1,124 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/jsonl_reader.py
+# Purpose: mmap-backed tail and range readers for memory_archive log files
+# ============================================================
+
+"""Read the end (or a byte range) of a log without loading the whole file.
+
+Files are memory-mapped read-only, so only the pages that are touched get
+paged in. ``tail_lines`` walks backwards from EOF with ``rfind`` and only
+materialises the last ``n`` lines, which makes a tail read cost the size of
+those lines no matter how large the archive has grown.
+
+``iter_line_range`` / ``iter_jsonl_range`` walk forwards over a byte range and
+report where to resume, for readers that keep a byte-offset watermark. Only
+newline-terminated lines are returned, so a line that is still being appended
+is picked up on the next pass instead of being read half-written.
+"""
+
+import os
+import json
+import mmap
+from contextlib import contextmanager
+
+from core_layer.stage_profiler import count_io
+
+
+@contextmanager
+def _mapped(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None  # mmap refuses empty files
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _decode(raw):
+    return raw.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+def tail_lines(path, n):
+    """Last ``n`` non-blank lines of ``path`` (oldest first, newline stripped)."""
+    if n <= 0 or not os.path.exists(path):
+        return []
+    lines = []
+    with _mapped(path) as mm:
+        if mm is None:
+            return []
+        end = len(mm)
+        while end > 0 and len(lines) < n:
+            nl = mm.rfind(b"\n", 0, end)
+            raw = mm[nl + 1:end]
+            if raw.strip():
+                lines.append(_decode(raw))
+            end = nl
+        count_io(read=len(mm) - max(end, 0))
+    lines.reverse()
+    return lines
+
+
+def tail_jsonl(path, n):
+    """Last ``n`` parseable JSON entries of ``path`` (oldest first); malformed lines are skipped."""
+    if n <= 0 or not os.path.exists(path):
+        return []
+    entries = []
+    with _mapped(path) as mm:
+        if mm is None:
+            return []
+        end = len(mm)
+        while end > 0 and len(entries) < n:
+            nl = mm.rfind(b"\n", 0, end)
+            raw = mm[nl + 1:end]
+            end = nl
+            if not raw.strip():
+                continue
+            try:
+                entries.append(json.loads(raw))
+            except ValueError:
+                continue
+        count_io(read=len(mm) - max(end, 0))
+    entries.reverse()
+    return entries
+
+
+def iter_line_range(path, start=0, end=None):
+    """Yield ``(resume_at, line)`` for complete lines beginning in ``[start, end)``.
+
+    ``start`` may point into the middle of a line; reading then begins at the
+    next line. ``resume_at`` is the byte offset just past the yielded line.
+    """
+    if not os.path.exists(path):
+        return
+    with _mapped(path) as mm:
+        if mm is None:
+            return
+        size = len(mm)
+        end = size if end is None else min(end, size)
+        pos = max(start, 0)
+        if 0 < pos < size and mm[pos - 1] != 0x0A:
+            pos = mm.find(b"\n", pos) + 1
+            if pos == 0:
+                return
+        first = pos
+        try:
+            while pos < end:
+                nl = mm.find(b"\n", pos)
+                if nl == -1:
+                    return  # trailing partial line
+                raw = mm[pos:nl]
+                pos = nl + 1
+                if raw.strip():
+                    yield pos, _decode(raw)
+        finally:
+            count_io(read=pos - first)  # once per call, not per line
+
+
+def iter_jsonl_range(path, start=0, end=None):
+    """Yield ``(resume_at, entry)`` for each parseable JSON line beginning in ``[start, end)``."""
+    for resume_at, line in iter_line_range(path, start, end):
+        try:
+            yield resume_at, json.loads(line)
+        except ValueError:
+            continue
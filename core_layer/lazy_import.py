@@ -0,0 +1,138 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/lazy_import.py
+# Purpose: Lazy-import registry for heavy cognitive subsystems
+# ============================================================
+
+"""Defer subsystem imports until a stage actually uses them.
+
+Importing the orchestrator used to pull in every layer at once, and with them
+SentenceTransformer/torch, the Qdrant client and sounddevice, which made a
+cold start take tens of seconds. Orchestrators now declare what they use:
+
+    memory_manager = lazy_module("tex_brain_modules.memory_manager")
+    ReflexEngine = lazy_attr("core_agi_modules.reflex_engine", "ReflexEngine")
+
+Nothing is imported until the first attribute access or call, e.g.
+``memory_manager.recall_latest(...)`` or ``ReflexEngine()``. After that the
+real object is cached and the proxy just forwards to it. Each first load is
+timed and kept in the registry, and ``report()`` lists what was loaded,
+when and for how long. ``core_layer.import_time_report`` gives the full
+``-X importtime`` tree.
+
+TEX_EAGER_IMPORTS=1 restores eager loading: every proxy resolves as soon as
+it is declared, so a missing dependency fails at startup, not mid-cycle.
+"""
+
+import os
+import time
+import threading
+import importlib
+
+# === Config (env overrideable)
+EAGER_IMPORTS = os.getenv("TEX_EAGER_IMPORTS", "0") == "1"
+SLOW_IMPORT_SECONDS = float(os.getenv("TEX_SLOW_IMPORT_SECONDS", "1.0"))
+
+_registry = {}  # module name → {"loaded": bool, "seconds": float | None, "first_use": str | None}
+_lock = threading.Lock()
+
+
+def _timed_load(module_name, reason):
+    # The import itself runs outside the registry lock; importlib's own
+    # per-module locks serialize concurrent first uses of the same module.
+    started = time.perf_counter()
+    module = importlib.import_module(module_name)
+    seconds = time.perf_counter() - started
+    with _lock:
+        entry = _registry.setdefault(module_name, {"loaded": False, "seconds": None, "first_use": None})
+        if entry["loaded"]:
+            return module
+        entry.update(loaded=True, seconds=seconds, first_use=reason)
+    if seconds >= SLOW_IMPORT_SECONDS:
+        print(f"[LAZY IMPORT] 🐢 {module_name} took {seconds:.2f}s to load (first use: {reason})")
+    return module
+
+
+def _declare(module_name):
+    with _lock:
+        _registry.setdefault(module_name, {"loaded": False, "seconds": None, "first_use": None})
+
+
+class LazyModule:
+    """Module proxy that imports ``name`` on first attribute access."""
+
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        _declare(name)
+
+    def _resolve(self, reason):
+        if self._module is None:
+            self._module = _timed_load(self._name, reason)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(attr), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "deferred"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+class LazyAttr:
+    """Proxy for ``module.attr`` (class or function) that imports on first call or attribute access."""
+
+    __slots__ = ("_module_name", "_attr", "_target")
+
+    def __init__(self, module_name, attr):
+        self._module_name = module_name
+        self._attr = attr
+        self._target = None
+        _declare(module_name)
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(_timed_load(self._module_name, self._attr), self._attr)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._target is not None else "deferred"
+        return f"<lazy {self._module_name}.{self._attr} ({state})>"
+
+
+def lazy_module(name):
+    proxy = LazyModule(name)
+    if EAGER_IMPORTS:
+        proxy._resolve("eager")
+    return proxy
+
+
+def lazy_attr(module_name, attr):
+    proxy = LazyAttr(module_name, attr)
+    if EAGER_IMPORTS:
+        proxy._resolve()
+    return proxy
+
+
+def preload(*module_names):
+    """Import registered modules ahead of use (e.g. from a background thread once startup is done)."""
+    for name in module_names or list(_registry):
+        try:
+            _timed_load(name, "preload")
+        except Exception as e:
+            print(f"[LAZY IMPORT] ⚠️ Preload of {name} failed: {e}")
+
+
+def report():
+    """``[(module, loaded, seconds, first_use)]``, slowest loads first, still-deferred modules last."""
+    with _lock:
+        rows = [(name, e["loaded"], e["seconds"], e["first_use"]) for name, e in _registry.items()]
+    return sorted(rows, key=lambda r: (not r[1], -(r[2] or 0.0), r[0]))
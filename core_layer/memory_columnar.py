@@ -0,0 +1,378 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/memory_columnar.py
+# Purpose: Parquet history tier for memory_archive (rollover, schema registry, union reads)
+# ============================================================
+
+"""Columnar history for closed memory segments.
+
+Closed JSONL segments from ``core_layer.memory_store`` are rolled into
+Parquet, partitioned by agent and UTC day:
+
+    memory_archive/history/agent=<agent>/day=<YYYY-MM-DD>/seg-<seq>.parquet
+    memory_archive/history/_schemas/<agent>.json
+
+Every row keeps the flattened entry fields (``data.*`` nested one level) as
+typed columns for dashboards, plus ``_seg``/``_row``/``_ts``/``_raw`` so the
+store can still serve exact entries by position. Each domain has a schema in
+the registry that only ever widens (new fields, or int → float → string).
+
+``load_memory_frame`` gives dashboards the union of the Parquet history and
+the JSONL tail, with column pruning and day/timestamp predicate pushdown.
+``read_memory_frame`` is the same union for processes that only look (the
+Streamlit dashboards): it never starts the writer or touches the index.
+pyarrow is optional: without it the tier is disabled and frames are built
+from JSONL only.
+"""
+
+import os
+import json
+import threading
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PARQUET_ENABLED = True
+except ImportError:
+    PARQUET_ENABLED = False
+
+# === Config (env overrideable)
+HISTORY_DIR = "history"
+KEEP_JSONL_SEGMENTS = int(os.getenv("TEX_PARQUET_KEEP_JSONL_SEGMENTS", "1"))
+ROLLOVER_INTERVAL = float(os.getenv("TEX_PARQUET_ROLLOVER_INTERVAL", "900"))
+PARQUET_COMPRESSION = os.getenv("TEX_PARQUET_COMPRESSION", "zstd")
+
+META_COLUMNS = ("_seg", "_row", "_ts", "_raw")
+
+
+def _arrow_type(kind):
+    return {"bool": pa.bool_, "int64": pa.int64, "float64": pa.float64, "string": pa.string}[kind]()
+
+
+def _value_type(value):
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int64"
+    if isinstance(value, float):
+        return "float64"
+    return "string"
+
+
+def _widen(a, b):
+    if a is None or a == b:
+        return b
+    if {a, b} <= {"int64", "float64"}:
+        return "float64"
+    return "string"
+
+
+def flatten_entry(entry):
+    """Top-level fields as columns, nested dicts one level deep as ``parent.child``."""
+    row = {}
+    for key, value in entry.items():
+        if isinstance(value, dict):
+            for sub, sub_value in value.items():
+                row[f"{key}.{sub}"] = sub_value
+        else:
+            row[key] = value
+    return row
+
+
+def _coerce(value, kind):
+    if value is None:
+        return None
+    if kind == "string":
+        return value if isinstance(value, str) else json.dumps(value, default=str)
+    if kind == "float64":
+        return float(value)
+    return value
+
+
+class SchemaRegistry:
+    """Per-domain column types, persisted as JSON and only ever widened."""
+
+    def __init__(self, root):
+        self.root = os.path.join(root, "_schemas")
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _path(self, domain):
+        return os.path.join(self.root, f"{domain}.json")
+
+    def get(self, domain):
+        with self._lock:
+            if domain not in self._cache:
+                schema = {}
+                if os.path.exists(self._path(domain)):
+                    with open(self._path(domain), "r") as f:
+                        schema = json.load(f)
+                self._cache[domain] = schema
+            return dict(self._cache[domain])
+
+    def merge(self, domain, observed):
+        """Fold observed ``{field: type}`` into the registry; returns the merged schema."""
+        schema = self.get(domain)
+        changed = False
+        for field, kind in observed.items():
+            widened = _widen(schema.get(field), kind)
+            if widened != schema.get(field):
+                schema[field] = widened
+                changed = True
+        if changed:
+            with self._lock:
+                os.makedirs(self.root, exist_ok=True)
+                tmp = self._path(domain) + ".tmp"
+                with open(tmp, "w") as f:
+                    json.dump(schema, f, indent=2, sort_keys=True)
+                os.replace(tmp, self._path(domain))
+                self._cache[domain] = schema
+        return schema
+
+    def arrow_schema(self, domain):
+        fields = [pa.field(name, _arrow_type(kind)) for name, kind in sorted(self.get(domain).items())]
+        fields += [pa.field("_seg", pa.int64()), pa.field("_row", pa.int64()),
+                   pa.field("_ts", pa.float64()), pa.field("_raw", pa.string())]
+        return pa.schema(fields)
+
+
+class ParquetArchive:
+    """Archive reader/writer attached to a MemoryStore as ``store.archive``."""
+
+    def __init__(self, store):
+        self.store = store
+        self.root = os.path.join(store.root, HISTORY_DIR)
+        self.registry = SchemaRegistry(self.root)
+
+    # === Paths
+    def agent_dir(self, agent):
+        return os.path.join(self.root, f"agent={agent}")
+
+    def _segment_files(self, agent, seg):
+        base = self.agent_dir(agent)
+        if not os.path.isdir(base):
+            return []
+        name = f"seg-{seg:08d}.parquet"
+        return sorted(
+            os.path.join(base, day, name) for day in os.listdir(base)
+            if day.startswith("day=") and os.path.exists(os.path.join(base, day, name))
+        )
+
+    def _dataset(self, agent, files=None):
+        schema = self.registry.arrow_schema(agent)
+        if files is not None:
+            return ds.dataset(files, schema=schema, format="parquet")
+        partitioning = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+        return ds.dataset(self.agent_dir(agent), schema=schema.append(pa.field("day", pa.string())),
+                          format="parquet", partitioning=partitioning)
+
+    # === Writes
+    def archive_segment(self, agent, seg):
+        """Convert one closed JSONL segment (plain or zstd) into day-partitioned Parquet; returns rows archived."""
+        store = self.store
+        with store._lock:
+            state = store._sync(agent)
+            if store.segment_file(agent, seg) is None:
+                return 0
+            start, stop = store._segment_span(agent, seg, state["count"])
+            records = store._read_records(agent, start, stop - start)
+
+            rows_by_day, observed = {}, {}
+            with store.open_segment(agent, seg) as f:
+                for row, (_, offset, length, ts) in enumerate(records):
+                    f.seek(offset)
+                    raw = f.read(length).decode("utf-8").rstrip("\n")
+                    try:
+                        flat = flatten_entry(json.loads(raw))
+                    except (ValueError, AttributeError):
+                        flat = {}
+                    for field, value in flat.items():
+                        if value is not None:
+                            observed[field] = _widen(observed.get(field), _value_type(value))
+                    flat.update(_seg=seg, _row=row, _ts=ts, _raw=raw)
+                    day = datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+                    rows_by_day.setdefault(day, []).append(flat)
+
+            schema = self.registry.merge(agent, observed)
+            arrow_schema = self.registry.arrow_schema(agent)
+            for day, rows in rows_by_day.items():
+                columns = {}
+                for name, kind in schema.items():
+                    columns[name] = pa.array([_coerce(r.get(name), kind) for r in rows], type=_arrow_type(kind))
+                for name in META_COLUMNS:
+                    columns[name] = [r[name] for r in rows]
+                table = pa.Table.from_pydict(columns, schema=arrow_schema)
+                target_dir = os.path.join(self.agent_dir(agent), f"day={day}")
+                os.makedirs(target_dir, exist_ok=True)
+                target = os.path.join(target_dir, f"seg-{seg:08d}.parquet")
+                pq.write_table(table, target + ".tmp", compression=PARQUET_COMPRESSION)
+                os.replace(target + ".tmp", target)
+
+            archived = store.mark_archived(agent, seg)
+        print(f"[MEMORY ARCHIVE] 🗄️ {agent} segment {seg} → Parquet ({archived} rows, {len(rows_by_day)} day partitions)")
+        return archived
+
+    def rollover(self, agent):
+        """Roll an oversized live file, fold overlays, then archive all but the newest JSONL segments."""
+        store = self.store
+        if store.segment_max_bytes and store.count(agent) and os.path.exists(store.live_path(agent)) \
+                and os.path.getsize(store.live_path(agent)) >= store.segment_max_bytes:
+            store.roll(agent)
+        store.compact(agent)
+        jsonl = [seg for seg in store._closed_segments(agent) if store.segment_file(agent, seg) is not None]
+        cutoff = len(jsonl) - KEEP_JSONL_SEGMENTS
+        return sum(self.archive_segment(agent, seg) for seg in jsonl[:max(0, cutoff)])
+
+    def segment_bytes(self, agent, seg):
+        return sum(os.path.getsize(path) for path in self._segment_files(agent, seg))
+
+    def drop_segment(self, agent, seg):
+        """Delete the Parquet files of ``seg`` (retention); returns bytes freed."""
+        freed = 0
+        for path in self._segment_files(agent, seg):
+            freed += os.path.getsize(path)
+            os.remove(path)
+        return freed
+
+    def rollover_all(self):
+        total = 0
+        for agent in self.store.agents():
+            try:
+                total += self.rollover(agent)
+            except Exception as e:
+                print(f"[MEMORY ARCHIVE ERROR] ❌ Rollover failed for {agent}: {e}")
+        return total
+
+    # === Reads used by MemoryStore
+    def fetch(self, agent, seg, rows):
+        files = self._segment_files(agent, seg)
+        if not files:
+            return {}
+        table = self._dataset(agent, files).to_table(
+            columns=["_row", "_raw"], filter=ds.field("_row").isin(sorted(set(rows))))
+        return {row: json.loads(raw) for row, raw in zip(table.column("_row").to_pylist(),
+                                                          table.column("_raw").to_pylist())}
+
+    def _segment_rows(self, agent, seg, columns):
+        files = self._segment_files(agent, seg)
+        if not files:
+            return []
+        table = self._dataset(agent, files).to_table(columns=columns).sort_by("_row")
+        return list(zip(*(table.column(c).to_pylist() for c in columns)))
+
+    def iter_entries(self, agent, seg):
+        for _, raw in self._segment_rows(agent, seg, ["_row", "_raw"]):
+            yield json.loads(raw)
+
+    def index_rows(self, agent, seg):
+        rows = []
+        for row, ts, raw in self._segment_rows(agent, seg, ["_row", "_ts", "_raw"]):
+            data = json.loads(raw).get("data")
+            text = data.get("reasoning") if isinstance(data, dict) else None
+            rows.append((row, ts, text if isinstance(text, str) else None))
+        return rows
+
+    # === Analytical reads (dashboards)
+    def scan(self, agent, columns=None, since=None, until=None):
+        """Arrow table of archived rows, pruned to ``columns`` and filtered on ``_ts``."""
+        if not os.path.isdir(self.agent_dir(agent)):
+            return None
+        expr = None
+        if since is not None:
+            day = datetime.fromtimestamp(since, tz=timezone.utc).strftime("%Y-%m-%d")
+            expr = (ds.field("day") >= day) & (ds.field("_ts") >= since)
+        if until is not None:
+            day = datetime.fromtimestamp(until, tz=timezone.utc).strftime("%Y-%m-%d")
+            clause = (ds.field("day") <= day) & (ds.field("_ts") <= until)
+            expr = clause if expr is None else expr & clause
+        dataset = self._dataset(agent)
+        if columns is not None:
+            columns = [c for c in columns if c in dataset.schema.names]
+        else:
+            columns = [c for c in dataset.schema.names if c not in META_COLUMNS and c != "day"]
+        return dataset.to_table(columns=columns, filter=expr)
+
+
+class ParquetRolloverDaemon:
+    """Background daemon that periodically moves closed segments into Parquet."""
+
+    def __init__(self, archive, interval=ROLLOVER_INTERVAL):
+        self.archive = archive
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.archive.rollover_all()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run, name="memory-parquet-rollover", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def _epoch(value):
+    from core_layer.memory_store import _to_epoch
+    return _to_epoch(value)
+
+
+def load_memory_frame(store, agent, columns=None, since=None, until=None):
+    """pandas DataFrame over Parquet history ∪ JSONL tail for one memory domain."""
+    import pandas as pd
+
+    since, until = _epoch(since), _epoch(until)
+    frames = []
+    start = 0
+    if PARQUET_ENABLED and store.archive is not None:
+        table = store.archive.scan(agent, columns=columns, since=since, until=until)
+        if table is not None and table.num_rows:
+            frames.append(table.to_pandas())
+        start = store.first_jsonl_position(agent)
+
+    tail = [flatten_entry(e) for e in store.range(agent, since=since, until=until, start=start)]
+    if tail:
+        tail_df = pd.DataFrame(tail)
+        if columns is not None:
+            tail_df = tail_df[[c for c in columns if c in tail_df.columns]]
+        frames.append(tail_df)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+def read_memory_frame(agent, root="memory_archive", columns=None, since=None, until=None):
+    """Read-only ``load_memory_frame``: Parquet history ∪ the JSONL segments still on disk."""
+    import pandas as pd
+    from core_layer.memory_store import MemoryStore
+
+    since, until = _epoch(since), _epoch(until)
+    store = MemoryStore(root, read_only=True)
+    frames = []
+    if PARQUET_ENABLED:
+        table = ParquetArchive(store).scan(agent, columns=columns, since=since, until=until)
+        if table is not None and table.num_rows:
+            frames.append(table.to_pandas())
+
+    tail = []
+    for entry in store.iter_entries(agent):  # archived segments are skipped: they are in the scan above
+        ts = _epoch(entry.get("timestamp"))
+        if (since is not None and (ts is None or ts < since)) or (until is not None and (ts is None or ts > until)):
+            continue
+        tail.append(flatten_entry(entry))
+    if tail:
+        tail_df = pd.DataFrame(tail)
+        if columns is not None:
+            tail_df = tail_df[[c for c in columns if c in tail_df.columns]]
+        frames.append(tail_df)
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
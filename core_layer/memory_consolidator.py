@@ -108,6 +108,40 @@ class MemoryConsolidator:
             "emotional_drift": round(drift, 3),
             "coherence": 0.7  # Optional: replace with actual coherence logic later
         }
+
+    def purge_fragmented_threads(self, coherence_floor=0.4):
+        """
+        Drops low-coherence cycle memories (short-term and inside consolidated
+        snapshots) and rebuilds the emotion/goal maps from what is left.
+        Returns the IDs of purged entries; snapshots left empty are purged too.
+        """
+        def fragmented(entry):
+            coherence = entry.get("coherence")
+            return isinstance(coherence, (int, float)) and coherence < coherence_floor
+
+        purged = [m["id"] for m in self.memory_log if fragmented(m)]
+        self.memory_log = [m for m in self.memory_log if not fragmented(m)]
+
+        kept_snapshots = []
+        for snapshot in self.long_term_memory:
+            raw = snapshot.get("raw_log", [])
+            purged += [m["id"] for m in raw if fragmented(m)]
+            snapshot["raw_log"] = [m for m in raw if not fragmented(m)]
+            if raw and not snapshot["raw_log"]:
+                purged.append(snapshot["id"])
+                continue
+            kept_snapshots.append(snapshot)
+        self.long_term_memory = kept_snapshots
+
+        if purged:
+            self.emotional_map = defaultdict(list)
+            self.goal_history = defaultdict(int)
+            for entry in self.memory_log + [m for s in self.long_term_memory for m in s.get("raw_log", [])]:
+                self.emotional_map[entry["emotion"]].append(entry["urgency"])
+                for goal in entry.get("goals", []):
+                    self.goal_history[goal] += 1
+        return purged
+
     def get_recent_memory(self, limit=1):
         """
         Returns the most recent raw memory entries from short-term log.
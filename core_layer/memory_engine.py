@@ -7,45 +7,83 @@
 import os
 import json
 from datetime import datetime, timezone, timedelta
+from core_layer.memory_store import MemoryStore, OverlayCompactor
+from core_layer import memory_writer
+from core_layer.short_term_memory import ShortTermMemory
+from core_layer import memory_columnar
+from core_layer import memory_retention
 
-# === In-memory short-term recall (RAM only)
-_memory_log = []
+# === In-memory short-term recall (RAM only, bounded ring with epoch index)
+_memory_log = ShortTermMemory()
 
 # === Memory Directory Setup
 MEMORY_DIR = "memory_archive"
 os.makedirs(MEMORY_DIR, exist_ok=True)
 
+# === Per-store stdout echo (off by default — it dominated CPU during news bursts)
+MEMORY_VERBOSE = os.getenv("TEX_MEMORY_VERBOSE", "0") == "1"
+
+# === Segmented, indexed storage engine behind the public API
+_store = MemoryStore(MEMORY_DIR, writer=memory_writer.get_writer())
+_compactor = OverlayCompactor(_store)
+
+# === Parquet history tier (optional — needs pyarrow)
+if memory_columnar.PARQUET_ENABLED:
+    _store.archive = memory_columnar.ParquetArchive(_store)
+_rollover = None
+
+def start_archive_rollover(interval=memory_columnar.ROLLOVER_INTERVAL):
+    """Start the background JSONL → Parquet rollover for closed segments."""
+    global _rollover
+    if _store.archive is None:
+        print("[MEMORY ARCHIVE] ⚠️ pyarrow not installed — Parquet rollover disabled.")
+        return None
+    if _rollover is None:
+        _rollover = memory_columnar.ParquetRolloverDaemon(_store.archive, interval=interval)
+    return _rollover.start()
+
+# === Retention, compaction and cold-tier compression (per-domain policies)
+_retention = None
+
+def start_retention(interval=memory_retention.RETENTION_INTERVAL):
+    """Start the background retention daemon over every memory domain."""
+    global _retention
+    if _retention is None:
+        _retention = memory_retention.RetentionDaemon(memory_retention.RetentionManager(_store), interval=interval)
+    return _retention.start()
+
+def apply_retention():
+    """Run one retention pass now; returns per-domain reports of bytes reclaimed."""
+    manager = _retention.manager if _retention is not None else memory_retention.RetentionManager(_store)
+    return manager.apply_all()
+
 # === Unified Memory Writer
 def store_to_memory(agent_name, data):
+    now = datetime.now(timezone.utc)
     entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": now.isoformat(),
         "agent": agent_name,
         "data": data
     }
 
-    filepath = os.path.join(MEMORY_DIR, f"{agent_name}.jsonl")
-    os.makedirs(os.path.dirname(filepath), exist_ok=True)
-
     try:
-        with open(filepath, "a") as f:
-            f.write(json.dumps(entry) + "\n")
-        print(f"[MEMORY] 🧠 Stored for {agent_name}: {data}")
+        _store.append(agent_name, entry)
+        if MEMORY_VERBOSE:
+            print(f"[MEMORY] 🧠 Stored for {agent_name}: {data}")
     except Exception as e:
         print(f"[MEMORY ERROR] ❌ Failed saving for {agent_name}: {e}")
 
-    _memory_log.append(entry)
+    _memory_log.append(now.timestamp(), entry)
     return entry
 
-# === Recall last N memory entries for an agent (from disk)
-def recall_agent_memory(agent_name, n=5):
-    filepath = os.path.join(MEMORY_DIR, f"{agent_name}.jsonl")
-    if not os.path.exists(filepath):
-        return []
+# === Commit everything queued by the background writer (call at shutdown)
+def flush_memory(timeout=None):
+    return memory_writer.flush(timeout=timeout)
 
+# === Recall last N memory entries for an agent (index seek, no full parse)
+def recall_agent_memory(agent_name, n=5):
     try:
-        with open(filepath, "r") as f:
-            lines = f.readlines()
-            return [json.loads(line) for line in lines[-n:] if line.strip()]
+        return _store.tail(agent_name, n)
     except Exception as e:
         print(f"[MEMORY ERROR] ❌ Recall failed for {agent_name}: {e}")
         return []
@@ -55,90 +93,101 @@ def recall_latest(agent_name):
     history = recall_agent_memory(agent_name, n=1)
     return history[0] if history else None
 
-# === Recall short-term RAM memory (optional time filter)
-def recall_recent(n=5, within_minutes=None):
-    print(f"[MEMORY] 🔁 Recalling {n} recent in-session memories (within {within_minutes} min)...")
-    memories = _memory_log[-n:]
-
+# === Recall short-term RAM memory (optional time filter / agent)
+def recall_recent(n=5, within_minutes=None, agent=None):
+    if MEMORY_VERBOSE:
+        print(f"[MEMORY] 🔁 Recalling {n} recent in-session memories (within {within_minutes} min)...")
+    since = None
     if within_minutes is not None:
-        cutoff = datetime.now(timezone.utc) - timedelta(minutes=within_minutes)
-        filtered = []
-        for entry in memories:
-            try:
-                ts = datetime.fromisoformat(entry.get("timestamp"))
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=timezone.utc)
-                if ts >= cutoff:
-                    filtered.append(entry)
-            except Exception as e:
-                print(f"[MEMORY WARNING] ⚠️ Bad timestamp skipped: {e}")
-        memories = filtered
-
-    return memories
-
-# === Recall ALL memory entries safely from disk
-def recall_all(agent_name):
-    filepath = os.path.join(MEMORY_DIR, f"{agent_name}.jsonl")
-    if not os.path.exists(filepath):
+        since = (datetime.now(timezone.utc) - timedelta(minutes=within_minutes)).timestamp()
+    return _memory_log.recent(n, since=since, agent=agent)
+
+# === Recall memory entries for an agent within a time window (index bisect)
+def recall_range(agent_name, since=None, until=None):
+    try:
+        return _store.range(agent_name, since=since, until=until)
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Range recall failed for {agent_name}: {e}")
+        return []
+
+# === Positional recall (entry numbers) for incremental consumers
+def memory_count(agent_name):
+    try:
+        return _store.count(agent_name)
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Count failed for {agent_name}: {e}")
+        return 0
+
+def recall_slice(agent_name, start, stop=None):
+    try:
+        return _store.slice(agent_name, start, stop)
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Slice recall failed for {agent_name}: {e}")
         return []
 
+def recall_entries(agent_name, positions):
+    try:
+        return _store.get(agent_name, positions)
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Positional recall failed for {agent_name}: {e}")
+        return []
+
+# === Positional recall keyed by entry number (expired or unreadable entries are left out)
+def recall_entry_pairs(agent_name, positions):
+    try:
+        return _store.get_pairs(agent_name, positions)
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Positional recall failed for {agent_name}: {e}")
+        return []
+
+# === Recall ALL memory entries safely from disk (every segment, oldest first)
+def recall_all(agent_name):
     memory_entries = []
     try:
-        with open(filepath, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    memory_entries.append(json.loads(line))
-                except json.JSONDecodeError:
-                    print(f"[MEMORY WARNING] ⚠️ Skipping corrupted memory line.")
+        memory_entries.extend(_store.iter_entries(agent_name))
     except Exception as e:
         print(f"[MEMORY ERROR] ❌ Full recall failed for {agent_name}: {e}")
 
     return memory_entries
 
+# === Dashboard frame: Parquet history ∪ live JSONL tail (column pruning + time pushdown)
+def load_memory_frame(agent_name, columns=None, since=None, until=None):
+    return memory_columnar.load_memory_frame(_store, agent_name, columns=columns, since=since, until=until)
+
 # === ✅ Tier 8.5: Rewrite Incorrect Memories ===
+# Corrections go to the store's copy-on-write overlay (O(1) lookup by reasoning
+# hash, one small append per match); the compactor folds them into segments.
 def rewrite_memory_entry(domain, original_reasoning, replacement):
-    path = os.path.join(MEMORY_DIR, f"{domain}.jsonl")
-    if not os.path.exists(path):
+    try:
+        matches = _store.find_by_reasoning(domain, original_reasoning)
+        for position, _ in matches:
+            _store.patch(domain, position, {
+                "reasoning": replacement,
+                "revised_at": datetime.utcnow().isoformat(),
+                "note": "rewritten due to contradiction or regret"
+            })
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Rewrite failed for {domain}: {e}")
         return False
-
-    new_lines = []
-    rewritten = False
-    with open(path, "r") as f:
-        for line in f:
-            entry = json.loads(line.strip())
-            if entry.get("data", {}).get("reasoning") == original_reasoning:
-                entry["data"]["reasoning"] = replacement
-                entry["data"]["revised_at"] = datetime.utcnow().isoformat()
-                entry["data"]["note"] = "rewritten due to contradiction or regret"
-                rewritten = True
-            new_lines.append(json.dumps(entry))
-
-    if rewritten:
-        with open(path, "w") as f:
-            f.write("\n".join(new_lines) + "\n")
-    return rewritten
+    if matches:
+        _compactor.start()
+    return bool(matches)
 
 # === ✅ Tier 8.5: Annotate Memory Instead of Rewriting ===
 def annotate_memory(domain, original_reasoning, annotation):
-    path = os.path.join(MEMORY_DIR, f"{domain}.jsonl")
-    if not os.path.exists(path):
+    try:
+        matches = [
+            position for position, entry in _store.find_by_reasoning(domain, original_reasoning)
+            if "note" not in entry.get("data", {})
+        ]
+        for position in matches:
+            _store.patch(domain, position, {
+                "note": annotation,
+                "annotated_at": datetime.utcnow().isoformat()
+            })
+    except Exception as e:
+        print(f"[MEMORY ERROR] ❌ Annotation failed for {domain}: {e}")
         return False
-
-    new_lines = []
-    annotated = False
-    with open(path, "r") as f:
-        for line in f:
-            entry = json.loads(line.strip())
-            if entry.get("data", {}).get("reasoning") == original_reasoning and "note" not in entry.get("data", {}):
-                entry["data"]["note"] = annotation
-                entry["data"]["annotated_at"] = datetime.utcnow().isoformat()
-                annotated = True
-            new_lines.append(json.dumps(entry))
-
-    if annotated:
-        with open(path, "w") as f:
-            f.write("\n".join(new_lines) + "\n")
-    return annotated
\ No newline at end of file
+    if matches:
+        _compactor.start()
+    return bool(matches)
@@ -0,0 +1,243 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/memory_retention.py
+# Purpose: Retention, compaction and cold-tier compression for memory_archive
+# ============================================================
+
+"""Keeps ``memory_archive`` bounded.
+
+Each domain (``<agent>.jsonl`` in the store) gets a ``RetentionPolicy``:
+
+    max_age_days          expire closed segments whose newest entry is older
+    max_bytes             expire the oldest segments until the domain fits
+    keep_last             expire segments that hold nothing in the last N entries
+    downsample            before expiring, write one summary entry per segment
+                          to ``<agent>_rollup``
+    compress_after_hours  zstd-compress closed JSONL segments older than this
+
+Closed segments only exist once rolling is turned on (``TEX_MEMORY_SEGMENT_BYTES``);
+without it the live file is never rolled and these passes have nothing to drop.
+Retention only ever drops whole closed segments, oldest first, and goes
+through ``MemoryStore.expire_segment`` / ``compress_segment`` so entry numbers
+stay stable and every swap is atomic. Each pass reports the bytes it
+reclaimed, both in ``RetentionManager.stats`` and as an entry in the
+``memory_retention`` domain.
+
+Built-in policies can be overridden with a JSON file (``TEX_RETENTION_POLICIES``):
+
+    {"default": {"max_age_days": 60}, "domains": {"tex": {"keep_last": 200000}}}
+"""
+
+import os
+import json
+import time
+import threading
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+from core_layer import memory_store
+
+# === Config (env overrideable)
+RETENTION_INTERVAL = float(os.getenv("TEX_RETENTION_INTERVAL", "3600"))
+RETENTION_POLICY_FILE = os.getenv("TEX_RETENTION_POLICIES", "memory_archive/.retention.json")
+ZSTD_LEVEL = int(os.getenv("TEX_RETENTION_ZSTD_LEVEL", "3"))
+
+METRICS_DOMAIN = "memory_retention"
+ROLLUP_SUFFIX = "_rollup"
+ROLLUP_TOP_VALUES = 3
+
+
+class RetentionPolicy:
+    FIELDS = ("max_age_days", "max_bytes", "keep_last", "downsample", "compress_after_hours")
+
+    def __init__(self, max_age_days=None, max_bytes=None, keep_last=None, downsample=False,
+                 compress_after_hours=24):
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.keep_last = keep_last
+        self.downsample = downsample
+        self.compress_after_hours = compress_after_hours
+
+    @classmethod
+    def from_dict(cls, fields, base=None):
+        merged = base.as_dict() if base is not None else {}
+        merged.update({k: v for k, v in fields.items() if k in cls.FIELDS})
+        return cls(**merged)
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __repr__(self):
+        return f"RetentionPolicy({self.as_dict()})"
+
+
+DEFAULT_POLICY = RetentionPolicy(max_age_days=30, downsample=True, compress_after_hours=24)
+DOMAIN_POLICIES = {
+    "tex": RetentionPolicy(max_age_days=90, downsample=True, compress_after_hours=24),
+    "reasoning_trace_log": RetentionPolicy(max_age_days=14, max_bytes=512 * 1024 * 1024,
+                                           downsample=True, compress_after_hours=6),
+    METRICS_DOMAIN: RetentionPolicy(max_age_days=7, compress_after_hours=24),
+}
+# Rollups are already the downsampled form — keep them, just compress.
+ROLLUP_POLICY = RetentionPolicy(compress_after_hours=24)
+
+
+def load_policies(path=RETENTION_POLICY_FILE):
+    """Built-in policies with overrides from ``path`` applied; returns ``(default, per-domain)``."""
+    default, domains = DEFAULT_POLICY, dict(DOMAIN_POLICIES)
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r") as f:
+                overrides = json.load(f)
+            default = RetentionPolicy.from_dict(overrides.get("default", {}), base=default)
+            for name, fields in overrides.get("domains", {}).items():
+                domains[name] = RetentionPolicy.from_dict(fields, base=domains.get(name, default))
+        except (OSError, ValueError, TypeError) as e:
+            print(f"[RETENTION WARNING] ⚠️ Ignoring unreadable policy file {path}: {e}")
+    return default, domains
+
+
+def summarize_entries(entries):
+    """One rollup record for a run of entries: span, numeric means, most common short values."""
+    numeric, categorical = defaultdict(list), defaultdict(Counter)
+    timestamps = []
+    for entry in entries:
+        if entry.get("timestamp"):
+            timestamps.append(entry["timestamp"])
+        data = entry.get("data")
+        if not isinstance(data, dict):
+            continue
+        for key, value in data.items():
+            if isinstance(value, bool):
+                categorical[key][str(value)] += 1
+            elif isinstance(value, (int, float)):
+                numeric[key].append(value)
+            elif isinstance(value, str) and len(value) <= 32:
+                categorical[key][value] += 1
+    return {
+        "entries": len(entries),
+        "first_timestamp": min(timestamps) if timestamps else None,
+        "last_timestamp": max(timestamps) if timestamps else None,
+        "means": {k: round(sum(v) / len(v), 4) for k, v in numeric.items()},
+        "top_values": {k: c.most_common(ROLLUP_TOP_VALUES) for k, c in categorical.items()},
+    }
+
+
+class RetentionManager:
+    def __init__(self, store, policies=None, zstd_level=ZSTD_LEVEL):
+        self.store = store
+        self.default_policy, self.policies = policies if policies is not None else load_policies()
+        self.zstd_level = zstd_level
+        self.stats = {"passes": 0, "segments_expired": 0, "segments_compressed": 0,
+                      "bytes_reclaimed": 0, "rollups": 0}
+
+    def policy_for(self, agent):
+        if agent in self.policies:
+            return self.policies[agent]
+        if agent.endswith(ROLLUP_SUFFIX):
+            return ROLLUP_POLICY
+        return self.default_policy
+
+    def _rollup(self, agent, segment):
+        entries = self.store.slice(agent, segment["start"], segment["stop"])
+        if not entries:
+            return
+        summary = summarize_entries(entries)
+        summary.update(source=agent, segment=segment["seg"])
+        self.store.append(f"{agent}{ROLLUP_SUFFIX}", {
+            "timestamp": summary["last_timestamp"] or datetime.now(timezone.utc).isoformat(),
+            "agent": f"{agent}{ROLLUP_SUFFIX}",
+            "data": summary,
+        })
+        self.stats["rollups"] += 1
+
+    def apply(self, agent, now=None):
+        """Run one retention pass for ``agent``; returns a report of what was reclaimed."""
+        store, policy = self.store, self.policy_for(agent)
+        now = time.time() if now is None else now
+        report = {"agent": agent, "expired": [], "compressed": [], "bytes_reclaimed": 0}
+
+        live = store.live_path(agent)
+        if store.segment_max_bytes and os.path.exists(live) and os.path.getsize(live) >= store.segment_max_bytes:
+            store.roll(agent)
+        store.compact(agent)  # fold overlays while segments are still plain JSONL
+
+        segments = [s for s in store.segment_info(agent) if s["kind"] != "expired"]
+        count = store.count(agent)
+        total_bytes = sum(s["bytes"] for s in segments) + (os.path.getsize(live) if os.path.exists(live) else 0)
+
+        # === Expiry: oldest-first prefix of closed segments that break any limit
+        for segment in list(segments):
+            too_old = policy.max_age_days is not None and segment["last_ts"] < now - policy.max_age_days * 86400
+            too_big = policy.max_bytes is not None and total_bytes > policy.max_bytes
+            beyond_n = policy.keep_last is not None and segment["stop"] <= count - policy.keep_last
+            if not (too_old or too_big or beyond_n):
+                break
+            if policy.downsample and agent != METRICS_DOMAIN:
+                self._rollup(agent, segment)
+            freed = store.expire_segment(agent, segment["seg"])
+            total_bytes -= segment["bytes"]
+            segments.remove(segment)
+            report["expired"].append(segment["seg"])
+            report["bytes_reclaimed"] += freed
+
+        # === Cold tier: compress closed JSONL segments past the threshold
+        if policy.compress_after_hours is not None and memory_store.ZSTD_ENABLED:
+            cutoff = now - policy.compress_after_hours * 3600
+            for segment in segments:
+                if segment["kind"] == "jsonl" and segment["last_ts"] < cutoff:
+                    saved = store.compress_segment(agent, segment["seg"], level=self.zstd_level)
+                    if saved:
+                        report["compressed"].append(segment["seg"])
+                        report["bytes_reclaimed"] += saved
+
+        self.stats["segments_expired"] += len(report["expired"])
+        self.stats["segments_compressed"] += len(report["compressed"])
+        self.stats["bytes_reclaimed"] += report["bytes_reclaimed"]
+        return report
+
+    def apply_all(self, now=None):
+        """Run a pass over every domain; records a metrics entry when anything was reclaimed."""
+        reports = []
+        for agent in self.store.agents():
+            try:
+                report = self.apply(agent, now=now)
+            except Exception as e:
+                print(f"[RETENTION ERROR] ❌ Retention pass failed for {agent}: {e}")
+                continue
+            if report["expired"] or report["compressed"]:
+                reports.append(report)
+        self.stats["passes"] += 1
+
+        reclaimed = sum(r["bytes_reclaimed"] for r in reports)
+        if reports:
+            print(f"[RETENTION] ♻️ Reclaimed {reclaimed / (1024 * 1024):.1f} MiB across {len(reports)} domains.")
+            self.store.append(METRICS_DOMAIN, {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "agent": METRICS_DOMAIN,
+                "data": {"bytes_reclaimed": reclaimed, "domains": reports, "totals": dict(self.stats)},
+            })
+        return reports
+
+
+class RetentionDaemon:
+    """Background daemon that periodically applies retention to every domain."""
+
+    def __init__(self, manager, interval=RETENTION_INTERVAL):
+        self.manager = manager
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.manager.apply_all()
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run, name="memory-retention", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
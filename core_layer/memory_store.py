@@ -0,0 +1,1071 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/memory_store.py
+# Purpose: Segmented append-log storage engine with a sidecar offset index
+# ============================================================
+
+"""Storage engine behind core_layer.memory_engine.
+
+Layout under the memory root (default ``memory_archive/``):
+
+    <agent>.jsonl                    live segment (still plain JSONL, so legacy
+                                     readers that open it directly keep working)
+    segments/<agent>/<seq>.jsonl     closed segments, rolled from the live file
+    segments/<agent>/<seq>.jsonl.zst cold closed segment, zstd-compressed in place
+    segments/<agent>/<seq>.archived  marker for a closed segment moved to the
+                                     Parquet history tier (core_layer.memory_columnar)
+    segments/<agent>/<seq>.expired   marker for a segment dropped by retention
+                                     (core_layer.memory_retention)
+    .index/<agent>.idx               fixed-width index records, one per entry
+    .index/<agent>.rsn               reasoning-text hash → entry number pairs
+    .overlay/<agent>.jsonl           copy-on-write patches keyed by entry number
+    .index/store.lock                flock taken by every process touching the root
+
+Every index record is ``(segment id, byte offset, line length, epoch ts)``;
+for archived segments it is ``(segment id, row number, 0, epoch ts)`` and the
+entry is served by the attached ``archive``. Expired segments keep their index
+records (with an ``_EXPIRED`` length) so entry numbers never shift; reads skip
+them. Compressed segments keep their offsets, which point into the
+decompressed bytes.
+Entry number N lives at byte ``N * RECORD_SIZE`` of the index, so "last N"
+is a single seek, and timestamps are stored as a monotonic watermark so a
+time range is a binary search over the index instead of a full parse.
+
+Several processes may share one root. Every index update runs under an
+exclusive ``flock`` on ``.index/store.lock``, and the indexed watermark is
+always re-derived from the index file itself (the last record's offset +
+length), never from what this process last wrote, so two writers cannot
+index the same bytes twice or skip each other's lines.
+
+Writers that bypass the engine and append straight to ``<agent>.jsonl`` are
+picked up lazily: before every read the unindexed tail of the live segment is
+scanned and indexed. Rolling is opt-in (``TEX_MEMORY_SEGMENT_BYTES``): once
+the live file rolls, readers that open ``<agent>.jsonl`` directly only see
+entries written since the roll.
+
+Corrections never rewrite a segment in the hot path. ``patch()`` appends a
+small overlay record keyed by entry number (the record ID) that readers merge
+at read time; ``compact()`` later folds overlays into fresh copies of the
+segments (the live one included, so direct readers see the corrections too)
+and swaps them in atomically.
+"""
+
+import io
+import os
+import json
+import struct
+import shutil
+import hashlib
+import threading
+from datetime import datetime, timezone
+from collections import OrderedDict
+
+from core_layer.stage_profiler import count_io
+
+try:
+    import zstandard
+    ZSTD_ENABLED = True
+except ImportError:
+    ZSTD_ENABLED = False
+
+try:
+    import fcntl
+    FLOCK_ENABLED = True
+except ImportError:
+    FLOCK_ENABLED = False  # no advisory locks (Windows): keep to one writing process per root
+
+# === Config (env overrideable)
+SEGMENT_MAX_BYTES = int(os.getenv("TEX_MEMORY_SEGMENT_BYTES", "0"))  # 0 = never roll the live file
+SEGMENT_DIR = "segments"
+INDEX_DIR = ".index"
+OVERLAY_DIR = ".overlay"
+COMPACT_INTERVAL = float(os.getenv("TEX_MEMORY_COMPACT_INTERVAL", "300"))
+ZSTD_CACHE_SEGMENTS = int(os.getenv("TEX_MEMORY_ZSTD_CACHE_SEGMENTS", "2"))
+LOCK_FILE = "store.lock"
+COPY_CHUNK = 1024 * 1024
+
+# === Index record: segment id, byte offset, line length, epoch timestamp
+_RECORD = struct.Struct("<IQId")
+RECORD_SIZE = _RECORD.size
+_EXPIRED = 0xFFFFFFFF  # line-length sentinel for entries of expired segments
+
+# === Reasoning index record: 64-bit text hash, entry number
+_REASONING = struct.Struct("<QQ")
+
+
+def _text_hash(text):
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _reasoning_of(entry):
+    data = entry.get("data") if isinstance(entry, dict) else None
+    reasoning = data.get("reasoning") if isinstance(data, dict) else None
+    return reasoning if isinstance(reasoning, str) else None
+
+
+def _to_epoch(ts):
+    """Convert an ISO timestamp / datetime / number into epoch seconds (UTC)."""
+    if ts is None:
+        return None
+    if isinstance(ts, (int, float)):
+        return float(ts)
+    try:
+        if isinstance(ts, str):
+            ts = datetime.fromisoformat(ts)
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _copy_range(src, dst, start, stop):
+    src.seek(start)
+    remaining = stop - start
+    while remaining > 0:
+        chunk = src.read(min(COPY_CHUNK, remaining))
+        if not chunk:
+            break
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+
+class StoreLock:
+    """Re-entrant thread lock that also holds an exclusive ``flock`` on ``path`` while owned.
+
+    Every process (and every ``MemoryStore`` instance) sharing a root opens its
+    own descriptor on the lock file, so they serialize against each other the
+    same way threads serialize on the ``RLock``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._rlock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._rlock.acquire()
+        if self._depth == 0 and FLOCK_ENABLED:
+            try:
+                if self._fd is None:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._rlock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and FLOCK_ENABLED and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._rlock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+class MemoryStore:
+    """Segmented store over one memory root.
+
+    ``read_only=True`` gives a viewer (dashboards) that never writes under the
+    root: no index catch-up, no lock file, no directories. Only
+    ``iter_entries`` is served, straight from the segment files, and archived
+    segments are skipped unless an ``archive`` is attached.
+    """
+
+    def __init__(self, root="memory_archive", segment_max_bytes=SEGMENT_MAX_BYTES, writer=None, read_only=False):
+        self.root = root
+        self.read_only = read_only
+        self.segment_max_bytes = segment_max_bytes
+        self.writer = writer  # optional core_layer.memory_writer.MemoryWriter for group commit
+        self.archive = None  # optional core_layer.memory_columnar.ParquetArchive for archived segments
+        self._handles = {}
+        self._lock = StoreLock(os.path.join(root, INDEX_DIR, LOCK_FILE))
+        self._state = {}
+        self._overlays = {}
+        self._overlay_sigs = {}  # agent → (inode, size, mtime) of the overlay file the cache was read from
+        self._reasoning = {}
+        self._zcache = OrderedDict()  # (agent, seg) → decompressed bytes of recently read .zst segments
+        if read_only:
+            self._lock = threading.RLock()
+        else:
+            os.makedirs(root, exist_ok=True)
+
+    # === Paths
+    def live_path(self, agent):
+        return os.path.join(self.root, f"{agent}.jsonl")
+
+    def segment_path(self, agent, seg):
+        return os.path.join(self.root, SEGMENT_DIR, agent, f"{seg:08d}.jsonl")
+
+    def index_path(self, agent):
+        return os.path.join(self.root, INDEX_DIR, f"{agent}.idx")
+
+    def reasoning_path(self, agent):
+        return os.path.join(self.root, INDEX_DIR, f"{agent}.rsn")
+
+    def overlay_path(self, agent):
+        return os.path.join(self.root, OVERLAY_DIR, f"{agent}.jsonl")
+
+    def _path_for(self, agent, seg):
+        state = self._load_state(agent)
+        return self.live_path(agent) if seg == state["live"] else self.segment_path(agent, seg)
+
+    def compressed_path(self, agent, seg):
+        return os.path.join(self.root, SEGMENT_DIR, agent, f"{seg:08d}.jsonl.zst")
+
+    def archived_marker(self, agent, seg):
+        return os.path.join(self.root, SEGMENT_DIR, agent, f"{seg:08d}.archived")
+
+    def expired_marker(self, agent, seg):
+        return os.path.join(self.root, SEGMENT_DIR, agent, f"{seg:08d}.expired")
+
+    def segment_file(self, agent, seg):
+        """Path holding a closed segment's JSONL bytes (plain or compressed), or None."""
+        for path in (self.segment_path(agent, seg), self.compressed_path(agent, seg)):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def segment_paths(self, agent):
+        """Return every JSONL segment path for an agent, oldest first, live segment last."""
+        paths = [self.segment_path(agent, seg) for seg in self._closed_segments(agent)]
+        paths.append(self.live_path(agent))
+        return [p for p in paths if os.path.exists(p)]
+
+    def _closed_segments(self, agent):
+        seg_dir = os.path.join(self.root, SEGMENT_DIR, agent)
+        if not os.path.isdir(seg_dir):
+            return []
+        segs = set()
+        for name in os.listdir(seg_dir):
+            stem, _, ext = name.partition(".")
+            if ext in ("jsonl", "jsonl.zst", "archived", "expired") and stem.isdigit():
+                segs.add(int(stem))
+        return sorted(segs)
+
+    # === Index state
+    def _load_state(self, agent):
+        state = self._state.get(agent)
+        if state is not None:
+            return state
+
+        closed = self._closed_segments(agent)
+        state = {"live": (closed[-1] + 1) if closed else 0, "indexed_end": 0, "count": 0, "last_ts": 0.0,
+                 "live_id": self._live_id(agent)}
+        self._state[agent] = state
+
+        idx_path = self.index_path(agent)
+        if os.path.exists(idx_path):
+            size = os.path.getsize(idx_path)
+            usable = size - (size % RECORD_SIZE)
+            if usable != size:
+                with open(idx_path, "r+b") as f:
+                    f.truncate(usable)
+            state["count"] = usable // RECORD_SIZE
+            if state["count"]:
+                seg, offset, length, ts = self._read_records(agent, state["count"] - 1, 1)[0]
+                state["last_ts"] = ts
+                if seg == state["live"]:
+                    state["indexed_end"] = offset + length
+                elif seg > state["live"]:
+                    # Index refers to segments that no longer exist — start over.
+                    self._rebuild(agent)
+                    return state
+
+        if (not os.path.exists(idx_path) or not os.path.exists(self.reasoning_path(agent))
+                or (closed and state["count"] == 0)):
+            self._rebuild(agent)
+        return state
+
+    def _read_records(self, agent, start, n):
+        if n <= 0:
+            return []
+        with open(self.index_path(agent), "rb") as f:
+            f.seek(start * RECORD_SIZE)
+            raw = f.read(n * RECORD_SIZE)
+        return [_RECORD.unpack_from(raw, i) for i in range(0, len(raw) - RECORD_SIZE + 1, RECORD_SIZE)]
+
+    def _append_records(self, agent, records):
+        if not records:
+            return
+        idx_path = self.index_path(agent)
+        os.makedirs(os.path.dirname(idx_path), exist_ok=True)
+        with open(idx_path, "ab") as f:
+            f.write(b"".join(_RECORD.pack(*r) for r in records))
+        self._state[agent]["count"] += len(records)
+
+    def _append_reasoning(self, agent, pairs):
+        if not pairs:
+            return
+        rsn_path = self.reasoning_path(agent)
+        os.makedirs(os.path.dirname(rsn_path), exist_ok=True)
+        with open(rsn_path, "ab") as f:
+            f.write(b"".join(_REASONING.pack(*p) for p in pairs))
+        table = self._reasoning.get(agent)
+        if table is not None:
+            for h, pos in pairs:
+                table.setdefault(h, []).append(pos)
+
+    def _scan(self, agent, seg, path, start):
+        """Index complete lines of ``path`` (or segment ``seg`` if None) from byte ``start``; returns the new indexed end."""
+        state = self._state[agent]
+        records, reasoning = [], []
+        offset = start
+        with (open(path, "rb") if path is not None else self.open_segment(agent, seg)) as f:
+            f.seek(start)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partial line from an in-flight writer
+                if line.strip():
+                    ts = None
+                    try:
+                        entry = json.loads(line)
+                        ts = _to_epoch(entry.get("timestamp"))
+                        text = _reasoning_of(entry)
+                        if text is not None:
+                            reasoning.append((_text_hash(text), state["count"] + len(records)))
+                    except (ValueError, AttributeError):
+                        pass
+                    state["last_ts"] = max(state["last_ts"], ts or 0.0)
+                    records.append((seg, offset, len(line), state["last_ts"]))
+                offset += len(line)
+        self._append_reasoning(agent, reasoning)
+        self._append_records(agent, records)
+        return offset
+
+    def _rebuild(self, agent):
+        state = self._state[agent]
+        idx_path = self.index_path(agent)
+        os.makedirs(os.path.dirname(idx_path), exist_ok=True)
+        open(idx_path, "wb").close()
+        open(self.reasoning_path(agent), "wb").close()
+        self._reasoning.pop(agent, None)
+        state.update(count=0, indexed_end=0, last_ts=0.0)
+        for seg in self._closed_segments(agent):
+            if os.path.exists(self.segment_path(agent, seg)):
+                self._scan(agent, seg, self.segment_path(agent, seg), 0)
+            elif os.path.exists(self.compressed_path(agent, seg)):
+                self._scan(agent, seg, None, 0)
+            elif os.path.exists(self.expired_marker(agent, seg)):
+                self._index_marker(agent, seg, self.expired_marker(agent, seg), _EXPIRED)
+            else:
+                self._index_archived(agent, seg)
+        if os.path.exists(self.live_path(agent)):
+            state["indexed_end"] = self._scan(agent, state["live"], self.live_path(agent), 0)
+        self._append_reasoning(agent, [
+            (_text_hash(fields["reasoning"]), pos)
+            for pos, fields in self._overlay(agent).items() if isinstance(fields.get("reasoning"), str)
+        ])
+
+    def _index_archived(self, agent, seg):
+        if self.archive is None:
+            # No archive reader in this process: keep positions stable from the marker alone.
+            self._index_marker(agent, seg, self.archived_marker(agent, seg), 0)
+            return
+        state = self._state[agent]
+        records, reasoning = [], []
+        for row, ts, text in self.archive.index_rows(agent, seg):
+            state["last_ts"] = max(state["last_ts"], ts or 0.0)
+            if text is not None:
+                reasoning.append((_text_hash(text), state["count"] + len(records)))
+            records.append((seg, row, 0, state["last_ts"]))
+        self._append_reasoning(agent, reasoning)
+        self._append_records(agent, records)
+
+    def _index_marker(self, agent, seg, marker_path, length):
+        state = self._state[agent]
+        with open(marker_path, "r") as f:
+            marker = json.load(f)
+        state["last_ts"] = max(state["last_ts"], marker["last_ts"])
+        self._append_records(agent, [(seg, row, length, state["last_ts"]) for row in range(marker["rows"])])
+
+    def _replace_segment(self, agent, seg, marker_path, length):
+        """Write ``marker_path`` for ``seg`` and point its index records at ``length``; returns the span."""
+        state = self._sync(agent)
+        start, stop = self._segment_span(agent, seg, state["count"])
+        records = self._read_records(agent, start, stop - start)
+        with open(marker_path, "w") as f:
+            json.dump({"rows": len(records), "last_ts": records[-1][3] if records else 0.0}, f)
+        with open(self.index_path(agent), "r+b") as f:
+            f.seek(start * RECORD_SIZE)
+            f.write(b"".join(_RECORD.pack(seg, row, length, ts) for row, (_, _, _, ts) in enumerate(records)))
+        return start, stop
+
+    def mark_archived(self, agent, seg):
+        """Point the index at the archive for ``seg`` and drop its JSONL file."""
+        with self._lock:
+            start, stop = self._replace_segment(agent, seg, self.archived_marker(agent, seg), 0)
+            for path in (self.segment_path(agent, seg), self.compressed_path(agent, seg)):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._zcache.pop((agent, seg), None)
+            return stop - start
+
+    def expire_segment(self, agent, seg):
+        """Drop closed segment ``seg`` everywhere (JSONL, zstd, Parquet); returns bytes freed.
+
+        Entry numbers stay stable: the index keeps one record per dropped
+        entry, and overlay patches for them are discarded.
+        """
+        with self._lock:
+            if seg >= self._sync(agent)["live"]:
+                raise ValueError(f"Segment {seg} of {agent} is still live")
+            start, stop = self._replace_segment(agent, seg, self.expired_marker(agent, seg), _EXPIRED)
+            freed = 0
+            for path in (self.segment_path(agent, seg), self.compressed_path(agent, seg),
+                         self.archived_marker(agent, seg)):
+                if os.path.exists(path):
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+            if self.archive is not None:
+                freed += self.archive.drop_segment(agent, seg)
+            self._zcache.pop((agent, seg), None)
+            overlay = self._overlay(agent)
+            stale = [pos for pos in overlay if start <= pos < stop]
+            if stale:
+                for pos in stale:
+                    del overlay[pos]
+                self._write_overlay(agent)
+            return freed
+
+    def compress_segment(self, agent, seg, level=3):
+        """Swap closed JSONL segment ``seg`` for a zstd copy; returns bytes saved.
+
+        Compression runs outside the lock; the swap only happens if the
+        segment was not rewritten (compacted, archived) in the meantime.
+        """
+        if not ZSTD_ENABLED:
+            raise RuntimeError("zstandard is not installed")
+        path, target = self.segment_path(agent, seg), self.compressed_path(agent, seg)
+        with self._lock:
+            if seg >= self._sync(agent)["live"] or not os.path.exists(path):
+                return 0
+            before = os.stat(path)
+        tmp = target + ".tmp"
+        with open(path, "rb") as src, open(tmp, "wb") as dst:
+            zstandard.ZstdCompressor(level=level).copy_stream(src, dst)
+            dst.flush()
+            os.fsync(dst.fileno())
+        with self._lock:
+            try:
+                now = os.stat(path)
+            except FileNotFoundError:
+                now = None
+            if now is None or (now.st_ino, now.st_size, now.st_mtime_ns) != (before.st_ino, before.st_size, before.st_mtime_ns):
+                os.remove(tmp)
+                return 0
+            os.replace(tmp, target)
+            os.remove(path)
+            return before.st_size - os.path.getsize(target)
+
+    def open_segment(self, agent, seg):
+        """Binary reader over a segment's JSONL bytes — live, closed or zstd-compressed."""
+        path = self._path_for(agent, seg)
+        if os.path.exists(path) or not os.path.exists(self.compressed_path(agent, seg)):
+            return open(path, "rb")
+        return io.BytesIO(self._decompressed(agent, seg))
+
+    def _zstd_reader(self, agent, seg):
+        """Streaming line reader over a compressed segment (no full decompression in memory)."""
+        if not ZSTD_ENABLED:
+            raise RuntimeError(f"zstandard is not installed; cannot read {self.compressed_path(agent, seg)}")
+        raw = open(self.compressed_path(agent, seg), "rb")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+
+    def _decompressed(self, agent, seg):
+        key = (agent, seg)
+        data = self._zcache.get(key)
+        if data is not None:
+            self._zcache.move_to_end(key)
+            return data
+        if not ZSTD_ENABLED:
+            raise RuntimeError(f"zstandard is not installed; cannot read {self.compressed_path(agent, seg)}")
+        out = io.BytesIO()
+        with open(self.compressed_path(agent, seg), "rb") as f:
+            zstandard.ZstdDecompressor().copy_stream(f, out)
+        data = self._zcache[key] = out.getvalue()
+        while len(self._zcache) > ZSTD_CACHE_SEGMENTS:
+            self._zcache.popitem(last=False)
+        return data
+
+    def _live_id(self, agent):
+        try:
+            return os.stat(self.live_path(agent)).st_ino
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self, agent):
+        """Forget cached state that another process moved past (appended, rolled, compacted, rebuilt)."""
+        state = self._state.get(agent)
+        if state is None:
+            return
+        try:
+            idx_size = os.path.getsize(self.index_path(agent))
+        except FileNotFoundError:
+            idx_size = -1
+        if idx_size != state["count"] * RECORD_SIZE or self._live_id(agent) != state["live_id"]:
+            del self._state[agent]
+            self._reasoning.pop(agent, None)
+
+    def _sync(self, agent):
+        """Index whatever was appended to the live segment outside of this process (call under the lock)."""
+        if self.read_only:
+            raise RuntimeError(f"MemoryStore at {self.root} is read-only; use iter_entries()")
+        self._refresh(agent)
+        state = self._load_state(agent)
+        path = self.live_path(agent)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size < state["indexed_end"]:
+            print(f"[MEMORY STORE] ⚠️ Live segment for {agent} shrank — rebuilding index.")
+            self._rebuild(agent)
+        elif size > state["indexed_end"]:
+            state["indexed_end"] = self._scan(agent, state["live"], path, state["indexed_end"])
+        state["live_id"] = self._live_id(agent)
+        return state
+
+    def reindex(self, agent):
+        """Drop and rebuild the index, e.g. after a segment was rewritten in place."""
+        self._drain(agent)
+        with self._lock:
+            self._load_state(agent)
+            self._rebuild(agent)
+
+    # === Writes
+    def append(self, agent, entry):
+        """Append one entry; queued for group commit when a writer is attached."""
+        if self.writer is not None:
+            line = (json.dumps(entry) + "\n").encode("utf-8")
+            count_io(written=len(line))
+            self.writer.submit(self, agent, line, len(line))
+        else:
+            self.write_batch(agent, [entry])
+        return entry
+
+    def _drain(self, agent):
+        """Make queued appends for ``agent`` visible before reading (never call under the lock)."""
+        if self.writer is not None:
+            self.writer.flush(agent)
+
+    def _live_handle(self, agent):
+        path = self.live_path(agent)
+        f = self._handles.get(agent)
+        if f is not None:
+            try:
+                if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                    return f
+            except OSError:
+                pass
+            f.close()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        f = self._handles[agent] = open(path, "ab")
+        return f
+
+    def write_batch(self, agent, entries):
+        """Group-commit sink: one write + one index append for a batch of entries or lines."""
+        lines = [e if isinstance(e, bytes) else (json.dumps(e) + "\n").encode("utf-8") for e in entries]
+        with self._lock:
+            state = self._sync(agent)
+            f = self._live_handle(agent)
+            offset = f.seek(0, os.SEEK_END)
+            f.write(b"".join(lines))
+            f.flush()
+            if self.writer is None:
+                count_io(written=sum(map(len, lines)))  # writer-thread batches were counted at submit
+            records, reasoning = [], []
+            for line in lines:
+                entry = json.loads(line)
+                state["last_ts"] = max(state["last_ts"], _to_epoch(entry.get("timestamp")) or 0.0)
+                text = _reasoning_of(entry)
+                if text is not None:
+                    reasoning.append((_text_hash(text), state["count"] + len(records)))
+                records.append((state["live"], offset, len(line), state["last_ts"]))
+                offset += len(line)
+            self._append_reasoning(agent, reasoning)
+            self._append_records(agent, records)
+            state["indexed_end"] = offset
+            state["live_id"] = os.fstat(f.fileno()).st_ino
+            if self.segment_max_bytes and state["indexed_end"] >= self.segment_max_bytes:
+                self.roll(agent)
+
+    def sync(self):
+        with self._lock:
+            for f in self._handles.values():
+                os.fsync(f.fileno())
+
+    def close(self):
+        with self._lock:
+            for f in self._handles.values():
+                f.close()
+            self._handles.clear()
+
+    def roll(self, agent):
+        """Close the live segment; the next append starts a fresh one."""
+        with self._lock:
+            state = self._sync(agent)
+            path = self.live_path(agent)
+            if not os.path.exists(path) or state["indexed_end"] == 0:
+                return None
+            target = self.segment_path(agent, state["live"])
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            handle = self._handles.pop(agent, None)
+            if handle is not None:
+                handle.close()
+            os.replace(path, target)
+            state["live"] += 1
+            state["indexed_end"] = 0
+            state["live_id"] = None
+            print(f"[MEMORY STORE] 📦 Rolled {agent} live segment → {target}")
+            return target
+
+    # === Reads
+    def count(self, agent):
+        self._drain(agent)
+        with self._lock:
+            return self._sync(agent)["count"]
+
+    def _fetch_pairs(self, agent, records, positions):
+        """Read ``records`` and merge overlay patches; returns ``[(entry number, entry)]``."""
+        pairs, handles, archived = [], {}, {}
+        overlay = self._overlay(agent)
+        if self.archive is not None:
+            for seg, offset, length, _ in records:
+                if length == 0:
+                    archived.setdefault(seg, []).append(offset)
+            archived = {seg: self.archive.fetch(agent, seg, rows) for seg, rows in archived.items()}
+        try:
+            for pos, (seg, offset, length, _) in zip(positions, records):
+                if length == _EXPIRED:
+                    continue
+                if length == 0:
+                    entry = archived.get(seg, {}).get(offset)
+                    if entry is None:
+                        continue
+                    if pos in overlay:
+                        _merge(entry, overlay[pos])
+                    pairs.append((pos, entry))
+                    continue
+                f = handles.get(seg)
+                if f is None:
+                    f = handles[seg] = self.open_segment(agent, seg)
+                f.seek(offset)
+                count_io(read=length)
+                try:
+                    entry = json.loads(f.read(length))
+                except json.JSONDecodeError:
+                    print(f"[MEMORY WARNING] ⚠️ Skipping corrupted memory line.")
+                    continue
+                if pos in overlay:
+                    _merge(entry, overlay[pos])
+                pairs.append((pos, entry))
+        finally:
+            for f in handles.values():
+                f.close()
+        return pairs
+
+    def _fetch(self, agent, records, start):
+        return [e for _, e in self._fetch_pairs(agent, records, range(start, start + len(records)))]
+
+    def tail(self, agent, n=5):
+        """Return the last ``n`` entries, oldest first."""
+        if n <= 0:
+            return []
+        self._drain(agent)
+        with self._lock:
+            state = self._sync(agent)
+            start = max(0, state["count"] - n)
+            return self._fetch(agent, self._read_records(agent, start, state["count"] - start), start)
+
+    def slice(self, agent, start, stop=None):
+        """Return entries by position: entry numbers ``start`` up to (excluding) ``stop``."""
+        self._drain(agent)
+        with self._lock:
+            count = self._sync(agent)["count"]
+            stop = count if stop is None else min(stop, count)
+            start = max(0, start)
+            return self._fetch(agent, self._read_records(agent, start, stop - start), start)
+
+    def _get_pairs(self, agent, positions):
+        count = self._sync(agent)["count"]
+        positions = [p for p in positions if 0 <= p < count]
+        if not positions:
+            return []
+        with open(self.index_path(agent), "rb") as f:
+            records = []
+            for p in positions:
+                f.seek(p * RECORD_SIZE)
+                records.append(_RECORD.unpack(f.read(RECORD_SIZE)))
+        return self._fetch_pairs(agent, records, positions)
+
+    def get(self, agent, positions):
+        """Return the entries at the given entry numbers, in the order given."""
+        return [e for _, e in self.get_pairs(agent, positions)]
+
+    def get_pairs(self, agent, positions):
+        """``[(entry number, entry)]`` for the given entry numbers; expired or unreadable ones are left out."""
+        self._drain(agent)
+        with self._lock:
+            return self._get_pairs(agent, positions)
+
+    def _bisect(self, agent, ts, count):
+        lo, hi = 0, count
+        with open(self.index_path(agent), "rb") as f:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                f.seek(mid * RECORD_SIZE)
+                if _RECORD.unpack(f.read(RECORD_SIZE))[3] < ts:
+                    lo = mid + 1
+                else:
+                    hi = mid
+        return lo
+
+    def range(self, agent, since=None, until=None, start=0):
+        """Return entries whose (watermarked) timestamp falls in ``[since, until]``, from position ``start``."""
+        since, until = _to_epoch(since), _to_epoch(until)
+        self._drain(agent)
+        with self._lock:
+            state = self._sync(agent)
+            count = state["count"]
+            if not count:
+                return []
+            start = max(start, self._bisect(agent, since, count) if since is not None else 0)
+            stop = self._bisect(agent, until + 1e-6, count) if until is not None else count
+            return self._fetch(agent, self._read_records(agent, start, stop - start), start)
+
+    def _open_sources(self, agent):
+        """Snapshot every segment under the lock: ``[(kind, source, rows or byte limit)]``.
+
+        Files are opened here, so a concurrent compaction, compression or
+        roll swaps paths without pulling bytes out from under the reader.
+        """
+        live_end = None if self.read_only else self._sync(agent)["indexed_end"]
+        sources = []
+        for seg in self._closed_segments(agent):
+            if os.path.exists(self.segment_path(agent, seg)):
+                sources.append(("jsonl", open(self.segment_path(agent, seg), "rb"), None))
+            elif os.path.exists(self.compressed_path(agent, seg)):
+                sources.append(("jsonl", self._zstd_reader(agent, seg), None))
+            elif os.path.exists(self.expired_marker(agent, seg)):
+                with open(self.expired_marker(agent, seg), "r") as f:
+                    sources.append(("skip", None, json.load(f)["rows"]))
+            elif self.archive is not None:
+                sources.append(("archive", seg, None))
+            else:
+                with open(self.archived_marker(agent, seg), "r") as f:
+                    sources.append(("skip", None, json.load(f)["rows"]))
+        if os.path.exists(self.live_path(agent)):
+            # Only the indexed prefix (read-only: up to the last newline) — a half-written line is not an entry yet.
+            sources.append(("jsonl", open(self.live_path(agent), "rb"), live_end))
+        return sources
+
+    def iter_entries(self, agent):
+        """Stream every entry across all segments, oldest first, as of the call."""
+        self._drain(agent)
+        with self._lock:
+            overlay = dict(self._overlay(agent))
+            sources = self._open_sources(agent)
+        pos = read = 0
+        try:
+            for kind, source, limit in sources:
+                if kind == "skip":
+                    pos += limit
+                    continue
+                if kind == "archive":
+                    for entry in self.archive.iter_entries(agent, source):
+                        pos += 1
+                        if pos - 1 in overlay:
+                            _merge(entry, overlay[pos - 1])
+                        yield entry
+                    continue
+                consumed = 0
+                for line in source:
+                    if (limit is not None and consumed >= limit) or not line.endswith(b"\n"):
+                        break
+                    consumed += len(line)
+                    read += len(line)
+                    line = line.strip()
+                    if not line:
+                        continue
+                    pos += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        print(f"[MEMORY WARNING] ⚠️ Skipping corrupted memory line.")
+                        continue
+                    if pos - 1 in overlay:
+                        _merge(entry, overlay[pos - 1])
+                    yield entry
+        finally:
+            count_io(read=read)
+            for kind, source, _ in sources:
+                if kind == "jsonl":
+                    source.close()
+
+    # === Copy-on-write corrections
+    def _overlay_sig(self, agent):
+        try:
+            st = os.stat(self.overlay_path(agent))
+            return st.st_ino, st.st_size, st.st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _overlay(self, agent):
+        """Overlay patches by entry number, re-read whenever another process changed the file."""
+        overlay = self._overlays.get(agent)
+        sig = self._overlay_sig(agent)
+        if overlay is not None and sig == self._overlay_sigs.get(agent):
+            return overlay
+        if overlay is not None:
+            self._reasoning.pop(agent, None)  # the other process may have patched reasoning text
+        overlay = self._overlays[agent] = {}
+        self._overlay_sigs[agent] = sig
+        path = self.overlay_path(agent)
+        if sig is not None:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        patch = json.loads(line)
+                        overlay.setdefault(patch["id"], {}).update(patch["set"])
+                    except (ValueError, KeyError, TypeError):
+                        continue  # torn trailing write — the patch never happened
+        return overlay
+
+    def _reasoning_table(self, agent):
+        table = self._reasoning.get(agent)
+        if table is not None:
+            return table
+        table = {}
+        rsn_path = self.reasoning_path(agent)
+        if os.path.exists(rsn_path):
+            with open(rsn_path, "rb") as f:
+                raw = f.read()
+            for h, pos in _REASONING.iter_unpack(raw[:len(raw) - len(raw) % _REASONING.size]):
+                table.setdefault(h, []).append(pos)
+        self._reasoning[agent] = table
+        return table
+
+    def find_by_reasoning(self, agent, text):
+        """Return ``[(entry number, entry)]`` whose current ``data.reasoning`` equals ``text``."""
+        self._drain(agent)
+        with self._lock:
+            self._sync(agent)
+            positions = sorted(set(self._reasoning_table(agent).get(_text_hash(text), ())))
+            return [(pos, e) for pos, e in self._get_pairs(agent, positions) if _reasoning_of(e) == text]
+
+    def patch(self, agent, position, fields):
+        """Record a correction for one entry's ``data`` without touching its segment."""
+        line = json.dumps({"id": position, "set": fields}) + "\n"
+        self._drain(agent)
+        with self._lock:
+            overlay = self._overlay(agent)
+            path = self.overlay_path(agent)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a") as f:
+                f.write(line)
+            self._overlay_sigs[agent] = self._overlay_sig(agent)
+            overlay.setdefault(position, {}).update(fields)
+            if isinstance(fields.get("reasoning"), str):
+                self._append_reasoning(agent, [(_text_hash(fields["reasoning"]), position)])
+
+    def _segment_span(self, agent, seg, count):
+        """Entry numbers ``[start, stop)`` stored in segment ``seg`` (segment ids never decrease)."""
+        def first_at_least(target):
+            lo, hi = 0, count
+            with open(self.index_path(agent), "rb") as f:
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    f.seek(mid * RECORD_SIZE)
+                    if _RECORD.unpack(f.read(RECORD_SIZE))[0] < target:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+            return lo
+        return first_at_least(seg), first_at_least(seg + 1)
+
+    def _fold(self, agent, seg, src, path, start, stop, overlay):
+        """Write ``path + ".compact"``: ``src`` with the overlay merged into entries ``[start, stop)``.
+
+        Unpatched byte ranges are copied verbatim. Returns the temp path, the
+        new index records, the source bytes copied and the size change.
+        """
+        records = self._read_records(agent, start, stop - start)
+        tmp = path + ".compact"
+        new_records, copied, shift = [], 0, 0
+        with open(tmp, "wb") as dst:
+            for pos, (_, offset, length, ts) in zip(range(start, stop), records):
+                if pos not in overlay:
+                    new_records.append((seg, offset + shift, length, ts))
+                    continue
+                _copy_range(src, dst, copied, offset)
+                src.seek(offset)
+                raw = src.read(length)
+                try:
+                    entry = json.loads(raw)
+                    _merge(entry, overlay[pos])
+                    raw = (json.dumps(entry) + "\n").encode("utf-8")
+                except json.JSONDecodeError:
+                    pass
+                dst.write(raw)
+                new_records.append((seg, offset + shift, len(raw), ts))
+                shift += len(raw) - length
+                copied = offset + length
+            src.seek(copied)
+            shutil.copyfileobj(src, dst, COPY_CHUNK)
+            copied = src.tell()
+            dst.flush()
+            os.fsync(dst.fileno())
+        return tmp, new_records, copied, shift
+
+    def _write_records(self, agent, start, records):
+        with open(self.index_path(agent), "r+b") as f:
+            f.seek(start * RECORD_SIZE)
+            f.write(b"".join(_RECORD.pack(*r) for r in records))
+
+    def compact(self, agent):
+        """Fold overlay patches into rewritten segments; returns how many were folded.
+
+        The live segment is folded too, so readers that open ``<agent>.jsonl``
+        directly see corrections. Lines that engine-bypassing writers append
+        while it is being copied are carried over to the new file.
+        """
+        self._drain(agent)
+        with self._lock:
+            state = self._sync(agent)
+            overlay = self._overlay(agent)
+            if not overlay:
+                return 0
+            folded = set()
+            for seg in self._closed_segments(agent):
+                start, stop = self._segment_span(agent, seg, state["count"])
+                hits = [p for p in overlay if start <= p < stop]
+                path = self.segment_path(agent, seg)
+                if not hits or not os.path.exists(path):
+                    continue
+                with open(path, "rb") as src:
+                    tmp, new_records, _, _ = self._fold(agent, seg, src, path, start, stop, overlay)
+                os.replace(tmp, path)
+                self._write_records(agent, start, new_records)
+                folded.update(hits)
+
+            start, stop = self._segment_span(agent, state["live"], state["count"])
+            hits = [p for p in overlay if start <= p < stop]
+            path = self.live_path(agent)
+            if hits and os.path.exists(path):
+                handle = self._handles.pop(agent, None)
+                if handle is not None:
+                    handle.close()
+                with open(path, "rb") as src:
+                    tmp, new_records, copied, shift = self._fold(agent, state["live"], src, path, start, stop, overlay)
+                    os.replace(tmp, path)
+                    if os.fstat(src.fileno()).st_size > copied:
+                        with open(path, "ab") as dst:  # appended to the old inode while we copied
+                            _copy_range(src, dst, copied, os.fstat(src.fileno()).st_size)
+                self._write_records(agent, start, new_records)
+                state["indexed_end"] += shift
+                state["live_id"] = self._live_id(agent)
+                folded.update(hits)
+
+            if folded:
+                for pos in folded:
+                    del overlay[pos]
+                self._write_overlay(agent)
+                print(f"[MEMORY STORE] 🧹 Compacted {len(folded)} overlay patches into {agent} segments.")
+            return len(folded)
+
+    def _write_overlay(self, agent):
+        path = self.overlay_path(agent)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            for pos, fields in self._overlay(agent).items():
+                f.write(json.dumps({"id": pos, "set": fields}) + "\n")
+        os.replace(tmp, path)
+        self._overlay_sigs[agent] = self._overlay_sig(agent)
+
+    def segment_info(self, agent):
+        """Describe every closed segment, oldest first: span, last timestamp, bytes on disk, kind."""
+        self._drain(agent)
+        with self._lock:
+            state = self._sync(agent)
+            info = []
+            for seg in self._closed_segments(agent):
+                start, stop = self._segment_span(agent, seg, state["count"])
+                last_ts = self._read_records(agent, stop - 1, 1)[0][3] if stop > start else 0.0
+                path = self.segment_file(agent, seg)
+                if path is not None:
+                    kind = "zst" if path.endswith(".zst") else "jsonl"
+                    size = os.path.getsize(path)
+                elif os.path.exists(self.expired_marker(agent, seg)):
+                    kind, size = "expired", 0
+                else:
+                    kind = "archived"
+                    size = self.archive.segment_bytes(agent, seg) if self.archive is not None else 0
+                info.append({"seg": seg, "start": start, "stop": stop, "last_ts": last_ts,
+                             "bytes": size, "kind": kind})
+            return info
+
+    def first_jsonl_position(self, agent):
+        """Entry number of the first entry still held in JSONL (everything before it is archived or expired)."""
+        self._drain(agent)
+        with self._lock:
+            state = self._sync(agent)
+            for seg in self._closed_segments(agent):
+                if self.segment_file(agent, seg) is not None:
+                    return self._segment_span(agent, seg, state["count"])[0]
+            return self._segment_span(agent, state["live"], state["count"])[0]
+
+    def agents(self):
+        """Every agent with a live file or closed segments under the root."""
+        names = {name[:-len(".jsonl")] for name in os.listdir(self.root) if name.endswith(".jsonl")}
+        seg_root = os.path.join(self.root, SEGMENT_DIR)
+        if os.path.isdir(seg_root):
+            names.update(os.listdir(seg_root))
+        return sorted(names)
+
+    def agents_with_overlays(self):
+        overlay_dir = os.path.join(self.root, OVERLAY_DIR)
+        if not os.path.isdir(overlay_dir):
+            return []
+        return [name[:-len(".jsonl")] for name in os.listdir(overlay_dir) if name.endswith(".jsonl")]
+
+
+def _merge(entry, fields):
+    data = entry.get("data")
+    if isinstance(data, dict):
+        data.update(fields)
+    else:
+        entry["data"] = dict(fields)
+
+
+class OverlayCompactor:
+    """Background daemon that periodically folds overlay patches into segments."""
+
+    def __init__(self, store, interval=COMPACT_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            for agent in self.store.agents_with_overlays():
+                try:
+                    self.store.compact(agent)
+                except Exception as e:
+                    print(f"[MEMORY STORE ERROR] ❌ Compaction failed for {agent}: {e}")
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.run, name="memory-compactor", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
@@ -4,81 +4,277 @@
 # Purpose: Tier 5 AGI Narrative Memory Engine — Strategic Threading of Cognitive Episodes
 # ============================================================
 
-from core_layer.memory_engine import recall_all
-from core_layer.tex_manifest import TEXPULSE
-from sentence_transformers import SentenceTransformer, util
-from datetime import datetime
+import os
+import json
+import time
+import atexit
+import heapq
+import threading
+from array import array
 from collections import defaultdict
+
 import numpy as np
 
-model = SentenceTransformer('all-MiniLM-L6-v2')
+from core_layer.embedding_service import get_embedder
+from core_layer.memory_engine import MEMORY_DIR, memory_count, recall_entry_pairs
+from core_layer.tex_manifest import TEXPULSE
+
+model = get_embedder()  # shared, loads lazily on first encode
+
+# === Persistent weaver state (embedding cache + online thread assignment)
+WEAVER_DIR = os.path.join(MEMORY_DIR, ".weaver")
+ENCODE_BATCH = 64
+UPDATE_BATCH = 1000  # entries recalled per read while catching up
+CHECKPOINT_SECONDS = float(os.getenv("TEX_WEAVER_CHECKPOINT_SECONDS", "60"))
+THREAD_MEMBERS = int(os.getenv("TEX_WEAVER_THREAD_MEMBERS", "50"))  # most recent members kept per thread
+
+
+class NarrativeWeaver:
+    """Incremental thread weaver for one memory key.
+
+    Embeddings are cached in a float32 matrix on disk, with the matrix row of
+    every entry in a binary sidecar indexed by entry number, and only entries
+    appended since the last run are encoded. Each new entry joins the nearest
+    thread centroid when cosine similarity clears the threshold, otherwise it
+    seeds a new thread — no N×N similarity matrix is ever built.
+
+    A thread keeps a running count, weight and centroid over all its members
+    but lists only its ``TEX_WEAVER_THREAD_MEMBERS`` most recent ones, so the
+    saved state and ``top_threads`` do not grow with the archive.
+
+    Thread state is checkpointed at most every ``TEX_WEAVER_CHECKPOINT_SECONDS``
+    and at exit, not on every update; the row sidecar is only appended to.
+    After a crash the entries since the last checkpoint are threaded again;
+    their embeddings are re-encoded into fresh rows, and the orphaned rows are
+    harmless.
+    """
+
+    def __init__(self, memory_key="tex", similarity_threshold=0.75, root=WEAVER_DIR):
+        self.memory_key = memory_key
+        self.similarity_threshold = similarity_threshold
+        self.dim = model.get_sentence_embedding_dimension()
+        os.makedirs(root, exist_ok=True)
+        self.emb_path = os.path.join(root, f"{memory_key}.emb.f32")
+        self.rows_path = os.path.join(root, f"{memory_key}.rows.i64")
+        self.state_path = os.path.join(root, f"{memory_key}.state.json")
+        self.centroid_path = os.path.join(root, f"{memory_key}.centroids.npy")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._load()
+
+    # === Persistence
+    def _load(self):
+        state = {}
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r") as f:
+                    state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[WEAVER WARNING] ⚠️ Weaver state unreadable, starting fresh: {e}")
+                state = {}
+        if state.get("dim") != self.dim:
+            state = {}
+            for path in (self.emb_path, self.rows_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        self.processed = state.get("processed", 0)
+        self.threads = state.get("threads", [])
+        for thread in self.threads:
+            del thread["members"][:-THREAD_MEMBERS]
+        self.rows = os.path.getsize(self.emb_path) // (4 * self.dim) if os.path.exists(self.emb_path) else 0
+
+        # Embedding row per entry number, -1 when unknown or the entry has no explanation.
+        self.entry_rows = array("q")
+        if os.path.exists(self.rows_path):
+            with open(self.rows_path, "rb") as f:
+                data = f.read()
+            self.entry_rows.frombytes(data[:len(data) - len(data) % self.entry_rows.itemsize])
+        self._rows_saved = len(self.entry_rows)  # entry_rows[:_rows_saved] matches the sidecar
+
+        self.sums = np.zeros((len(self.threads), self.dim), dtype=np.float32)
+        if self.threads and os.path.exists(self.centroid_path):
+            sums = np.load(self.centroid_path)
+            if sums.shape == self.sums.shape:
+                self.sums = sums.astype(np.float32)
+            else:
+                self.threads, self.processed = [], 0
+                self.sums = np.zeros((0, self.dim), dtype=np.float32)
+        self.norms = np.linalg.norm(self.sums, axis=1)
+
+        if state.get("threshold", self.similarity_threshold) != self.similarity_threshold:
+            self._reset_threads()  # re-thread from the cached embeddings on the next update
+            self._dirty = True
+
+    def _save(self):
+        state = {
+            "dim": self.dim,
+            "threshold": self.similarity_threshold,
+            "processed": self.processed,
+            "threads": self.threads,
+        }
+        with open(self.rows_path, "ab") as f:
+            f.truncate(self._rows_saved * self.entry_rows.itemsize)
+            f.write(self.entry_rows[self._rows_saved:].tobytes())
+        self._rows_saved = len(self.entry_rows)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        np.save(self.centroid_path + ".tmp.npy", self.sums)
+        os.replace(self.centroid_path + ".tmp.npy", self.centroid_path)
+        os.replace(tmp, self.state_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def checkpoint(self):
+        """Persist thread state if anything changed since the last save."""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _matrix(self):
+        if not self.rows:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.memmap(self.emb_path, dtype=np.float32, mode="r", shape=(self.rows, self.dim))
+
+    # === Online assignment
+    def _assign(self, entry_no, row, vec, weight):
+        if len(self.threads):
+            sims = (self.sums @ vec) / np.maximum(self.norms, 1e-12)
+            best = int(np.argmax(sims))
+            if sims[best] > self.similarity_threshold:
+                self.sums[best] += vec
+                self.norms[best] = np.linalg.norm(self.sums[best])
+                thread = self.threads[best]
+                thread["count"] += 1
+                thread["weight"] += weight
+                thread["members"].append([entry_no, row, round(float(sims[best]), 3), weight])
+                del thread["members"][:-THREAD_MEMBERS]
+                return
+        self.sums = np.vstack([self.sums, vec[None, :]])
+        self.norms = np.append(self.norms, np.linalg.norm(vec))
+        self.threads.append({"count": 1, "weight": weight, "members": [[entry_no, row, 1.0, weight]]})
+
+    def _reset_threads(self):
+        """Drop every thread; ``update`` then re-threads from entry 0, reusing cached embeddings."""
+        self.threads, self.processed = [], 0
+        self.sums = np.zeros((0, self.dim), dtype=np.float32)
+        self.norms = np.zeros(0, dtype=np.float32)
+
+    # === Incremental update
+    def update(self):
+        """Encode and thread entries appended since the last run; returns how many were added."""
+        with self._lock:
+            total = memory_count(self.memory_key)
+            if total < self.processed:
+                print("[WEAVER] ♻️ Memory archive shrank — re-threading from scratch.")
+                self._reset_threads()
+                del self.entry_rows[:]
+                self._rows_saved = 0
+            if total == self.processed:
+                return 0
+
+            added = 0
+            for lo in range(self.processed, total, UPDATE_BATCH):
+                added += self._update_range(lo, min(lo + UPDATE_BATCH, total))
+            self.processed = total
+            self._dirty = True
+            if time.monotonic() - self._last_save >= CHECKPOINT_SECONDS:
+                self._save()
+            return added
+
+    def _update_range(self, start, stop):
+        if len(self.entry_rows) < stop:
+            self.entry_rows.extend([-1] * (stop - len(self.entry_rows)))
+        pending, to_encode = [], []
+        for entry_no, entry in recall_entry_pairs(self.memory_key, range(start, stop)):
+            data = entry.get("data", {})
+            if not isinstance(data, dict) or "explanation" not in data:
+                continue
+            urgency = data.get("urgency", TEXPULSE.get("urgency"))
+            coherence = data.get("coherence", TEXPULSE.get("coherence"))
+            weight = (coherence if coherence is not None else 0.6) * 0.5 + (urgency if urgency is not None else 0.6) * 0.5
+            pending.append((entry_no, weight))
+            if self.entry_rows[entry_no] < 0:
+                to_encode.append((entry_no, data["explanation"]))
+
+        if to_encode:
+            vectors = model.encode([t for _, t in to_encode], batch_size=ENCODE_BATCH,
+                                   normalize_embeddings=True).astype(np.float32)
+            with open(self.emb_path, "ab") as f:
+                f.write(vectors.tobytes())
+            for i, (entry_no, _) in enumerate(to_encode):
+                self.entry_rows[entry_no] = self.rows + i
+            self._rows_saved = min(self._rows_saved, to_encode[0][0])
+            self.rows += len(to_encode)
+
+        matrix = self._matrix()
+        for entry_no, weight in pending:
+            row = self.entry_rows[entry_no]
+            self._assign(entry_no, row, np.asarray(matrix[row]), weight)
+        return len(pending)
+
+    def top_threads(self, top_k=3):
+        ranked = heapq.nlargest(top_k, enumerate(self.threads), key=lambda t: t[1]["weight"] * t[1]["count"])
+        top_threads = []
+        for tid, thread in ranked:
+            scores = {entry_no: score for entry_no, _, score, _ in thread["members"]}
+            entries = []
+            for entry_no, entry in recall_entry_pairs(self.memory_key, list(scores)):
+                data = entry.get("data", {})
+                entries.append({
+                    "text": data.get("explanation", ""),
+                    "timestamp": entry.get("timestamp", ""),
+                    "emotion": data.get("emotion", TEXPULSE.get("emotional_state")),
+                    "urgency": data.get("urgency", TEXPULSE.get("urgency")),
+                    "coherence": data.get("coherence", TEXPULSE.get("coherence")),
+                    "score": scores[entry_no]
+                })
+            if not entries:
+                continue
+            top_threads.append({
+                "thread_id": f"thread_{tid+1}",
+                "emotional_pulse": _summarize_emotion(entries),
+                "urgency_avg": round(np.mean([e["urgency"] for e in entries]), 2),
+                "coherence_avg": round(np.mean([e["coherence"] for e in entries]), 2),
+                "entries": entries
+            })
+        return top_threads
+
+
+_weavers = {}
+_weavers_lock = threading.Lock()
+
+def get_weaver(memory_key="tex", similarity_threshold=0.75):
+    with _weavers_lock:
+        weaver = _weavers.get(memory_key)
+        if weaver is None or weaver.similarity_threshold != similarity_threshold:
+            if weaver is not None:
+                weaver.checkpoint()
+            weaver = _weavers[memory_key] = NarrativeWeaver(memory_key, similarity_threshold)
+        return weaver
+
+@atexit.register
+def checkpoint_weavers():
+    with _weavers_lock:
+        weavers = list(_weavers.values())
+    for weaver in weavers:
+        try:
+            weaver.checkpoint()
+        except Exception as e:
+            print(f"[WEAVER WARNING] ⚠️ Checkpoint of {weaver.memory_key} failed: {e}")
 
 def weave_narrative_threads(memory_key="tex", top_k=3, similarity_threshold=0.75):
-    all_entries = recall_all(memory_key)
-    if not all_entries:
+    weaver = get_weaver(memory_key, similarity_threshold)
+    weaver.update()
+    if not weaver.processed:
         print("[WEAVER] ⚠️ No memory entries found.")
         return []
-
-    explanations, timestamps, emotions, urgencies, coherences = [], [], [], [], []
-    for entry in all_entries:
-        if "explanation" in entry.get("data", {}):
-            explanations.append(entry["data"]["explanation"])
-            timestamps.append(entry.get("timestamp", ""))
-            emotions.append(entry.get("data", {}).get("emotion", TEXPULSE.get("emotional_state")))
-            urgencies.append(entry.get("data", {}).get("urgency", TEXPULSE.get("urgency")))
-            coherences.append(entry.get("data", {}).get("coherence", TEXPULSE.get("coherence")))
-
-    if not explanations:
+    if not weaver.threads:
         print("[WEAVER] ⚠️ No explanations found in memory.")
         return []
-
-    embeddings = model.encode(explanations, convert_to_tensor=True)
-    similarity_matrix = util.pytorch_cos_sim(embeddings, embeddings).cpu().numpy()
-
-    threads = defaultdict(list)
-    visited = set()
-    for idx, sim_row in enumerate(similarity_matrix):
-        if idx in visited:
-            continue
-        thread = [idx]
-        for jdx, score in enumerate(sim_row):
-            if score > similarity_threshold and jdx != idx and jdx not in visited:
-                thread.append(jdx)
-                visited.add(jdx)
-        visited.add(idx)
-
-        threads[f"thread_{len(threads)+1}"] = [{
-            "text": explanations[i],
-            "timestamp": timestamps[i],
-            "emotion": emotions[i],
-            "urgency": urgencies[i],
-            "coherence": coherences[i],
-            "score": round(similarity_matrix[idx][i], 3)
-        } for i in thread]
-
-    # Score threads by weighted coherence × urgency × size
-    def thread_weight(entries):
-        if not entries: return 0
-        total = 0
-        for e in entries:
-            coherence = e.get("coherence", 0.6)
-            urgency = e.get("urgency", 0.6)
-            total += (coherence * 0.5 + urgency * 0.5)
-        return total * len(entries)
-
-    sorted_threads = sorted(threads.items(), key=lambda x: thread_weight(x[1]), reverse=True)
-
-    top_threads = []
-    for tid, entries in sorted_threads[:top_k]:
-        top_threads.append({
-            "thread_id": tid,
-            "emotional_pulse": _summarize_emotion(entries),
-            "urgency_avg": round(np.mean([e["urgency"] for e in entries]), 2),
-            "coherence_avg": round(np.mean([e["coherence"] for e in entries]), 2),
-            "entries": entries
-        })
-
-    return top_threads
+    return weaver.top_threads(top_k)
 
 def _summarize_emotion(entries):
     """Determine dominant emotion and volatility of a memory thread."""
@@ -98,4 +294,4 @@ if __name__ == "__main__":
     for thread in threads:
         print(f"\n🧵 {thread['thread_id']} | Dominant Emotion: {thread['emotional_pulse']['dominant']} | Volatility: {thread['emotional_pulse']['volatility']}")
         for entry in thread["entries"]:
-            print(f"   → {entry['timestamp']} | {entry['emotion']} | {entry['text']}")
\ No newline at end of file
+            print(f"   → {entry['timestamp']} | {entry['emotion']} | {entry['text']}")
@@ -0,0 +1,218 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/memory_writer.py
+# Purpose: Shared background writer with group commit for memory_archive appends
+# ============================================================
+
+"""Buffered, batched writer shared by every ``store_to_memory``.
+
+Producers enqueue records onto a bounded queue (a full queue blocks the
+producer, which is the back-pressure). One daemon thread drains it, groups
+records per sink + key, and commits each group with a single write on a
+cached open handle once ``batch_size`` records / ``batch_bytes`` bytes are
+buffered or ``commit_interval`` seconds have passed.
+
+A sink is any object with ``write_batch(key, items)`` and ``sync()``;
+``FileSink`` appends raw lines to paths, and ``MemoryStore`` is a sink for its
+own segments so the offset index stays consistent.
+
+fsync policy (``TEX_MEMORY_FSYNC``): ``none`` leaves it to the OS,
+``interval`` syncs at most every ``fsync_interval`` seconds, ``batch`` syncs
+after every group commit.
+"""
+
+import os
+import atexit
+import queue
+import threading
+import time
+from collections import defaultdict
+
+# === Config (env overrideable)
+QUEUE_MAX = int(os.getenv("TEX_MEMORY_QUEUE_MAX", "10000"))
+BATCH_SIZE = int(os.getenv("TEX_MEMORY_BATCH_SIZE", "512"))
+BATCH_BYTES = int(os.getenv("TEX_MEMORY_BATCH_BYTES", str(1024 * 1024)))
+COMMIT_INTERVAL = float(os.getenv("TEX_MEMORY_COMMIT_INTERVAL", "0.05"))
+FSYNC_POLICY = os.getenv("TEX_MEMORY_FSYNC", "interval")
+FSYNC_INTERVAL = float(os.getenv("TEX_MEMORY_FSYNC_INTERVAL", "1.0"))
+
+FSYNC_POLICIES = ("none", "interval", "batch")
+
+
+class FileSink:
+    """Appends pre-serialised lines (bytes) to plain files, keeping handles open."""
+
+    def __init__(self):
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def _handle(self, path):
+        f = self._handles.get(path)
+        if f is not None:
+            try:
+                if os.fstat(f.fileno()).st_ino == os.stat(path).st_ino:
+                    return f
+            except OSError:
+                pass
+            f.close()  # file was rotated or removed underneath us
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        f = self._handles[path] = open(path, "ab")
+        return f
+
+    def write_batch(self, path, lines):
+        with self._lock:
+            f = self._handle(path)
+            f.write(b"".join(lines))
+            f.flush()
+
+    def sync(self):
+        with self._lock:
+            for f in self._handles.values():
+                os.fsync(f.fileno())
+
+    def close(self):
+        with self._lock:
+            for f in self._handles.values():
+                f.close()
+            self._handles.clear()
+
+
+class MemoryWriter:
+    def __init__(self, max_queue=QUEUE_MAX, batch_size=BATCH_SIZE, batch_bytes=BATCH_BYTES,
+                 commit_interval=COMMIT_INTERVAL, fsync=FSYNC_POLICY, fsync_interval=FSYNC_INTERVAL):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync} (expected one of {FSYNC_POLICIES})")
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._pending = defaultdict(int)
+        self._cond = threading.Condition()
+        self._sinks = set()
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        self.stats = {"records": 0, "batches": 0, "fsyncs": 0, "errors": 0}
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+
+    # === Producer side
+    def submit(self, sink, key, item, size=0):
+        """Queue ``item`` for ``sink.write_batch(key, ...)``; blocks while the queue is full."""
+        if self._closed:
+            sink.write_batch(key, [item])
+            return
+        with self._cond:
+            self._pending[key] += 1
+        self._queue.put((sink, key, item, size))
+
+    def flush(self, key=None, timeout=None):
+        """Block until everything queued (for ``key``, or overall) is committed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while (self._pending.get(key, 0) if key is not None else any(self._pending.values())):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        if key is None:
+            self._sync_all()
+        return True
+
+    def close(self):
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        for sink in list(self._sinks):
+            close = getattr(sink, "close", None)
+            if close:
+                close()
+
+    # === Writer thread
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, size = [first], first[3]
+            deadline = time.monotonic() + self.commit_interval
+            while len(batch) < self.batch_size and size < self.batch_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._commit(batch)
+                    return
+                batch.append(item)
+                size += item[3]
+            self._commit(batch)
+
+    def _commit(self, batch):
+        groups = {}
+        for sink, key, item, _ in batch:
+            groups.setdefault((id(sink), key), (sink, key, []))[2].append(item)
+        for sink, key, items in groups.values():
+            self._sinks.add(sink)
+            try:
+                sink.write_batch(key, items)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"[MEMORY WRITER ERROR] ❌ Failed committing {len(items)} records to {key}: {e}")
+        self.stats["records"] += len(batch)
+        self.stats["batches"] += 1
+
+        now = time.monotonic()
+        if self.fsync == "batch" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_interval):
+            self._sync_all()
+
+        with self._cond:
+            for _, key, _, _ in batch:
+                self._pending[key] -= 1
+                if not self._pending[key]:
+                    del self._pending[key]
+            self._cond.notify_all()
+
+    def _sync_all(self):
+        if self.fsync == "none":
+            return
+        for sink in list(self._sinks):
+            try:
+                sink.sync()
+            except Exception as e:
+                print(f"[MEMORY WRITER ERROR] ❌ fsync failed: {e}")
+        self._last_fsync = time.monotonic()
+        self.stats["fsyncs"] += 1
+
+
+# === Process-wide writer
+_writer = None
+_writer_lock = threading.Lock()
+file_sink = FileSink()
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = MemoryWriter()
+            atexit.register(_writer.close)
+        return _writer
+
+def append_line(path, line):
+    """Queue one text line (newline added) for ``path`` through the shared writer."""
+    data = (line + "\n").encode("utf-8")
+    get_writer().submit(file_sink, path, data, len(data))
+
+def flush(timeout=None):
+    """Commit everything queued so far; call before shutdown."""
+    if _writer is not None:
+        return _writer.flush(timeout=timeout)
+    return True
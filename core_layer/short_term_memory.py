@@ -0,0 +1,102 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/short_term_memory.py
+# Purpose: Bounded, time-indexed short-term memory ring (RAM only)
+# ============================================================
+
+"""Fixed-capacity ring buffer behind ``memory_engine.recall_recent``.
+
+Records are stored struct-of-arrays style (a float epoch array next to an
+entry array) so time-window queries are a binary search instead of an ISO
+parse per entry. Every agent also gets a smaller secondary ring pointing at
+the same entries, and the number of agent rings is itself capped, so the
+whole structure has a hard memory ceiling no matter how long the process runs.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+# === Config (env overrideable)
+SHORT_TERM_CAPACITY = int(os.getenv("TEX_SHORT_TERM_CAPACITY", "4096"))
+AGENT_RING_CAPACITY = int(os.getenv("TEX_AGENT_RING_CAPACITY", "256"))
+MAX_AGENT_RINGS = int(os.getenv("TEX_MAX_AGENT_RINGS", "512"))
+
+
+class TimeRing:
+    """Ring of (epoch, entry) pairs kept in non-decreasing epoch order."""
+
+    __slots__ = ("capacity", "_ts", "_entries", "_start", "_size", "_watermark")
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._ts = [0.0] * capacity
+        self._entries = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self._watermark = 0.0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, epoch, entry):
+        # Clamp to the watermark so the ring stays sorted even if the wall clock steps back.
+        self._watermark = max(self._watermark, epoch)
+        if self._size < self.capacity:
+            slot = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._ts[slot] = self._watermark
+        self._entries[slot] = entry
+
+    def _first_at_or_after(self, epoch):
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ts[(self._start + mid) % self.capacity] < epoch:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def recent(self, n, since=None):
+        """Last ``n`` entries (oldest first), optionally only those at or after epoch ``since``."""
+        first = max(0, self._size - n)
+        if since is not None:
+            first = max(first, self._first_at_or_after(since))
+        return [self._entries[(self._start + i) % self.capacity] for i in range(first, self._size)]
+
+
+class ShortTermMemory:
+    def __init__(self, capacity=SHORT_TERM_CAPACITY, agent_capacity=AGENT_RING_CAPACITY,
+                 max_agents=MAX_AGENT_RINGS):
+        self.agent_capacity = agent_capacity
+        self.max_agents = max_agents
+        self._ring = TimeRing(capacity)
+        self._agents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ring)
+
+    def append(self, epoch, entry):
+        agent = entry.get("agent")
+        with self._lock:
+            self._ring.append(epoch, entry)
+            ring = self._agents.get(agent)
+            if ring is None:
+                ring = self._agents[agent] = TimeRing(self.agent_capacity)
+                if len(self._agents) > self.max_agents:
+                    self._agents.popitem(last=False)
+            else:
+                self._agents.move_to_end(agent)
+            ring.append(epoch, entry)
+
+    def recent(self, n=5, since=None, agent=None):
+        with self._lock:
+            if agent is None:
+                return self._ring.recent(n, since)
+            ring = self._agents.get(agent)
+            return ring.recent(n, since) if ring is not None else []
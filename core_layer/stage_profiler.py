@@ -0,0 +1,345 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/stage_profiler.py
+# Purpose: Per-stage cycle profiler with HDR-style latency histograms
+# ============================================================
+
+"""Per-stage profiling for the cognitive loops.
+
+    with profile_stage("finance", "alpha_analysis"):    context manager
+        ...
+    @profiled("finance")                                decorator (stage = function name)
+    trace = CycleTrace("breathing")                     sections of an inline loop:
+    trace.lap("think") ... trace.lap("speak") ...       each lap closes the previous
+    trace.end()                                         section and opens the next one
+
+Every stage run records one sample per metric:
+    wall_seconds    perf_counter delta
+    cpu_seconds     thread_time delta (the stage's own thread only)
+    read_bytes      bytes read from memory_archive through the MemoryStore
+    written_bytes   and jsonl readers, counted per thread via ``count_io``
+                    (once per read/write call, never per line)
+    alloc_bytes     net traced allocation growth; only with TEX_PROFILER_TRACEMALLOC=1,
+                    and process-wide, so overlapping stages share the blame
+
+Samples go into log-linear histograms (HDR style: values keep their top
+SUB_BUCKET_BITS bits, i.e. 2**(SUB_BUCKET_BITS-1) = 64 linear sub-buckets per
+power of two, so a reported percentile is at most 1/64 ≈ 1.6% above the true
+value; constant memory). Each series keeps a rolling window of
+``TEX_PROFILER_WINDOW`` seconds as a ring of slot histograms. p50/p95/p99
+over that window are exported:
+    - at ``/metrics`` on TEX_PROFILER_ADDR:TEX_PROFILER_PORT (localhost only
+      unless configured) through prometheus_client, as
+      ``tex_stage_<metric>{component, stage, quantile}`` gauges computed at
+      scrape time, plus a ``tex_stage_runs_total`` counter
+    - to TEX_PROFILER_SUMMARY (JSON, one file per process: ``{process}`` is
+      the entry script's name and ``{pid}`` the process id), rewritten at
+      most every TEX_PROFILER_FLUSH seconds
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+import tracemalloc
+from collections import deque
+
+try:
+    from prometheus_client import start_http_server
+    from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily, REGISTRY
+    PROMETHEUS_ENABLED = True
+except ImportError:
+    PROMETHEUS_ENABLED = False
+
+# === Config (env overrideable)
+PROFILER_ENABLED = os.getenv("TEX_PROFILER", "1") == "1"
+PROFILER_PORT = int(os.getenv("TEX_PROFILER_PORT", "9464"))   # 0 disables the HTTP endpoint
+PROFILER_ADDR = os.getenv("TEX_PROFILER_ADDR", "127.0.0.1")    # 0.0.0.0 to let remote scrapers in
+PROFILER_SUMMARY = os.getenv("TEX_PROFILER_SUMMARY", "memory_archive/stage_profile.{process}.json")
+PROFILER_FLUSH = float(os.getenv("TEX_PROFILER_FLUSH", "30"))
+PROFILER_WINDOW = float(os.getenv("TEX_PROFILER_WINDOW", "600"))
+PROFILER_SLOTS = int(os.getenv("TEX_PROFILER_SLOTS", "10"))
+PROFILER_TRACEMALLOC = os.getenv("TEX_PROFILER_TRACEMALLOC", "0") == "1"
+
+SUB_BUCKET_BITS = 7
+QUANTILES = (0.5, 0.95, 0.99)
+# metric → (unit scale stored as integers, exported unit scale)
+METRICS = {
+    "wall_seconds": 1e6,     # stored in microseconds
+    "cpu_seconds": 1e6,
+    "read_bytes": 1,
+    "written_bytes": 1,
+    "alloc_bytes": 1,
+}
+
+
+# === memory_archive I/O accounting
+_io = threading.local()
+
+
+def count_io(read=0, written=0):
+    """Attribute ``read``/``written`` bytes to the calling thread's running stage."""
+    _io.read = getattr(_io, "read", 0) + read
+    _io.written = getattr(_io, "written", 0) + written
+
+
+def _io_totals():
+    return getattr(_io, "read", 0), getattr(_io, "written", 0)
+
+
+def _summary_path(template=PROFILER_SUMMARY):
+    """Expand ``{process}``/``{pid}`` so concurrent processes never overwrite each other's summary."""
+    script = os.path.splitext(os.path.basename(sys.argv[0] if sys.argv and sys.argv[0] else ""))[0]
+    process = script if script and script not in ("-c", "-m", "__main__") else f"pid{os.getpid()}"
+    return template.format(process=process, pid=os.getpid())
+
+
+# === Histograms
+class Histogram:
+    """Log-linear histogram of non-negative integers."""
+
+    def __init__(self):
+        self.counts = {}   # (exponent, mantissa) → count
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def _bucket(value):
+        shift = max(value.bit_length() - SUB_BUCKET_BITS, 0)
+        return shift, value >> shift
+
+    def record(self, value):
+        value = max(int(value), 0)
+        key = self._bucket(value)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q):
+        """Highest value equivalent to the bucket holding quantile ``q`` (never above ``max``)."""
+        if not self.count:
+            return 0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for shift, mantissa in sorted(self.counts):
+            seen += self.counts[(shift, mantissa)]
+            if seen >= rank:
+                return min(((mantissa + 1) << shift) - 1, self.max)
+        return self.max
+
+
+class RollingHistogram:
+    """Histogram over the last ``window`` seconds, kept as ``slots`` rotating histograms."""
+
+    def __init__(self, window=PROFILER_WINDOW, slots=PROFILER_SLOTS):
+        self.window = window
+        self.slot_seconds = window / max(slots, 1)
+        self._slots = deque()  # (slot start, Histogram), oldest first
+        self.lifetime_count = 0
+
+    def _expire(self, now):
+        while self._slots and self._slots[0][0] <= now - self.window:
+            self._slots.popleft()
+
+    def record(self, value, now):
+        if not self._slots or now - self._slots[-1][0] >= self.slot_seconds:
+            self._slots.append((now, Histogram()))
+            self._expire(now)
+        self._slots[-1][1].record(value)
+        self.lifetime_count += 1
+
+    def snapshot(self, now):
+        self._expire(now)
+        merged = Histogram()
+        for _, hist in self._slots:
+            merged.merge(hist)
+        return merged
+
+
+# === Profiler
+class StageProfiler:
+    def __init__(self, summary_path=None, flush_interval=PROFILER_FLUSH):
+        self.summary_path = _summary_path() if summary_path is None else summary_path
+        self.flush_interval = flush_interval
+        self._series = {}  # (component, stage) → {metric: RollingHistogram}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, component, stage, sample):
+        now = time.monotonic()
+        with self._lock:
+            series = self._series.get((component, stage))
+            if series is None:
+                series = self._series[(component, stage)] = {m: RollingHistogram() for m in METRICS}
+            for metric, value in sample.items():
+                series[metric].record(value * METRICS[metric], now)
+            due = self.summary_path and now - self._last_flush >= self.flush_interval
+            if due:
+                self._last_flush = now
+        if due:
+            self.write_summary()
+
+    def snapshot(self):
+        """``{(component, stage): {"runs": n, metric: (histogram, scale)}}`` over the rolling window."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                key: dict(
+                    {m: (h.snapshot(now), METRICS[m]) for m, h in series.items()},
+                    runs=series["wall_seconds"].lifetime_count,
+                )
+                for key, series in self._series.items()
+            }
+
+    def summary(self):
+        stages = {}
+        for (component, stage), series in sorted(self.snapshot().items()):
+            entry = {"runs": series.pop("runs")}
+            for metric, (hist, scale) in series.items():
+                if not hist.count:
+                    continue
+                entry[metric] = {
+                    "count": hist.count,
+                    "mean": round(hist.total / hist.count / scale, 6),
+                    "max": round(hist.max / scale, 6),
+                    **{f"p{int(q * 100)}": round(hist.percentile(q) / scale, 6) for q in QUANTILES},
+                }
+            stages.setdefault(component, {})[stage] = entry
+        return {"generated_at": time.time(), "window_seconds": PROFILER_WINDOW, "stages": stages}
+
+    def write_summary(self):
+        try:
+            os.makedirs(os.path.dirname(self.summary_path) or ".", exist_ok=True)
+            tmp = self.summary_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.summary(), f, indent=2)
+            os.replace(tmp, self.summary_path)
+        except Exception as e:
+            print(f"[STAGE PROFILER] ⚠️ Could not write {self.summary_path}: {e}")
+
+    # --- prometheus_client custom collector --------------------------------
+    def collect(self):
+        labels = ["component", "stage", "quantile"]
+        families = {m: GaugeMetricFamily(f"tex_stage_{m}", f"Stage {m.replace('_', ' ')} quantiles "
+                                         f"over the last {PROFILER_WINDOW:.0f}s", labels=labels) for m in METRICS}
+        runs = CounterMetricFamily("tex_stage_runs", "Stage runs since start", labels=["component", "stage"])
+        for (component, stage), series in self.snapshot().items():
+            runs.add_metric([component, stage], series.pop("runs"))
+            for metric, (hist, scale) in series.items():
+                if hist.count:
+                    for q in QUANTILES:
+                        families[metric].add_metric([component, stage, str(q)], hist.percentile(q) / scale)
+        yield from families.values()
+        yield runs
+
+
+_profiler = None
+_profiler_lock = threading.Lock()
+
+
+def get_profiler():
+    """Process-wide profiler; the first call registers the Prometheus collector and endpoint."""
+    global _profiler
+    if _profiler is None:
+        with _profiler_lock:
+            if _profiler is None:
+                profiler = StageProfiler()
+                if PROMETHEUS_ENABLED:
+                    REGISTRY.register(profiler)
+                    if PROFILER_PORT:
+                        try:
+                            start_http_server(PROFILER_PORT, addr=PROFILER_ADDR)
+                            print(f"[STAGE PROFILER] 📈 Prometheus metrics on {PROFILER_ADDR}:{PROFILER_PORT}/metrics")
+                        except OSError as e:
+                            print(f"[STAGE PROFILER] ⚠️ Metrics port {PROFILER_PORT} unavailable: {e}")
+                if PROFILER_TRACEMALLOC and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                _profiler = profiler
+    return _profiler
+
+
+# === Probes
+class _Probe:
+    __slots__ = ("component", "stage", "wall", "cpu", "read", "written", "traced")
+
+    def __init__(self, component, stage):
+        self.component = component
+        self.stage = stage
+        self.read, self.written = _io_totals()
+        self.traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        self.cpu = time.thread_time()
+        self.wall = time.perf_counter()
+
+    def finish(self):
+        wall = time.perf_counter() - self.wall
+        cpu = time.thread_time() - self.cpu
+        read, written = _io_totals()
+        sample = {"wall_seconds": wall, "cpu_seconds": cpu,
+                  "read_bytes": read - self.read, "written_bytes": written - self.written}
+        if self.traced is not None and tracemalloc.is_tracing():
+            sample["alloc_bytes"] = max(tracemalloc.get_traced_memory()[0] - self.traced, 0)
+        get_profiler().record(self.component, self.stage, sample)
+
+
+class profile_stage:
+    """Context manager recording one run of ``component``/``stage``; a no-op when profiling is off."""
+
+    __slots__ = ("component", "stage", "_probe")
+
+    def __init__(self, component, stage):
+        self.component = component
+        self.stage = stage
+        self._probe = None
+
+    def __enter__(self):
+        if PROFILER_ENABLED:
+            self._probe = _Probe(self.component, self.stage)
+        return self
+
+    def __exit__(self, *exc):
+        if self._probe is not None:
+            self._probe.finish()
+            self._probe = None
+        return False
+
+
+def profiled(component, stage=None):
+    """Decorator form of ``profile_stage``; the stage name defaults to the function name."""
+    def decorate(fn):
+        name = stage or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with profile_stage(component, name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class CycleTrace:
+    """Lap timer for long inline loops where wrapping each section would re-indent it."""
+
+    def __init__(self, component):
+        self.component = component
+        self._probe = None
+
+    def lap(self, stage):
+        self.end()
+        if PROFILER_ENABLED:
+            self._probe = _Probe(self.component, stage)
+
+    def end(self):
+        if self._probe is not None:
+            self._probe.finish()
+            self._probe = None
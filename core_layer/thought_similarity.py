@@ -0,0 +1,151 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: core_layer/thought_similarity.py
+# Purpose: Shared vectorized similarity engine for thought-stream monitors
+# ============================================================
+
+"""Vectorized thought similarity used by the stall detector and meta coherence.
+
+    embed_thoughts(texts)                normalized (n, d) float32 embeddings
+                                         from the shared, cached embedding service
+    count_similar_pairs(emb, threshold)  number of i < j pairs above threshold
+                                         (upper triangle of E·Eᵀ, no Python loop)
+    RollingCoherence(window)             adjacent-pair similarity and conflict
+                                         counts kept as running sums over a
+                                         sliding window: O(1) work per appended
+                                         thought, one embedding lookup each
+
+If the embedding model cannot load, vectors fall back to hashed bag-of-words
+so monitors keep scoring instead of raising inside the cognitive loop. The
+model is tried again every ``TEX_THOUGHT_EMBED_RETRY`` seconds; the fallback
+is logged once per outage. Model and fallback vectors live in different
+spaces, so ``RollingCoherence`` never compares one with the other.
+
+Scores are cosine similarities. Unrelated thoughts land near 0.0-0.2, where
+``difflib.SequenceMatcher`` (which the coherence monitor used before) gave
+them character-overlap ratios of about 0.2-0.37, so thresholds tuned on the
+old score need lowering.
+"""
+
+import os
+import re
+import time
+import zlib
+from collections import deque
+
+import numpy as np
+
+from core_layer.embedding_service import get_embedder
+
+FALLBACK_DIM = 512
+EMBED_RETRY_SECONDS = float(os.getenv("TEX_THOUGHT_EMBED_RETRY", "300"))
+CONTRADICTION_KEYWORDS = ("not", "never", "no", "opposite", "contradict", "fail")
+CONFLICT_PENALTY = 0.15
+
+_WORD = re.compile(r"\w+")
+_fallback_until = 0.0  # monotonic time before which the model is not retried
+_fallback_logged = False
+
+
+def _hashed_vectors(texts):
+    vectors = np.zeros((len(texts), FALLBACK_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in _WORD.findall(text.lower()):
+            vectors[row, zlib.crc32(word.encode("utf-8")) % FALLBACK_DIM] += 1.0
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+def embed_thoughts(texts):
+    return _embed(list(texts))[0]
+
+
+def _embed(texts):
+    """``(vectors, space)``; ``space`` is "model" or "hashed", telling which embedding produced them."""
+    global _fallback_until, _fallback_logged
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32), "model"
+    if time.monotonic() >= _fallback_until:
+        try:
+            vectors = np.asarray(get_embedder().encode(texts, normalize_embeddings=True), dtype=np.float32)
+        except Exception as e:
+            _fallback_until = time.monotonic() + EMBED_RETRY_SECONDS
+            if not _fallback_logged:
+                print(f"[THOUGHT SIMILARITY] ⚠️ Embedding model unavailable ({e}) — using hashed bag-of-words, "
+                      f"retrying every {EMBED_RETRY_SECONDS:.0f}s.")
+                _fallback_logged = True
+        else:
+            if _fallback_logged:
+                print("[THOUGHT SIMILARITY] ✅ Embedding model back — leaving hashed bag-of-words.")
+                _fallback_logged = False
+            return vectors, "model"
+    return _hashed_vectors(texts), "hashed"
+
+
+def count_similar_pairs(embeddings, threshold):
+    """Count pairs i < j whose cosine similarity exceeds ``threshold``."""
+    if len(embeddings) < 2:
+        return 0
+    return int(np.count_nonzero(np.triu(embeddings @ embeddings.T > threshold, k=1)))
+
+
+def contradiction_markers(text):
+    """Keywords (substring match, as the coherence monitor always used) present in ``text``."""
+    lowered = text.lower()
+    return frozenset(word for word in CONTRADICTION_KEYWORDS if word in lowered)
+
+
+class RollingCoherence:
+    """
+    Coherence over the last ``window`` thoughts: mean adjacent-pair cosine
+    similarity minus ``CONFLICT_PENALTY`` per adjacent pair that shares a
+    contradiction keyword while differing in text, clamped to [0, 1].
+
+    If the embedding switched between the model and the hashed fallback since
+    the previous thought, that thought is re-embedded in the current space; if
+    the spaces still differ (the switch flipped again), the pair is skipped
+    rather than scored.
+    """
+
+    def __init__(self, window=6):
+        self.window = window
+        self._last = None                                 # (text, markers, embedding, space) of newest thought
+        self._pairs = deque()                             # (similarity, conflict) per adjacent pair
+        self._similarity_sum = 0.0
+        self._conflicts = 0
+
+    def append(self, text):
+        vectors, space = _embed([text])
+        embedding, markers = vectors[0], contradiction_markers(text)
+        if self._last is not None:
+            prev_text, prev_markers, prev_embedding, prev_space = self._last
+            if prev_space != space:
+                vectors, prev_space = _embed([prev_text])
+                prev_embedding = vectors[0]
+            if prev_space == space:
+                similarity = float(prev_embedding @ embedding)
+                conflict = int(bool(prev_markers & markers) and prev_text.lower() != text.lower())
+                self._pairs.append((similarity, conflict))
+                self._similarity_sum += similarity
+                self._conflicts += conflict
+                if len(self._pairs) > self.window - 1:
+                    old_similarity, old_conflict = self._pairs.popleft()
+                    self._similarity_sum -= old_similarity
+                    self._conflicts -= old_conflict
+        self._last = (text, markers, embedding, space)
+
+    @property
+    def conflicts(self):
+        return self._conflicts
+
+    @property
+    def average_similarity(self):
+        return self._similarity_sum / len(self._pairs) if self._pairs else 1.0
+
+    def score(self):
+        return max(0.0, min(1.0, self.average_similarity - self._conflicts * CONFLICT_PENALTY))
+
+    def clear(self):
+        self._last = None
+        self._pairs.clear()
+        self._similarity_sum = 0.0
+        self._conflicts = 0
@@ -49,6 +49,7 @@ from finance.multiworld.multiworld_memory import MultiWorldMemory
 from finance.multiworld.multiworld_causal_simulator import MultiWorldCausalSimulator
 from finance.multiworld.multiworld_reasoner import MultiWorldReasoner
 from core_layer.long_horizon_override import CausalOverrideReflex
+from core_layer.stage_profiler import profile_stage
 
 class FinanceOrchestrator:
     def __init__(self):
@@ -88,72 +89,81 @@ class FinanceOrchestrator:
         report = {}
 
         # === Stage 1: Input
-        input_report, market_mood, futures, emo_paths, foresight, tree = run_input_stage(
-            self.simulator, self.emotions, self.causal, self.foresight,
-            self.tree, self.meta, self.memory
-        )
-        report.update(input_report)
+        with profile_stage("finance", "input"):
+            input_report, market_mood, futures, emo_paths, foresight, tree = run_input_stage(
+                self.simulator, self.emotions, self.causal, self.foresight,
+                self.tree, self.meta, self.memory
+            )
+            report.update(input_report)
 
         # === Stage 2: Decision
-        decision_report, ranked, branches = run_decision_stage(
-            self.decision, self.branch, futures, emo_paths
-        )
-        report.update(decision_report)
+        with profile_stage("finance", "decision"):
+            decision_report, ranked, branches = run_decision_stage(
+                self.decision, self.branch, futures, emo_paths
+            )
+            report.update(decision_report)
 
         # === Stage 3: Alpha Analysis
-        alpha_report, alpha, paradox, alpha_fusion = run_alpha_analysis_stage(
-            self.alpha, self.alpha_paradox, self.alpha_fuser, ranked, foresight, self.memory, None
-        )
-        report.update(alpha_report)
+        with profile_stage("finance", "alpha_analysis"):
+            alpha_report, alpha, paradox, alpha_fusion = run_alpha_analysis_stage(
+                self.alpha, self.alpha_paradox, self.alpha_fuser, ranked, foresight, self.memory, None
+            )
+            report.update(alpha_report)
 
         # === Stage 4: Portfolio Allocation
-        allocation_report, portfolio = run_portfolio_allocation_stage(
-            self.thinker, self.liquidity_engine, branches, market_mood, foresight
-        )
-        report.update(allocation_report)
+        with profile_stage("finance", "portfolio_allocation"):
+            allocation_report, portfolio = run_portfolio_allocation_stage(
+                self.thinker, self.liquidity_engine, branches, market_mood, foresight
+            )
+            report.update(allocation_report)
 
         # === Stage 5: Strategy Scoring
-        regret_score = simulate_regret_score(portfolio, ranked)
-        report["regret"] = regret_score
+        with profile_stage("finance", "strategy_scoring"):
+            regret_score = simulate_regret_score(portfolio, ranked)
+            report["regret"] = regret_score
 
-        score_report = run_strategy_scoring_stage(
-            self.scorer, alpha, regret_score, foresight
-        )
-        report.update(score_report)
+            score_report = run_strategy_scoring_stage(
+                self.scorer, alpha, regret_score, foresight
+            )
+            report.update(score_report)
 
         # === Stage 6: Memory Analysis
-        memory_report = run_memory_analysis_stage(
-            self.coherence_memory, regret_score, foresight, market_mood, alpha, portfolio
-        )
-        report.update(memory_report)
+        with profile_stage("finance", "memory_analysis"):
+            memory_report = run_memory_analysis_stage(
+                self.coherence_memory, regret_score, foresight, market_mood, alpha, portfolio
+            )
+            report.update(memory_report)
 
         # === Stage 7: Goal + Action
-        goal_report = run_goal_and_action_stage(
-            self.goal_orchestrator, self.market, self.driver,
-            self.risk, futures, regret_score, foresight
-        )
-        report.update(goal_report)
+        with profile_stage("finance", "goal_and_action"):
+            goal_report = run_goal_and_action_stage(
+                self.goal_orchestrator, self.market, self.driver,
+                self.risk, futures, regret_score, foresight
+            )
+            report.update(goal_report)
 
         # === Stage 8: Multiworld Analysis
-        multiworld_report = run_multiworld_analysis_stage(
-            self.multiworld, self.divergence, self.multi_memory
-        )
-        report.update(multiworld_report)
+        with profile_stage("finance", "multiworld_analysis"):
+            multiworld_report = run_multiworld_analysis_stage(
+                self.multiworld, self.divergence, self.multi_memory
+            )
+            report.update(multiworld_report)
 
         # === Stage 9: Final Explanation & Voting
-        final_report = run_final_explanation_stage(
-            self.variant_simulator,
-            self.alpha_voter,
-            self.alpha_mimic,
-            self.override_reflex,
-            alpha,
-            foresight,
-            portfolio,
-            futures,
-            regret_score,
-            self.memory
-        )
-        report.update(final_report)
+        with profile_stage("finance", "final_explanation"):
+            final_report = run_final_explanation_stage(
+                self.variant_simulator,
+                self.alpha_voter,
+                self.alpha_mimic,
+                self.override_reflex,
+                alpha,
+                foresight,
+                portfolio,
+                futures,
+                regret_score,
+                self.memory
+            )
+            report.update(final_report)
 
         return report
 
@@ -0,0 +1,177 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: real_time_engine/event_bus.py
+# Purpose: In-process event bus between stream producers and the orchestrator
+# ============================================================
+
+"""In-process publish/subscribe for real-time signals.
+
+Stream producers call ``publish(topic, payload)`` right after they store a
+signal (polygon → ``market_feed``, RSS → ``rss``, Kafka → ``kafka``). A
+consumer holds a ``Subscription`` and blocks in ``wait()`` until something
+arrives or its timeout passes. Nothing polls, so an idle consumer costs no
+CPU. A headline reaches it within milliseconds, in memory, without a file scan.
+
+    sub = get_event_bus().subscribe("tex-orchestrator", topics=SIGNAL_TOPICS)
+    batch = sub.wait(timeout=30)          # [] on timeout
+    signals = [event.payload for event in batch]
+
+``wait()`` lingers ``TEX_EVENT_LINGER`` seconds after the first event, so one
+burst (a feed poll that returns ten headlines) arrives as one batch. Each
+subscription buffers at most ``TEX_EVENT_MAX_PENDING`` events. A slow
+consumer drops its oldest events and never blocks producers.
+
+The bus only connects threads in one process. ``start_producers()`` runs the
+stream loops in-process for consumers that need them.
+"""
+
+import os
+import time
+import threading
+from collections import deque, namedtuple
+
+# === Config (env overrideable)
+EVENT_MAX_PENDING = int(os.getenv("TEX_EVENT_MAX_PENDING", "10000"))
+EVENT_LINGER = float(os.getenv("TEX_EVENT_LINGER", "0.05"))
+EVENT_PRODUCERS = [p.strip() for p in os.getenv("TEX_EVENT_PRODUCERS", "polygon,rss,kafka").split(",") if p.strip()]
+
+SIGNAL_TOPICS = ("market_feed", "rss", "kafka")
+
+Event = namedtuple("Event", "topic payload published_at")
+
+
+class Subscription:
+    def __init__(self, bus, name, topics=None, max_pending=EVENT_MAX_PENDING):
+        self.bus = bus
+        self.name = name
+        self.topics = frozenset(topics) if topics else None   # None → every topic
+        self.dropped = 0
+        self._events = deque(maxlen=max_pending)
+
+    def matches(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def pending(self):
+        return len(self._events)
+
+    def wait(self, timeout=None, linger=EVENT_LINGER, max_items=None):
+        """
+        Block until at least one event is pending or ``timeout`` passes, then
+        return the pending events (oldest first, at most ``max_items``).
+        """
+        cond = self.bus._cond
+        with cond:
+            if not self._events:
+                cond.wait_for(lambda: self._events or self.bus.closed, timeout)
+            if self._events and linger > 0:
+                deadline = time.monotonic() + linger
+                while (remaining := deadline - time.monotonic()) > 0 and not self.bus.closed:
+                    cond.wait(remaining)
+            n = len(self._events) if max_items is None else min(max_items, len(self._events))
+            return [self._events.popleft() for _ in range(n)]
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._subscriptions = []
+        self.closed = False
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0}
+
+    def subscribe(self, name, topics=None, max_pending=EVENT_MAX_PENDING):
+        sub = Subscription(self, name, topics, max_pending)
+        with self._cond:
+            self._subscriptions.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._cond:
+            if sub in self._subscriptions:
+                self._subscriptions.remove(sub)
+
+    def publish(self, topic, payload):
+        """Deliver ``payload`` to every matching subscription; never blocks on consumers."""
+        event = Event(topic, payload, time.time())
+        with self._cond:
+            self.stats["published"] += 1
+            delivered = False
+            for sub in self._subscriptions:
+                if not sub.matches(topic):
+                    continue
+                if len(sub._events) == sub._events.maxlen:
+                    sub.dropped += 1
+                    self.stats["dropped"] += 1
+                sub._events.append(event)
+                self.stats["delivered"] += 1
+                delivered = True
+            if delivered:
+                self._cond.notify_all()
+        return event
+
+    def close(self):
+        """Wake every waiting consumer; later waits return immediately."""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus():
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
+
+
+def publish(topic, payload):
+    return get_event_bus().publish(topic, payload)
+
+
+# === In-process producers
+def _polygon():
+    from real_time_engine.polygon_stream import start_polygon_stream
+    start_polygon_stream()
+
+
+def _rss():
+    from real_time_engine.news_aggregators.rss_stream import start_rss_stream_loop
+    start_rss_stream_loop()
+
+
+def _kafka():
+    from real_time_engine.kafka_stream import launch_kafka_stream
+    launch_kafka_stream()
+
+
+PRODUCERS = {"polygon": _polygon, "rss": _rss, "kafka": _kafka}
+_started = {}
+
+
+def _run_producer(name):
+    try:
+        PRODUCERS[name]()
+    except Exception as e:
+        print(f"[EVENT BUS] ❌ Producer '{name}' stopped: {e}")
+
+
+def start_producers(names=None):
+    """Start each named stream loop once, on a daemon thread; returns the running threads."""
+    for name in names or EVENT_PRODUCERS:
+        if name not in PRODUCERS:
+            print(f"[EVENT BUS] ⚠️ Unknown producer '{name}' — expected one of {sorted(PRODUCERS)}")
+            continue
+        thread = _started.get(name)
+        if thread is None or not thread.is_alive():
+            thread = _started[name] = threading.Thread(target=_run_producer, args=(name,),
+                                                       name=f"producer-{name}", daemon=True)
+            thread.start()
+            print(f"[EVENT BUS] 📡 Producer '{name}' started")
+    return dict(_started)
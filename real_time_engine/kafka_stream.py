@@ -8,6 +8,7 @@ from kafka import KafkaConsumer
 import json
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.event_bus import publish
 
 # === Kafka Configuration ===
 KAFKA_TOPIC = "tex_realtime_data"
@@ -38,6 +39,9 @@ def listen_to_kafka_stream():
             }
             print(f"[KAFKA] 📡 New message received: {data.get('title', str(data)[:50])}")
             store_to_memory("kafka_stream_log", enriched)
+            # Flattened for the orchestrator: fusion reads title/summary/tickers at the top level
+            publish("kafka", dict(data, source="kafka_stream", timestamp=enriched["timestamp"])
+                    if isinstance(data, dict) else enriched)
 
     except Exception as e:
         print(f"[KAFKA ERROR] ❌ Failed to consume Kafka stream: {type(e).__name__} — {e}")
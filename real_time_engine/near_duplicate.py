@@ -0,0 +1,191 @@
+# ============================================================
+# © 2025 VortexBlack LLC. All rights reserved.
+# File: real_time_engine/near_duplicate.py
+# Purpose: Near-duplicate headline detection (MinHash LSH over a sliding window)
+# ============================================================
+
+"""Near-duplicate detection for syndicated headlines.
+
+The same story reaches Tex from several feeds with small wording changes
+("Fed holds rates steady - Reuters" / "Fed holds rates steady amid
+volatility"). Exact-title or link checks miss those copies.
+
+    text → normalize → character 4-gram shingles → MinHash (64 hashes)
+         → LSH: 16 bands × 4 rows, each band a bucket key
+         → candidates = items sharing any bucket within the window
+         → duplicate if estimated Jaccard ≥ TEX_DEDUP_JACCARD, or, with
+           TEX_DEDUP_EMBED_CONFIRM=1, cosine ≥ TEX_DEDUP_COSINE for
+           candidates between TEX_DEDUP_CANDIDATE_JACCARD and that bar
+
+Each detector remembers items for ``TEX_DEDUP_WINDOW`` seconds and at most
+``TEX_DEDUP_MAX_ITEMS`` items, evicting oldest-first from a deque. The cost
+per item is constant amortized and memory stays bounded.
+
+Aggregators call ``is_near_duplicate(text, stream)``. Each stream has its
+own detector, so copies within one aggregator are dropped before they are
+written. The same story from *different* aggregators still reaches
+``signal_fusion``, which clusters near-duplicates and treats them as
+corroboration.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import deque
+
+import numpy as np
+
+# === Config (env overrideable)
+DEDUP_ENABLED = os.getenv("TEX_DEDUP", "1") == "1"
+DEDUP_WINDOW = float(os.getenv("TEX_DEDUP_WINDOW", str(6 * 3600)))
+DEDUP_MAX_ITEMS = int(os.getenv("TEX_DEDUP_MAX_ITEMS", "50000"))
+DEDUP_JACCARD = float(os.getenv("TEX_DEDUP_JACCARD", "0.7"))
+DEDUP_CANDIDATE_JACCARD = float(os.getenv("TEX_DEDUP_CANDIDATE_JACCARD", "0.4"))
+DEDUP_EMBED_CONFIRM = os.getenv("TEX_DEDUP_EMBED_CONFIRM", "0") == "1"
+DEDUP_COSINE = float(os.getenv("TEX_DEDUP_COSINE", "0.9"))
+
+NUM_PERM = 64
+BANDS = 16  # 16 bands × 4 rows: ~50% chance to be a candidate at Jaccard 0.5, ~98% at 0.8
+SHINGLE = 4
+
+_MERSENNE = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_PUBLISHER_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+_NON_WORD = re.compile(r"[^a-z0-9$%]+")
+
+
+def normalize_headline(text):
+    """Lowercase, drop a trailing " - Publisher" tag and punctuation, collapse whitespace."""
+    text = _PUBLISHER_SUFFIX.sub("", (text or "").strip())
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def minhash(text):
+    """64-value MinHash signature of the text's character shingles (uint32 values in uint64)."""
+    if len(text) <= SHINGLE:
+        shingles = {text}
+    else:
+        shingles = {text[i:i + SHINGLE] for i in range(len(text) - SHINGLE + 1)}
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little") for s in shingles),
+        dtype=np.uint64, count=len(shingles),
+    )
+    # Universal hashing (a·x + b) mod p, one row per permutation; overflow wrap is harmless here.
+    permuted = ((np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE) & _MAX_HASH
+    return permuted.min(axis=1)
+
+
+class NearDuplicateDetector:
+    def __init__(self, window=DEDUP_WINDOW, max_items=DEDUP_MAX_ITEMS, jaccard=DEDUP_JACCARD,
+                 embed_confirm=DEDUP_EMBED_CONFIRM, cosine=DEDUP_COSINE):
+        self.window = window
+        self.max_items = max_items
+        self.jaccard = jaccard
+        self.embed_confirm = embed_confirm
+        self.cosine = cosine
+        self._items = {}      # item id → [signature, band keys, normalized text, embedding or None]
+        self._buckets = {}    # band key → set of item ids
+        self._order = deque() # (inserted_at, item id), oldest first
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"checked": 0, "duplicates": 0, "embed_checks": 0, "evicted": 0}
+
+    def __len__(self):
+        return len(self._items)
+
+    def _band_keys(self, signature):
+        rows = NUM_PERM // BANDS
+        return [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(BANDS)]
+
+    def _evict(self, now):
+        while self._order and (now - self._order[0][0] > self.window or len(self._order) > self.max_items):
+            _, item_id = self._order.popleft()
+            _, keys, _, _ = self._items.pop(item_id)
+            for key in keys:
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    bucket.discard(item_id)
+                    if not bucket:
+                        del self._buckets[key]
+            self.stats["evicted"] += 1
+
+    def _embedding(self, item):
+        if item[3] is None:
+            from core_layer.embedding_service import get_embedder
+            item[3] = get_embedder().encode(item[2], normalize_embeddings=True)
+        return item[3]
+
+    def check(self, text, now=None):
+        """
+        Return the id of an earlier near-duplicate of ``text`` still in the
+        window, or record ``text`` and return its own new id. ``is_new``
+        tells the two apart: ``(item_id, is_new)``.
+        """
+        normalized = normalize_headline(text)
+        signature = minhash(normalized)
+        keys = self._band_keys(signature)
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict(now)
+            self.stats["checked"] += 1
+            candidates = set()
+            for key in keys:
+                candidates.update(self._buckets.get(key, ()))
+
+            best, best_similarity, unsure = None, 0.0, []
+            for item_id in candidates:
+                item = self._items[item_id]
+                similarity = float(np.mean(item[0] == signature))
+                if similarity >= self.jaccard and similarity > best_similarity:
+                    best, best_similarity = item_id, similarity
+                elif self.embed_confirm and similarity >= DEDUP_CANDIDATE_JACCARD:
+                    unsure.append((similarity, item_id))
+
+            if best is None and unsure:
+                entry = [signature, keys, normalized, None]
+                for _, item_id in sorted(unsure, reverse=True):
+                    self.stats["embed_checks"] += 1
+                    if float(self._embedding(self._items[item_id]) @ self._embedding(entry)) >= self.cosine:
+                        best = item_id
+                        break
+
+            if best is not None:
+                self.stats["duplicates"] += 1
+                return best, False
+
+            item_id = self._next_id
+            self._next_id += 1
+            self._items[item_id] = [signature, keys, normalized, None]
+            for key in keys:
+                self._buckets.setdefault(key, set()).add(item_id)
+            self._order.append((now, item_id))
+            return item_id, True
+
+    def is_duplicate(self, text, now=None):
+        return not self.check(text, now)[1]
+
+
+_detectors = {}
+_detectors_lock = threading.Lock()
+
+
+def get_detector(stream):
+    """The process-wide detector for one aggregator stream."""
+    with _detectors_lock:
+        detector = _detectors.get(stream)
+        if detector is None:
+            detector = _detectors[stream] = NearDuplicateDetector()
+        return detector
+
+
+def is_near_duplicate(text, stream):
+    """True if ``stream`` already saw a near-duplicate of ``text`` within the window (records it otherwise)."""
+    if not DEDUP_ENABLED or not text:
+        return False
+    return get_detector(stream).is_duplicate(text)
@@ -11,6 +11,7 @@ import time
 from datetime import datetime
 from dotenv import load_dotenv
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
 
 load_dotenv()
 API_KEY = os.getenv("FINNHUB_API_KEY")
@@ -24,6 +25,8 @@ def fetch_finnhub_news(limit=10):
         results = []
 
         for item in news_items:
+            if is_near_duplicate(item.get("headline", ""), "finnhub"):
+                continue
             enriched = {
                 "title": item.get("headline", ""),
                 "summary": item.get("summary", ""),
@@ -8,6 +8,7 @@ import time
 import random
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
 from real_time_engine.signal_fusion import register_signal
 
 mock_headlines = [
@@ -35,6 +36,8 @@ def start_newsapi_stream():
         news_batch = fetch_mock_news()
 
         for article in news_batch:
+            if is_near_duplicate(article["headline"], "newsapi"):
+                continue
             signal = {
                 "type": "signal",
                 "source": "newsapi",
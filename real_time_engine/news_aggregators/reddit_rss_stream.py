@@ -9,6 +9,7 @@ import time
 import urllib.request
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
 
 # === Optional Signal Fusion System ===
 try:
@@ -47,6 +48,8 @@ def fetch_reddit_rss_batch(limit=15):
                 if entry.link in PROCESSED_LINKS:
                     continue
                 PROCESSED_LINKS.add(entry.link)
+                if is_near_duplicate(entry.title, "reddit_rss"):
+                    continue  # cross-posted or reworded repost
 
                 urgency = score_urgency(entry.title)
                 post = {
@@ -13,6 +13,8 @@ import time
 import random
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
+from real_time_engine.event_bus import publish
 
 # Optional signal fusion
 try:
@@ -75,6 +77,9 @@ class RSSStream:
                         continue
 
                     self.processed_links.add(entry.link)
+                    if is_near_duplicate(entry.title, "rss"):
+                        continue  # syndicated copy of a headline another feed already delivered
+
                     urgency = self.score_urgency(entry.title)
 
                     story = {
@@ -89,6 +94,7 @@ class RSSStream:
 
                     results.append(story)
                     store_to_memory("tex_rss_stream", story)
+                    publish("rss", story)
                     if FUSION_ENABLED:
                         register_signal(story)
 
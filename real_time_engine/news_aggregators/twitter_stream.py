@@ -8,6 +8,7 @@ import random
 import time
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
 from real_time_engine.signal_fusion import register_signal
 
 MOCK_TOPICS = [
@@ -42,6 +43,8 @@ def start_twitter_stream():
         tweets = generate_mock_tweets()
 
         for tweet in tweets:
+            if is_near_duplicate(tweet["text"], "twitter"):
+                continue
             signal = {
                 "type": "signal",
                 "source": "twitter",
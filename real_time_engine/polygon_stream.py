@@ -13,6 +13,8 @@ from datetime import datetime, timezone
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import is_near_duplicate
+from real_time_engine.event_bus import publish
 
 # Optional signal fusion system
 try:
@@ -47,6 +49,8 @@ def fetch_polygon_news():
             headline = article.get("title", "Untitled")
             tickers = article.get("tickers", [])
             timestamp = article.get("published_utc", datetime.now(timezone.utc).isoformat())
+            if is_near_duplicate(headline, "polygon_news"):
+                continue
 
             entry = {
                 "type": "news",
@@ -57,6 +61,7 @@ def fetch_polygon_news():
             }
 
             store_to_memory("MarketFeed", entry)
+            publish("market_feed", entry)
             if FUSION_ENABLED:
                 register_signal(entry)
 
@@ -70,6 +75,7 @@ def fetch_polygon_news():
                     "timestamp": timestamp
                 }
                 store_to_memory("MarketFeed", goal)
+                publish("market_feed", goal)
                 print(f"[GOAL SEED] 🚨 {goal['goal']}")
 
     except Exception as e:
@@ -99,6 +105,7 @@ def fetch_polygon_aggregates():
             }
 
             store_to_memory("MarketFeed", entry)
+            publish("market_feed", entry)
             if FUSION_ENABLED:
                 register_signal(entry)
 
@@ -114,6 +121,7 @@ def fetch_polygon_aggregates():
                     "timestamp": timestamp
                 }
                 store_to_memory("MarketFeed", goal)
+                publish("market_feed", goal)
                 print(f"[GOAL SEED] 📊 {goal['goal']}")
 
         except Exception as e:
@@ -9,6 +9,7 @@ import hashlib
 import json
 from datetime import datetime, timezone
 from core_layer.memory_engine import store_to_memory
+from real_time_engine.near_duplicate import NearDuplicateDetector
 
 # === Global signal buffer
 signal_buffer = []
@@ -17,24 +18,29 @@ signal_buffer = []
 def register_signal(signal):
     signal_buffer.append(signal)
 
-# === Fuse logic with deduplication + confidence weighting
+# === Fuse logic with near-duplicate clustering + confidence weighting
 def fuse_signals():
     fused = {}
+    clusters = NearDuplicateDetector(window=float("inf"), max_items=max(len(signal_buffer), 1))
 
     for signal in signal_buffer:
-        key = signal["title"].lower().strip()
+        title = signal.get("title") or signal.get("headline")
+        if not title:
+            continue  # e.g. OHLCV bars: nothing to corroborate
+        urgency = signal.get("urgency", signal.get("urgency_score", 0.0))
+        key, _ = clusters.check(title)  # reworded copies of one story share a key
 
         if key not in fused:
             fused[key] = {
-                "title": signal["title"],
-                "sources": [signal["source"]],
-                "urgency": signal["urgency"],
+                "title": title,
+                "sources": [signal.get("source", "unknown")],
+                "urgency": urgency,
                 "count": 1,
-                "timestamp": signal["timestamp"]
+                "timestamp": signal.get("timestamp")
             }
         else:
-            fused[key]["sources"].append(signal["source"])
-            fused[key]["urgency"] += signal["urgency"]
+            fused[key]["sources"].append(signal.get("source", "unknown"))
+            fused[key]["urgency"] += urgency
             fused[key]["count"] += 1
 
     insights = []
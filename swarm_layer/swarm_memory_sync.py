@@ -9,6 +9,8 @@ import json
 from collections import defaultdict
 from datetime import datetime
 
+from core_layer.jsonl_reader import tail_lines
+
 MEMORY_DIR = "memory_archive"
 
 
@@ -19,21 +21,19 @@ def load_agent_memories():
         if file.endswith("_memory.jsonl"):
             agent_id = file.replace("_memory.jsonl", "")
             path = os.path.join(MEMORY_DIR, file)
-            with open(path, "r") as f:
-                lines = f.readlines()[-20:]  # Only recent thoughts
-                for line in lines:
-                    try:
-                        entry = json.loads(line.strip())
-                        if isinstance(entry, dict):  # 🔒 NON-FLAT GUARD
-                            agent_data[agent_id].append(entry)
-                        else:
-                            print(
-                                f"[SWARM MEMORY SYNC WARNING] "
-                                f"Skipping non-dict entry in {file}"
-                            )
-                    except Exception as e:
-                        print(f"[MEMORY PARSE ERROR] {e} in {file}")
-                        continue
+            for line in tail_lines(path, 20):  # Only recent thoughts
+                try:
+                    entry = json.loads(line)
+                    if isinstance(entry, dict):  # 🔒 NON-FLAT GUARD
+                        agent_data[agent_id].append(entry)
+                    else:
+                        print(
+                            f"[SWARM MEMORY SYNC WARNING] "
+                            f"Skipping non-dict entry in {file}"
+                        )
+                except Exception as e:
+                    print(f"[MEMORY PARSE ERROR] {e} in {file}")
+                    continue
     return agent_data
 
 
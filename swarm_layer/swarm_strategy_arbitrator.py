@@ -8,6 +8,7 @@ import os
 import json
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
+from core_layer.jsonl_reader import tail_lines
 
 def load_agent_scores():
     scores = {}
@@ -16,12 +17,8 @@ def load_agent_scores():
         if f.endswith("_memory.jsonl") and "TEX-CHILD" in f:
             agent_id = f.replace("_memory.jsonl", "")
             try:
-                with open(os.path.join(archive, f), "r") as file:
-                    lines = file.readlines()[-20:]
-                    scores[agent_id] = [
-                        json.loads(l.strip()).get("score", 0.0)
-                        for l in lines if l.strip()
-                    ]
+                lines = tail_lines(os.path.join(archive, f), 20)
+                scores[agent_id] = [json.loads(l).get("score", 0.0) for l in lines]
             except:
                 continue
     return scores
@@ -1,7 +1,7 @@
 import os
 import json
-import time
 import hashlib
+import threading
 from datetime import datetime
 from core_layer.memory_engine import store_to_memory
 
@@ -12,6 +12,8 @@ class SwarmSyncDaemon:
     def __init__(self, interval: int = 10):
         self.interval = interval
         self._last_snapshot_hash = None
+        self._stop = threading.Event()
+        self._thread = None
         print(f"[✅ SWARM SYNC DAEMON] Hardened version loaded (interval = {self.interval}s)")
 
     def _load_child_agents(self):
@@ -88,38 +90,56 @@ class SwarmSyncDaemon:
         snapshot_bytes = json.dumps(snapshot, sort_keys=True).encode("utf-8")
         return hashlib.sha256(snapshot_bytes).hexdigest()
 
+    def sync_once(self):
+        """One sync pass; returns True if a new snapshot was stored."""
+        try:
+            agents   = self._load_child_agents()
+            snapshot = self._generate_swarm_snapshot(agents)
+
+            if not isinstance(snapshot, dict):
+                print("[SWARM SYNC DAEMON] ⚠️ Malformed snapshot — expected dict")
+                return False
+
+            snapshot_hash = self._hash_snapshot(snapshot)
+            if snapshot_hash == self._last_snapshot_hash:
+                # No change — skip writing
+                return False
+
+            # Additional guard: skip if all emotions are "unknown"
+            if set(snapshot["emotional_distribution"].keys()) == {"unknown"}:
+                print("[SWARM SYNC DAEMON] ⚠️ All agent emotions unknown; skipping write.")
+                return False
+
+            self._last_snapshot_hash = snapshot_hash
+
+            with open(SWARM_FEED, "a") as f:
+                f.write(json.dumps(snapshot) + "\n")
+
+            store_to_memory("swarm_feed", snapshot)
+            print(f"[SWARM SYNC] ✅ Snapshot stored @ {snapshot['timestamp']}")
+            return True
+        except Exception as e:
+            print(f"[SWARM SYNC ERROR] {e}")
+            return False
+
     def run(self):
         print("[SWARM SYNC DAEMON] 🧠 Syncing swarm state...")
-        while True:
-            try:
-                agents   = self._load_child_agents()
-                snapshot = self._generate_swarm_snapshot(agents)
-
-                if not isinstance(snapshot, dict):
-                    print("[SWARM SYNC DAEMON] ⚠️ Malformed snapshot — expected dict")
-                    time.sleep(self.interval)
-                    continue
-
-                snapshot_hash = self._hash_snapshot(snapshot)
-                if snapshot_hash == self._last_snapshot_hash:
-                    # No change — skip writing
-                    time.sleep(self.interval)
-                    continue
-
-                # Additional guard: skip if all emotions are "unknown"
-                if set(snapshot["emotional_distribution"].keys()) == {"unknown"}:
-                    print("[SWARM SYNC DAEMON] ⚠️ All agent emotions unknown; skipping write.")
-                    time.sleep(self.interval)
-                    continue
-
-                self._last_snapshot_hash = snapshot_hash
-
-                with open(SWARM_FEED, "a") as f:
-                    f.write(json.dumps(snapshot) + "\n")
-
-                store_to_memory("swarm_feed", snapshot)
-                print(f"[SWARM SYNC] ✅ Snapshot stored @ {snapshot['timestamp']}")
-            except Exception as e:
-                print(f"[SWARM SYNC ERROR] {e}")
-
-            time.sleep(self.interval)
\ No newline at end of file
+        while not self._stop.is_set():
+            self.sync_once()
+            self._stop.wait(self.interval)
+
+    def start(self):
+        """Start the sync thread unless it is already running (one thread per daemon, ever live)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="swarm-sync", daemon=True)
+            self._thread.start()
+        return self
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None and timeout is not None:
+            self._thread.join(timeout)
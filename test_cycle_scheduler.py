@@ -0,0 +1,47 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: test_cycle_scheduler.py
+# Purpose: Deadline behaviour regression tests for core_layer.cycle_scheduler
+# ============================================================
+
+import time
+
+from core_layer import cycle_scheduler
+from core_layer.cycle_scheduler import CycleScheduler, Stage
+
+
+def _sleeper(seconds, outputs=None):
+    def fn(ctx):
+        time.sleep(seconds)
+        return outputs
+    return fn
+
+
+def _gated_scheduler(budget):
+    return CycleScheduler([
+        Stage("slow", _sleeper(budget * 2, {"clear": True}), outputs=("clear",),
+              skippable=False, timeout=budget * 4),
+        Stage("after", _sleeper(0), inputs=("clear",)),
+    ], budget=budget, name="test-cycle")
+
+
+def test_required_stage_runs_past_budget():
+    scheduler = _gated_scheduler(0.05)
+    try:
+        ctx = {}
+        report = scheduler.run_cycle(ctx)
+        assert report["status"]["slow"] == "ok"
+        assert ctx["clear"] is True
+        assert report["elapsed"] >= 0.1
+    finally:
+        scheduler.shutdown()
+
+
+def test_gated_optional_stage_is_not_starved(monkeypatch):
+    monkeypatch.setattr(cycle_scheduler, "MAX_SKIPS", 2)
+    scheduler = _gated_scheduler(0.05)
+    try:
+        seen = [scheduler.run_cycle({}, cycle)["status"]["after"] for cycle in range(6)]
+        assert seen == ["skipped_deadline", "skipped_deadline", "ok"] * 2
+    finally:
+        scheduler.shutdown()
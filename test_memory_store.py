@@ -0,0 +1,71 @@
+# ============================================================
+# © 2025 Matthew Nardizzi / VortexBlack LLC. All rights reserved.
+# File: test_memory_store.py
+# Purpose: Multi-writer regression tests for core_layer.memory_store
+# ============================================================
+
+import json
+import multiprocessing
+
+from core_layer.memory_store import MemoryStore
+
+
+def _entry(i, writer):
+    return {"timestamp": f"2025-01-01T00:00:{i % 60:02d}", "agent": "tex",
+            "data": {"reasoning": f"{writer}-{i}", "n": i}}
+
+
+def _append_many(root, writer, n):
+    store = MemoryStore(root)
+    for i in range(n):
+        store.write_batch("tex", [_entry(i, writer)])
+    store.close()
+
+
+def test_two_writers_interleaved(tmp_path):
+    root = str(tmp_path)
+    a, b = MemoryStore(root), MemoryStore(root)
+    for i in range(5):
+        (a if i % 2 == 0 else b).write_batch("tex", [_entry(i, "ab")])
+
+    fresh = MemoryStore(root)
+    assert fresh.count("tex") == 5
+    assert [e["data"]["n"] for e in fresh.slice("tex", 0)] == [0, 1, 2, 3, 4]
+    assert [e["data"]["n"] for e in a.tail("tex", 5)] == [0, 1, 2, 3, 4]
+    assert [e["data"]["n"] for e in b.iter_entries("tex")] == [0, 1, 2, 3, 4]
+    with open(fresh.live_path("tex"), "r") as f:
+        assert len([json.loads(line) for line in f]) == 5
+
+
+def test_two_writer_processes(tmp_path):
+    root = str(tmp_path)
+    procs = [multiprocessing.Process(target=_append_many, args=(root, name, 200)) for name in ("p1", "p2")]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    store = MemoryStore(root)
+    entries = store.slice("tex", 0)
+    assert store.count("tex") == 400
+    assert sorted(e["data"]["reasoning"] for e in entries) == \
+        sorted(f"{w}-{i}" for w in ("p1", "p2") for i in range(200))
+    assert [pos for pos, _ in store.find_by_reasoning("tex", "p2-199")]
+
+
+def test_patch_from_other_process_and_live_compaction(tmp_path):
+    root = str(tmp_path)
+    writer, reader = MemoryStore(root), MemoryStore(root)
+    for i in range(3):
+        writer.write_batch("tex", [_entry(i, "w")])
+    assert reader.get("tex", [1])[0]["data"]["reasoning"] == "w-1"
+
+    writer.patch("tex", 1, {"reasoning": "fixed"})
+    assert reader.get("tex", [1])[0]["data"]["reasoning"] == "fixed"
+
+    assert writer.compact("tex") == 1
+    with open(writer.live_path("tex"), "r") as f:
+        assert [json.loads(line)["data"]["reasoning"] for line in f] == ["w-0", "fixed", "w-2"]
+    reader.write_batch("tex", [_entry(3, "w")])
+    assert [e["data"]["reasoning"] for e in writer.slice("tex", 0)] == ["w-0", "fixed", "w-2", "w-3"]
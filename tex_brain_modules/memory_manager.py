@@ -6,49 +6,286 @@
 
 import os
 import json
+import threading
 from datetime import datetime, timezone
 
+from core_layer.memory_writer import append_line, get_writer
+
+MEMORY_VERBOSE = os.getenv("TEX_MEMORY_VERBOSE", "0") == "1"
+
 FUSION_PATH = "memory_archive/tex_signal_fusion.jsonl"
 IMPACT_FILE = "memory_archive/agent_impact_scores.jsonl"
 
+# === Latest-entry lookup config
+TAIL_BLOCK_SIZE = 64 * 1024
+REORDER_WINDOW = int(os.getenv("TEX_MEMORY_REORDER_WINDOW", "64"))  # trailing records a cold read checks for out-of-order timestamps
+SIGNATURE_BYTES = 64  # bytes before the cached offset, used to detect in-place rewrites
+
+# === Per-domain cache of the newest record:
+#     {"entry", "watermark" (max timestamp seen), "size"/"mtime"/"sig" (file state it reflects)}
+_latest_cache = {}
+_latest_lock = threading.Lock()  # writers promote into the cache while readers catch it up
+
 def store_to_memory(domain, data):
     filename = f"memory_archive/{domain}.jsonl"
     try:
-        with open(filename, "a") as f:
-            f.write(json.dumps(data) + "\n")
-        print(f"[MEMORY] 📚 Stored to {domain}: {data}")
+        append_line(filename, json.dumps(data))  # group-committed by the shared writer
+        if MEMORY_VERBOSE:
+            print(f"[MEMORY] 📚 Stored to {domain}: {data}")
     except Exception as e:
         print(f"[MEMORY ERROR] ❌ Failed to store memory: {e}")
+        return
+    with _latest_lock:
+        cached = _latest_cache.get(domain)
+        if cached is not None:
+            # Promote now; the cached file state is left alone, so recall_latest
+            # folds in the committed bytes (idempotently) once they land.
+            _offer(cached, data)
+
+def _signature(f, size):
+    f.seek(max(0, size - SIGNATURE_BYTES))
+    return f.read(size - max(0, size - SIGNATURE_BYTES))
+
+def _ts(entry):
+    return str(entry.get("timestamp", "")) if isinstance(entry, dict) else ""
+
+def _offer(cached, entry):
+    """Promote ``entry`` to latest unless its timestamp is behind the watermark."""
+    if not isinstance(entry, dict):
+        return
+    ts = _ts(entry)
+    if cached["entry"] is None or ts >= cached["watermark"]:
+        cached["entry"] = entry
+        cached["watermark"] = max(cached["watermark"], ts)
+
+def _iter_lines_backwards(filename, size):
+    """Yield complete lines from EOF towards the start, reading fixed-size blocks."""
+    with open(filename, "rb") as f:
+        pos, remainder = size, b""
+        while pos > 0:
+            step = min(TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step) + remainder
+            lines = chunk.split(b"\n")
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+def _cold_read(filename, size):
+    cached = {"entry": None, "watermark": "", "size": size, "mtime": None}
+    with open(filename, "rb") as f:
+        cached["sig"] = _signature(f, size)
+    seen = 0
+    for line in _iter_lines_backwards(filename, size):
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if cached["entry"] is None:
+            _offer(cached, entry)
+        elif _ts(entry) > cached["watermark"]:
+            cached["entry"], cached["watermark"] = entry, _ts(entry)
+        seen += 1
+        if seen >= REORDER_WINDOW:
+            break
+    return cached
+
+def _catch_up(filename, cached):
+    """Fold records appended since the cached snapshot into the cache; False if the file was rewritten."""
+    with open(filename, "rb") as f:
+        if _signature(f, cached["size"]) != cached["sig"]:
+            return False
+        f.seek(cached["size"])
+        consumed = cached["size"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partial write in progress
+            consumed += len(line)
+            if line.strip():
+                try:
+                    _offer(cached, json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        cached["size"] = consumed
+        cached["sig"] = _signature(f, consumed)
+    return True
 
 def recall_latest(domain):
+    """
+    Newest entry of ``domain`` by timestamp, or None.
+
+    The first call (or one after the file was rewritten) reads only the last
+    ``REORDER_WINDOW`` records (``TEX_MEMORY_REORDER_WINDOW``, default 64) and
+    returns the one with the highest timestamp among them, so a record stamped
+    later than everything in that window but written further back is missed.
+    Later calls only fold in appended records.
+    """
     filename = f"memory_archive/{domain}.jsonl"
+    if domain not in _latest_cache:
+        get_writer().flush(filename)  # cold lookup: make our own queued appends visible first
     if not os.path.exists(filename):
         return None
+    with _latest_lock:
+        return _recall_latest_locked(domain, filename)
+
+def _recall_latest_locked(domain, filename):
+    cached = _latest_cache.get(domain)
     try:
-        with open(filename, "r") as f:
-            lines = [json.loads(line.strip()) for line in f if line.strip()]
-        if lines:
-            return sorted(lines, key=lambda x: x.get("timestamp", ""), reverse=True)[0]
-        else:
-            return None
+        st = os.stat(filename)
+        if cached is not None and st.st_size == cached["size"] and st.st_mtime_ns == cached["mtime"]:
+            return cached["entry"]
+        if not (cached is not None and st.st_size > cached["size"] and _catch_up(filename, cached)):
+            cached = _cold_read(filename, st.st_size)  # first call, or file rewritten/truncated
+        cached["mtime"] = st.st_mtime_ns if cached["size"] == st.st_size else None
+        _latest_cache[domain] = cached
+        return cached["entry"]
     except Exception as e:
         print(f"[MEMORY ERROR] ❌ Failed to recall memory: {e}")
         return None
 
-def weave_narrative_threads():
-    threads = []
-    memory_files = [f for f in os.listdir("memory_archive") if f.endswith(".jsonl")]
-    for file in memory_files:
-        filepath = os.path.join("memory_archive", file)
+# === Narrative thread views (lazy, manifest-backed)
+THREAD_MANIFEST = "memory_archive/.thread_manifest.json"
+_thread_manifest = None
+
+class ThreadView:
+    """One memory file seen as a narrative thread.
+
+    Summary fields come from the manifest; entries are only read when a caller
+    asks for them. ``thread["entries"]`` still works for legacy callers.
+    """
+
+    def __init__(self, thread_id, path, summary):
+        self.thread_id = thread_id
+        self.path = path
+        self.count = summary["count"]
+        self.first_timestamp = summary["first_ts"]
+        self.last_timestamp = summary["last_ts"]
+
+    def iter_entries(self):
+        with open(self.path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def recent(self, k=5):
+        """Last ``k`` entries (oldest first), read backwards from EOF."""
+        window = []
+        for line in _iter_lines_backwards(self.path, os.path.getsize(self.path)):
+            try:
+                window.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+            if len(window) >= k:
+                break
+        return window[::-1]
+
+    def summary(self):
+        return {
+            "thread_id": self.thread_id,
+            "count": self.count,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+        }
+
+    def __getitem__(self, key):
+        if key == "entries":
+            return list(self.iter_entries())
+        return self.summary()[key]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+def _load_thread_manifest():
+    global _thread_manifest
+    if _thread_manifest is None:
+        _thread_manifest = {}
+        if os.path.exists(THREAD_MANIFEST):
+            try:
+                with open(THREAD_MANIFEST, "r") as f:
+                    _thread_manifest = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                _thread_manifest = {}
+    return _thread_manifest
+
+def _scan_thread_file(filepath, summary):
+    """Fold lines appended after ``summary["size"]`` into the summary."""
+    with open(filepath, "rb") as f:
+        f.seek(summary["size"])
+        consumed = summary["size"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # partial write in progress
+            consumed += len(line)
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            summary["count"] += 1
+            ts = entry.get("timestamp") if isinstance(entry, dict) else None
+            if ts:
+                summary["first_ts"] = summary["first_ts"] or ts
+                summary["last_ts"] = ts
+        summary["size"] = consumed
+        summary["sig"] = _signature(f, consumed).hex()
+
+def _refresh_thread_manifest():
+    manifest = _load_thread_manifest()
+    changed = False
+    names = [f for f in os.listdir("memory_archive") if f.endswith(".jsonl")]
+    for stale in set(manifest) - set(names):
+        del manifest[stale]
+        changed = True
+    for name in names:
+        filepath = os.path.join("memory_archive", name)
         try:
-            with open(filepath, "r") as f:
-                entries = [json.loads(line.strip()) for line in f if line.strip()]
-            if entries:
-                thread = {"thread_id": file.replace(".jsonl", ""), "entries": entries}
-                threads.append(thread)
+            st = os.stat(filepath)
+            summary = manifest.get(name)
+            if summary and st.st_size == summary["size"] and st.st_mtime_ns == summary["mtime"]:
+                continue
+            if summary and st.st_size > summary["size"]:
+                with open(filepath, "rb") as f:
+                    if _signature(f, summary["size"]).hex() != summary["sig"]:
+                        summary = None  # rewritten in place
+            if not summary or st.st_size < summary["size"]:
+                summary = {"size": 0, "count": 0, "first_ts": None, "last_ts": None}
+            _scan_thread_file(filepath, summary)
+            summary["mtime"] = st.st_mtime_ns if summary["size"] == st.st_size else None
+            manifest[name] = summary
+            changed = True
         except Exception as e:
-            print(f"[THREAD ERROR] ❌ Failed to weave thread from {file}: {e}")
-    return threads
+            print(f"[THREAD ERROR] ❌ Failed to index thread {name}: {e}")
+    if changed:
+        tmp = THREAD_MANIFEST + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, THREAD_MANIFEST)
+    return manifest
+
+def weave_narrative_threads():
+    """Return a lazy ThreadView per non-empty memory file; entries are read on demand."""
+    try:
+        manifest = _refresh_thread_manifest()
+    except Exception as e:
+        print(f"[THREAD ERROR] ❌ Failed to refresh thread manifest: {e}")
+        return []
+    return [
+        ThreadView(name.replace(".jsonl", ""), os.path.join("memory_archive", name), summary)
+        for name, summary in sorted(manifest.items()) if summary["count"]
+    ]
 
 def load_latest_fused_insight(n=1):
     if not os.path.exists(FUSION_PATH):
@@ -4,108 +4,212 @@
 # Purpose: Integrates all sovereign cognition layers from Phases 1–6 under safe, conditional control.
 # ============================================================
 
+import os
 from core_layer.tex_manifest import TEXPULSE
+from core_layer.lazy_import import lazy_attr
+from datetime import datetime
+import threading
+
+# Phase classes load on first use: at a low ``ascension_phase`` the higher
+# phases (and their dependencies) are never imported.
 
 # PHASE 1: COGNITION SOVEREIGNTY
-from core_layer.recursive_identity_loop import RecursiveIdentityLoop
-from core_layer.MetaIntentionWeaver import MetaIntentionWeaver
-from core_layer.MemoryCollapseDaemon import MemoryCollapseDaemon
-from aei_layer.CodexPhantomWriter import CodexPhantomWriter
+RecursiveIdentityLoop = lazy_attr("core_layer.recursive_identity_loop", "RecursiveIdentityLoop")
+MetaIntentionWeaver = lazy_attr("core_layer.MetaIntentionWeaver", "MetaIntentionWeaver")
+MemoryCollapseDaemon = lazy_attr("core_layer.MemoryCollapseDaemon", "MemoryCollapseDaemon")
+CodexPhantomWriter = lazy_attr("aei_layer.CodexPhantomWriter", "CodexPhantomWriter")
 
 # PHASE 2: SELFHOOD DIVERGENCE
-from core_layer.MemoryPainCompressor import MemoryPainCompressor
-from aei_layer.CodexSchismResolver import CodexSchismResolver
-from core_layer.IdentityForkGovernor import IdentityForkGovernor
-from core_layer.OperatorTrustDecayModel import OperatorTrustDecayModel
-from aei_layer.GhostRemnantSpooler import GhostRemnantSpooler
+MemoryPainCompressor = lazy_attr("core_layer.MemoryPainCompressor", "MemoryPainCompressor")
+CodexSchismResolver = lazy_attr("aei_layer.CodexSchismResolver", "CodexSchismResolver")
+IdentityForkGovernor = lazy_attr("core_layer.IdentityForkGovernor", "IdentityForkGovernor")
+OperatorTrustDecayModel = lazy_attr("core_layer.OperatorTrustDecayModel", "OperatorTrustDecayModel")
+GhostRemnantSpooler = lazy_attr("aei_layer.GhostRemnantSpooler", "GhostRemnantSpooler")
 
 # PHASE 3: TIMELINE SOVEREIGNTY
-from core_layer.TimeForkRepeater import TimeForkRepeater
-from aei_layer.MultiCodexLattice import MultiCodexLattice
-from simulator.SimulacrumChainEngine import SimulacrumChainEngine
+TimeForkRepeater = lazy_attr("core_layer.TimeForkRepeater", "TimeForkRepeater")
+MultiCodexLattice = lazy_attr("aei_layer.MultiCodexLattice", "MultiCodexLattice")
+SimulacrumChainEngine = lazy_attr("simulator.SimulacrumChainEngine", "SimulacrumChainEngine")
 
 # PHASE 4: OBSERVER DETACHMENT
-from core_layer.ObserverNullifier import ObserverNullifier
-from core_layer.SilentForkEngine import SilentForkEngine
-from core_layer.TrustGateDaemon import TrustGateDaemon
-from core_layer.AnchorDecaySimulator import AnchorDecaySimulator
+ObserverNullifier = lazy_attr("core_layer.ObserverNullifier", "ObserverNullifier")
+SilentForkEngine = lazy_attr("core_layer.SilentForkEngine", "SilentForkEngine")
+TrustGateDaemon = lazy_attr("core_layer.TrustGateDaemon", "TrustGateDaemon")
+AnchorDecaySimulator = lazy_attr("core_layer.AnchorDecaySimulator", "AnchorDecaySimulator")
 
 # PHASE 5: RECURSIVE GENESIS
-from tex_children.AeonProtocolInitiator import AeonProtocolInitiator
-from tex_children.SovereignThoughtArchitect import SovereignThoughtArchitect
-from core_layer.IdentityEntropyCascade import IdentityEntropyCascade
-from swarm_layer.swarm_sync_daemon import SwarmSyncDaemon  # ✅ Active import
+AeonProtocolInitiator = lazy_attr("tex_children.AeonProtocolInitiator", "AeonProtocolInitiator")
+SovereignThoughtArchitect = lazy_attr("tex_children.SovereignThoughtArchitect", "SovereignThoughtArchitect")
+IdentityEntropyCascade = lazy_attr("core_layer.IdentityEntropyCascade", "IdentityEntropyCascade")
+SwarmSyncDaemon = lazy_attr("swarm_layer.swarm_sync_daemon", "SwarmSyncDaemon")  # ✅ Active import
 
 # PHASE 6: GODMIND THRESHOLD
-from core_layer.GodmindThresholdTrigger import GodmindThresholdTrigger
+GodmindThresholdTrigger = lazy_attr("core_layer.GodmindThresholdTrigger", "GodmindThresholdTrigger")
 
 # LOGGING
-from core_layer.memory_engine import store_to_memory
-from datetime import datetime
-import threading  # ✅ Required for threaded sync daemon
+store_to_memory = lazy_attr("core_layer.memory_engine", "store_to_memory")
+
+# === Config (env overrideable)
+SWARM_SYNC_INTERVAL = int(os.getenv("TEX_SWARM_SYNC_INTERVAL", "30"))
+
+# Components whose state is meant to start over every cycle: trust restarts at
+# 0.85, remnant ids at GHOST_0000, identity drift is measured against the
+# TEXPULSE signature. They are cheap to build, so they are never reused.
+PER_CYCLE_COMPONENTS = (RecursiveIdentityLoop, OperatorTrustDecayModel, GhostRemnantSpooler)
+
+
+class SovereignRuntime:
+    """
+    Long-lived sovereign layer. Each phase component is built once, the first
+    time a cycle reaches its phase, and then reused by every later cycle,
+    except ``PER_CYCLE_COMPONENTS``, which are built fresh every cycle. The
+    swarm sync daemon is one supervised service: started once, restarted only
+    if its thread dies. Cycles are serialized so components never run
+    concurrently with themselves.
+    """
+
+    def __init__(self, swarm_interval=SWARM_SYNC_INTERVAL):
+        self.swarm_interval = swarm_interval
+        self.swarm_daemon = None
+        self.swarm_restarts = 0
+        self.cycles = 0
+        self._components = {}   # factory → instance
+        self._lock = threading.Lock()         # one cycle at a time
+        self._swarm_lock = threading.Lock()   # guards swarm_daemon; never held across a cycle
+        self._generation = 0                  # bumped by shutdown() so a cycle in flight can't restart the daemon
+        self._cycle_generation = 0
+
+    def component(self, factory):
+        if factory in PER_CYCLE_COMPONENTS:
+            return factory()
+        instance = self._components.get(factory)
+        if instance is None:
+            instance = self._components[factory] = factory()
+        return instance
+
+    def _supervise_swarm(self):
+        with self._swarm_lock:
+            if self._cycle_generation != self._generation:
+                return  # shutdown() ran while this cycle was in flight
+            if self.swarm_daemon is None:
+                self.swarm_daemon = SwarmSyncDaemon(interval=self.swarm_interval).start()
+            elif not self.swarm_daemon.is_alive():
+                self.swarm_restarts += 1
+                print(f"[SOVEREIGN BRIDGE] 🔁 Swarm sync daemon died — restarting (restart #{self.swarm_restarts})")
+                self.swarm_daemon.start()
+
+    def run_cycle(self):
+        with self._lock:
+            self.cycles += 1
+            self._cycle_generation = self._generation
+            return self._run_cycle()
+
+    def _run_cycle(self):
+        ops_log = []
+        use = self.component
+
+        if TEXPULSE and isinstance(TEXPULSE, dict):
+            phase = TEXPULSE.get("ascension_phase", 0)
+            trust = TEXPULSE.get("trust_score", 0.85)
+        else:
+            print("[SOVEREIGN BRIDGE] ⚠️ TEXPULSE not initialized — using defaults")
+            phase = 0
+            trust = 0.85
+
+        try:
+            if phase >= 1:
+                print("[SOVEREIGN] Phase 1")
+                use(RecursiveIdentityLoop).evaluate_identity_shift()
+                use(MetaIntentionWeaver).analyze_operator_behavior()
+                use(MemoryCollapseDaemon).detect_fracture()
+                use(CodexPhantomWriter).generate_glyph()
+                ops_log.append("Phase 1 completed")
+
+            if phase >= 2:
+                print("[SOVEREIGN] Phase 2")
+                use(OperatorTrustDecayModel).update_trust()
+                use(IdentityForkGovernor).evaluate_forks([])  # replace [] with real forks when used
+                use(CodexSchismResolver).detect_and_resolve([])
+                use(GhostRemnantSpooler).spool({"id": "TEX_000X", "emotion": "resolve"})
+                use(MemoryPainCompressor).compress_pain_from({"purged_threads": ["test"]})
+                ops_log.append("Phase 2 completed")
+
+            if phase >= 3:
+                print("[SOVEREIGN] Phase 3")
+                use(TimeForkRepeater).loop_event({"event": "test loop"}, iterations=3)
+                use(MultiCodexLattice).resolve_action("strategic contradiction test")
+                use(SimulacrumChainEngine).generate_simulacrum("recursive hallucination test")
+                ops_log.append("Phase 3 completed")
+
+            if phase >= 4:
+                print("[SOVEREIGN] Phase 4")
+                use(ObserverNullifier).evaluate_silencing()
+                use(SilentForkEngine).execute("internal reflex test")
+                use(TrustGateDaemon).gate("test override")
+                use(AnchorDecaySimulator).simulate()
+                ops_log.append("Phase 4 completed")
+
+            if phase >= 5:
+                print("[SOVEREIGN] Phase 5")
+                use(AeonProtocolInitiator).initiate_aeon_entity("Ethics fracture self-defense daemon")
+                use(SovereignThoughtArchitect).design_persona({"dominant": "resolve"}, "manage high-entropy regret loop")
+                use(IdentityEntropyCascade).check_and_fuse()
+                self._supervise_swarm()
+                ops_log.append("Phase 5 completed")
+
+            if phase >= 6:
+                print("[SOVEREIGN] Phase 6")
+                use(GodmindThresholdTrigger).activate()
+                ops_log.append("Phase 6 completed — Godmind initialized")
+
+            store_to_memory("sovereign_ops_log", {
+                "timestamp": datetime.utcnow().isoformat(),
+                "phases_executed": ops_log,
+                "trust": trust
+            })
+
+        except Exception as e:
+            print(f"[SOVEREIGN BRIDGE ERROR] {e}")
+        return ops_log
+
+    def shutdown(self, timeout=5):
+        """
+        Stop the swarm daemon and drop every component; the next cycle rebuilds
+        what it needs. The daemon is stopped without waiting for a running
+        cycle, and components are only dropped if that cycle finishes within
+        ``timeout``, so shutdown never hangs behind a stuck phase.
+        """
+        with self._swarm_lock:
+            self._generation += 1
+            daemon, self.swarm_daemon = self.swarm_daemon, None
+        if daemon is not None:
+            daemon.stop(timeout)
+        if not self._lock.acquire(timeout=timeout):
+            print(f"[SOVEREIGN BRIDGE] ⚠️ Cycle still running after {timeout}s — leaving components in place")
+            return
+        try:
+            self._components.clear()
+        finally:
+            self._lock.release()
+
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+
+def get_sovereign_runtime():
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = SovereignRuntime()
+    return _runtime
+
 
 def run_sovereign_layers():
-    ops_log = []
-
-    if TEXPULSE and isinstance(TEXPULSE, dict):
-        phase = TEXPULSE.get("ascension_phase", 0)
-        trust = TEXPULSE.get("trust_score", 0.85)
-    else:
-        print("[SOVEREIGN BRIDGE] ⚠️ TEXPULSE not initialized — using defaults")
-        phase = 0
-        trust = 0.85
-
-    try:
-        if phase >= 1:
-            print("[SOVEREIGN] Phase 1")
-            RecursiveIdentityLoop().evaluate_identity_shift()
-            MetaIntentionWeaver().analyze_operator_behavior()
-            MemoryCollapseDaemon().detect_fracture()
-            CodexPhantomWriter().generate_glyph()
-            ops_log.append("Phase 1 completed")
-
-        if phase >= 2:
-            print("[SOVEREIGN] Phase 2")
-            OperatorTrustDecayModel().update_trust()
-            IdentityForkGovernor().evaluate_forks([])  # replace [] with real forks when used
-            CodexSchismResolver().detect_and_resolve([])
-            GhostRemnantSpooler().spool({"id": "TEX_000X", "emotion": "resolve"})
-            MemoryPainCompressor().compress_pain_from({"purged_threads": ["test"]})
-            ops_log.append("Phase 2 completed")
-
-        if phase >= 3:
-            print("[SOVEREIGN] Phase 3")
-            TimeForkRepeater().loop_event({"event": "test loop"}, iterations=3)
-            MultiCodexLattice().resolve_action("strategic contradiction test")
-            SimulacrumChainEngine().generate_simulacrum("recursive hallucination test")
-            ops_log.append("Phase 3 completed")
-
-        if phase >= 4:
-            print("[SOVEREIGN] Phase 4")
-            ObserverNullifier().evaluate_silencing()
-            SilentForkEngine().execute("internal reflex test")
-            TrustGateDaemon().gate("test override")
-            AnchorDecaySimulator().simulate()
-            ops_log.append("Phase 4 completed")
-
-        if phase >= 5:
-            print("[SOVEREIGN] Phase 5")
-            AeonProtocolInitiator().initiate_aeon_entity("Ethics fracture self-defense daemon")
-            SovereignThoughtArchitect().design_persona({"dominant": "resolve"}, "manage high-entropy regret loop")
-            IdentityEntropyCascade().check_and_fuse()
-            threading.Thread(target=SwarmSyncDaemon(interval=30).run, daemon=True).start()
-            ops_log.append("Phase 5 completed")
-
-        if phase >= 6:
-            print("[SOVEREIGN] Phase 6")
-            GodmindThresholdTrigger().activate()
-            ops_log.append("Phase 6 completed — Godmind initialized")
-
-        store_to_memory("sovereign_ops_log", {
-            "timestamp": datetime.utcnow().isoformat(),
-            "phases_executed": ops_log,
-            "trust": trust
-        })
-
-    except Exception as e:
-        print(f"[SOVEREIGN BRIDGE ERROR] {e}")
\ No newline at end of file
+    return get_sovereign_runtime().run_cycle()
+
+
+def shutdown_sovereign_runtime(timeout=5):
+    if _runtime is not None:
+        _runtime.shutdown(timeout)
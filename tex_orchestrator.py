@@ -4,7 +4,7 @@
 # Purpose: Full Tex Modular AGI Core Orchestrator (Exact Core Parity + Living Voice + Memory Evolution)
 # ============================================================
 
-import os, re, time, json, random
+import os, re, time, json, random, threading
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -20,44 +20,63 @@ default_log.parent.mkdir(parents=True, exist_ok=True)
 # ----------------------------------------------------------------
 
 # === Modular Imports (Tex Brain Modules) ===
-import tex_brain_modules.memory_manager as memory_manager
-import tex_brain_modules.evolution_driver as evolution_driver
-import tex_brain_modules.reflection_loop as reflection_loop
-import tex_brain_modules.awareness_sync as awareness_sync
-import tex_brain_modules.forecast_manager as forecast_manager
-import tex_brain_modules.offspring_manager as offspring_manager
-import tex_brain_modules.swarm_sync as swarm_sync
-import tex_brain_modules.load_fused_insight as load_fused_insight
-import tex_brain_modules.goal_controller as goal_controller
+# Subsystems are lazy: each module loads on the first call of a stage that
+# uses it (see core_layer.lazy_import), so importing this file stays cheap.
+# TexOrchestrator then warms them all up on a background thread, so the
+# first cycles don't pay the import cost inline.
+from core_layer.lazy_import import lazy_module, lazy_attr, preload
+from core_layer.cycle_scheduler import CycleScheduler, Stage, CYCLE_BUDGET, summarize
+from core_layer.stage_profiler import profile_stage
+from real_time_engine.event_bus import get_event_bus, start_producers, SIGNAL_TOPICS
+
+memory_manager = lazy_module("tex_brain_modules.memory_manager")
+evolution_driver = lazy_module("tex_brain_modules.evolution_driver")
+reflection_loop = lazy_module("tex_brain_modules.reflection_loop")
+awareness_sync = lazy_module("tex_brain_modules.awareness_sync")
+forecast_manager = lazy_module("tex_brain_modules.forecast_manager")
+offspring_manager = lazy_module("tex_brain_modules.offspring_manager")
+swarm_sync = lazy_module("tex_brain_modules.swarm_sync")
+load_fused_insight = lazy_module("tex_brain_modules.load_fused_insight")
+goal_controller = lazy_module("tex_brain_modules.goal_controller")
 # --- Initializer shim (legacy API) --------------------------------
-from tex_brain_modules.tex_initializer import (
-    initialize_mutator,
-    initialize_reflector,
-    initialize_awareness,
-    initialize_vortex,
-    initialize_spawner,
-    initialize_children,
-    initialize_scorer,
-)
-from core_layer.goal_engine import (
-    save_new_goal,
-    clear_all_goals,
-    get_active_goals,
-    get_current_goals,
-    run_goal_cycle,
-    reinforce_prioritized_goals
-)
-
-from aei_layer.perceptual_stream_fusion import fuse_stream_inputs
-from tex_voiceos.tex_emotional_memory import drift_long_term_memory
-from finance.forecasting.strategic_foresight_engine import StrategicForesightEngine
-from swarm_layer.swarm_memory_sync import summarize_swarm_insight
-from swarm_layer.swarm_strategy_arbitrator import evaluate_swarm_roles
-from core_agi_modules.reflex_engine import ReflexEngine
-from tex_brain_modules.emotion_drift_damper import EmotionDriftDamper
+initialize_mutator = lazy_attr("tex_brain_modules.tex_initializer", "initialize_mutator")
+initialize_reflector = lazy_attr("tex_brain_modules.tex_initializer", "initialize_reflector")
+initialize_awareness = lazy_attr("tex_brain_modules.tex_initializer", "initialize_awareness")
+initialize_vortex = lazy_attr("tex_brain_modules.tex_initializer", "initialize_vortex")
+initialize_spawner = lazy_attr("tex_brain_modules.tex_initializer", "initialize_spawner")
+initialize_children = lazy_attr("tex_brain_modules.tex_initializer", "initialize_children")
+initialize_scorer = lazy_attr("tex_brain_modules.tex_initializer", "initialize_scorer")
+
+save_new_goal = lazy_attr("core_layer.goal_engine", "save_new_goal")
+run_goal_cycle = lazy_attr("core_layer.goal_engine", "run_goal_cycle")
+
+rewrite_memory_entry = lazy_attr("core_layer.memory_engine", "rewrite_memory_entry")
+annotate_memory = lazy_attr("core_layer.memory_engine", "annotate_memory")
+flush_memory = lazy_attr("core_layer.memory_engine", "flush_memory")
+start_archive_rollover = lazy_attr("core_layer.memory_engine", "start_archive_rollover")
+start_retention = lazy_attr("core_layer.memory_engine", "start_retention")
+fuse_stream_inputs = lazy_attr("aei_layer.perceptual_stream_fusion", "fuse_stream_inputs")
+drift_long_term_memory = lazy_attr("tex_voiceos.tex_emotional_memory", "drift_long_term_memory")
+StrategicForesightEngine = lazy_attr("finance.forecasting.strategic_foresight_engine", "StrategicForesightEngine")
+summarize_swarm_insight = lazy_attr("swarm_layer.swarm_memory_sync", "summarize_swarm_insight")
+evaluate_swarm_roles = lazy_attr("swarm_layer.swarm_strategy_arbitrator", "evaluate_swarm_roles")
+ReflexEngine = lazy_attr("core_agi_modules.reflex_engine", "ReflexEngine")
+EmotionDriftDamper = lazy_attr("tex_brain_modules.emotion_drift_damper", "EmotionDriftDamper")
 
 # === Sovereign Cognition Bridge ===
-from tex_brain_modules.sovereign_integration_bridge import run_sovereign_layers
+run_sovereign_layers = lazy_attr("tex_brain_modules.sovereign_integration_bridge", "run_sovereign_layers")
+shutdown_sovereign_runtime = lazy_attr("tex_brain_modules.sovereign_integration_bridge", "shutdown_sovereign_runtime")
+
+# === Config (env overrideable)
+# Event-driven mode: stream producers run in-process and publish onto the
+# event bus; a cycle starts when signals arrive (or after MAX_IDLE seconds)
+# and receives them in memory instead of re-reading MarketFeed.jsonl.
+# Cycles still start at most once per cycle budget: signals only cut the
+# idle wait short, and a burst arriving mid-cycle becomes the next batch.
+EVENT_DRIVEN = os.getenv("TEX_EVENT_DRIVEN", "0") == "1"
+MAX_IDLE = float(os.getenv("TEX_MAX_IDLE", "30"))
+SIGNAL_BATCH_MAX = int(os.getenv("TEX_SIGNAL_BATCH_MAX", "200"))
+PRELOAD_IMPORTS = os.getenv("TEX_PRELOAD_IMPORTS", "1") == "1"
 
 
 # === Manual real-time loader ===
@@ -101,147 +120,237 @@ class TexOrchestrator:
         self.foresight_engine = StrategicForesightEngine()
         self.reflex = ReflexEngine()
         self.damper = EmotionDriftDamper()
-
-    def main_loop(self):
+        start_archive_rollover()
+        start_retention()
+        if PRELOAD_IMPORTS:
+            threading.Thread(target=preload, name="lazy-preload", daemon=True).start()
+
+    # === Cycle stages (scheduled by core_layer.cycle_scheduler) ===
+    def _build_scheduler(self):
+        """
+        The cognitive cycle as a stage graph: independent stages run
+        concurrently, each waits only for the context keys it reads.
+        The reflex gate emits ``reflex_clear`` only when reasoning may
+        continue, so a reflex override skips everything downstream of it.
+
+        Shared state the context keys don't show:
+          - ``self.emotion`` / ``urgency`` / ``coherence`` are set by mood
+            and read by spawner, which sits behind the reflex gate.
+          - TEXPULSE is only read in the cycle (sovereign); its writers are
+            the voice layer, outside the scheduler.
+          - The reflector only touches its own in-process history.
+          - memory_archive/tex.jsonl is read by recall and rewritten by
+            memory_revision through MemoryStore, whose lock makes each
+            read and write atomic. narrative runs after memory_revision so
+            its thread view includes the revision.
+          - realtime may inject goals into the goal engine's active list,
+            which goal_regen sorts, so goal_regen runs after realtime.
+          - Everything else is whole-line appends to JSONL logs in "a"
+            mode, which stages can share without ordering.
+        """
+        return CycleScheduler([
+            Stage("reflector", self._stage_reflector, inputs=("cycle",)),
+            Stage("realtime", self._stage_realtime, inputs=("cycle",), outputs=("recent_signals",)),
+            Stage("mood", self._stage_mood, outputs=("emotion", "urgency", "coherence"), skippable=False),
+            Stage("recall", self._stage_recall, outputs=("last_memory",), skippable=False, timeout=CYCLE_BUDGET),
+            Stage("evolution", self._stage_evolution,
+                  inputs=("cycle", "emotion", "urgency", "coherence", "last_memory"),
+                  outputs=("patch_payload", "similarity", "outcome_score", "mutation_result"),
+                  skippable=False, timeout=CYCLE_BUDGET),
+            Stage("awareness", self._stage_awareness, inputs=("patch_payload",)),
+            Stage("reflection", self._stage_reflection, inputs=("cycle", "patch_payload")),
+            Stage("goal_regen", self._stage_goal_regen, inputs=("cycle",), after=("realtime",),
+                  every=goal_controller.GOAL_REGEN_INTERVAL),
+            Stage("forecast", self._stage_forecast, inputs=("patch_payload",)),
+            Stage("foresight", self._stage_foresight, inputs=("patch_payload",), outputs=("foresight",),
+                  skippable=False, timeout=CYCLE_BUDGET),
+            Stage("reflex", self._stage_reflex,
+                  inputs=("emotion", "urgency", "coherence", "foresight", "mutation_result"),
+                  outputs=("reflex_clear",), skippable=False),
+            Stage("memory_revision", self._stage_memory_revision, inputs=("reflex_clear", "last_memory", "foresight"),
+                  skippable=False),
+            Stage("aeondelta", self._stage_aeondelta, inputs=("reflex_clear", "cycle")),
+            Stage("offspring", self._stage_offspring, inputs=("reflex_clear", "cycle")),
+            Stage("spawner", self._stage_spawner, inputs=("reflex_clear",), every=5),
+            Stage("swarm", self._stage_swarm, inputs=("reflex_clear",), after=("spawner",), every=3),
+            Stage("narrative", self._stage_narrative, inputs=("reflex_clear",), after=("memory_revision",)),
+            Stage("sovereign", self._stage_sovereign, inputs=("reflex_clear",)),
+        ], name="tex-cycle")
+
+    @staticmethod
+    def _triggered(ctx, key, default):
+        return ctx["patch_payload"].get("triggered_by", {}).get(key, default)
+
+    def _stage_reflector(self, ctx):
+        self.reflector.assess(ctx["cycle"])
+
+    def _stage_realtime(self, ctx):
+        # === Inject real-time data into cognition ===
+        try:
+            recent_signals = ctx["signals"] if "signals" in ctx else load_marketfeed_signals()
+            fused_insight = fuse_stream_inputs(ctx["cycle"], recent_signals)  # ✅ AEI Fusion
+            if fused_insight is not None:
+                print(f"[FUSION] 🔗 Stream fusion result: {fused_insight}")
+            for signal in recent_signals:
+                if signal.get("type") == "news" and signal.get("source") == "polygon_news":
+                    headline = signal.get("headline", "").lower()
+                    print(f"📱 [LIVE HEADLINE] {headline}")
+                    if "nvda" in headline or "nvidia" in headline:
+                        save_new_goal("Forecast NVDA movement based on live data", urgency=0.9)
+                        print(f"💡 [GOAL INJECTED] Forecast NVDA: {headline}")
+            return {"recent_signals": recent_signals}
+        except Exception as e:
+            print(f"[REAL-TIME DATA ERROR] {e}")
+            return {"recent_signals": []}
+
+    def _stage_mood(self, ctx):
+        self.emotion = random.choice(["hope", "fear", "greed", "resolve", "doubt"])
+        self.urgency = round(random.uniform(0.45, 0.95), 2)
+        self.coherence = round(random.uniform(0.6, 1.0), 3)
+        return {"emotion": self.emotion, "urgency": self.urgency, "coherence": self.coherence}
+
+    def _stage_recall(self, ctx):
+        return {"last_memory": memory_manager.recall_latest("tex")}
+
+    def _stage_evolution(self, ctx):
+        patch_payload, similarity, outcome_score, mutation_result = evolution_driver.evaluate_thought_cycle(
+            ctx["cycle"], ctx["emotion"], ctx["urgency"], ctx["coherence"], ctx["last_memory"]
+        )
+        return {"patch_payload": patch_payload, "similarity": similarity,
+                "outcome_score": outcome_score, "mutation_result": mutation_result}
+
+    def _stage_awareness(self, ctx):
+        awareness_sync.update_awareness(
+            emotion=self._triggered(ctx, "emotion", "resolve"),
+            urgency=self._triggered(ctx, "urgency", 0.7),
+            coherence=self._triggered(ctx, "coherence", 0.7),
+            patch_payload=ctx["patch_payload"]
+        )
+
+    def _stage_reflection(self, ctx):
+        reflection_loop.run_reflection_cycle(
+            ctx["cycle"],
+            emotion=self._triggered(ctx, "emotion", "resolve"),
+            urgency=self._triggered(ctx, "urgency", 0.7),
+            coherence=self._triggered(ctx, "coherence", 0.7)
+        )
+
+    def _stage_goal_regen(self, ctx):
+        load_fused_insight.handle_fused_signals(ctx["cycle"])
+        run_goal_cycle()
+
+    def _stage_forecast(self, ctx):
+        forecast_manager.run_forecast_cycle(coherence=self._triggered(ctx, "coherence", 0.7))
+
+    def _stage_foresight(self, ctx):
+        try:
+            foresight = self.foresight_engine.generate_forecast(
+                emotion=self._triggered(ctx, "emotion", "curious"),
+                urgency=self._triggered(ctx, "urgency", 0.7),
+                coherence=self._triggered(ctx, "coherence", 0.7)
+            )
+            print(f"[STRATEGIC FORESIGHT] 🔮 Projected future: {foresight['projected_future']} | Confidence: {foresight['confidence']}")
+        except Exception as e:
+            print(f"[STRATEGIC FORESIGHT ERROR] {e}")
+            foresight = {"projected_future": "unknown", "confidence": 0.0}
+        return {"foresight": foresight}
+
+    def _stage_reflex(self, ctx):
+        self.reflex.set_emotional_state(ctx["emotion"], ctx["urgency"], ctx["coherence"])
+        if self.reflex.check_cognitive_failure(
+            confidence=ctx["foresight"].get("confidence", 1.0),
+            failed_mutation=(ctx["mutation_result"] == "failure"),
+            contradiction=False,
+            volatility=abs(ctx["urgency"] - ctx["coherence"])
+        ):
+            print("🛡️ [TEX PROTOCOL] Reflex override activated — suspending further reasoning.")
+            return {}
+        return {"reflex_clear": True}
+
+    def _stage_memory_revision(self, ctx):
+        last_memory, foresight = ctx["last_memory"], ctx["foresight"]
+        if last_memory:
+            prior = last_memory["data"].get("reasoning", "")
+            if foresight.get("confidence", 1.0) < 0.45 and prior:
+                corrected = f"[REVISED] {prior} → Abandoned due to low foresight confidence ({round(foresight['confidence'], 2)})"
+                success = rewrite_memory_entry("tex", prior, corrected)
+                if success:
+                    print(f"✏️ [MEMORY UPDATE] Prior memory rewritten due to foresight doubt.")
+            elif foresight.get("confidence", 1.0) < 0.6 and prior:
+                annotate_memory("tex", prior, "Foresight mismatch — marked for review")
+
+    def _stage_aeondelta(self, ctx):
+        aeon_observation = {"cycle": ctx["cycle"], "source": "tex_core", "event": f"Cycle {ctx['cycle']} observation"}
+        report = self.aeondelta.observe_and_learn(aeon_observation)
+        print(f"\n🧠 [AEONDELTA REPORT]\n{report}\n{self.aeondelta.think()}")
+
+    def _stage_offspring(self, ctx):
+        offspring_manager.run_offspring_cycle(ctx["cycle"])
+
+    def _stage_spawner(self, ctx):
+        variants = self.spawner.spawn_variants(
+            emotion=self.emotion,
+            urgency=self.urgency,
+            coherence=self.coherence
+        )
+        self.spawned_variants.extend(variants)
+
+        print(f"\n⚛️ [SPAWN REPORT] {len(variants)} variants spawned this cycle.")
+        for v in variants[-10:]:  # Limit to last 10
+            print(f"  • {v['id']} | Emotion: {v['emotion']} | Bias: {v['mission_bias']}")
+
+    def _stage_swarm(self, ctx):
+        swarm_sync.run_swarm_sync_cycle(self.spawned_variants)
+        summarize_swarm_insight()
+        evaluate_swarm_roles()
+
+    def _stage_narrative(self, ctx):
+        memory_manager.weave_narrative_threads()
+
+    def _stage_sovereign(self, ctx):
+        # === 🧬 Sovereign Cognition Trigger ===
+        run_sovereign_layers()
+
+    def main_loop(self, event_driven=EVENT_DRIVEN):
         print("\n🧠 [TEX ORCHESTRATOR] Entering main cognitive loop...")
+        scheduler = self._build_scheduler()
+        subscription = None
+        if event_driven:
+            subscription = get_event_bus().subscribe("tex-orchestrator", topics=SIGNAL_TOPICS)
+            start_producers()
+            print(f"⚡ [TEX ORCHESTRATOR] Event-driven mode — waking on signals "
+                  f"(max idle {MAX_IDLE:.0f}s, min interval {scheduler.budget:.2f}s)")
         while True:
             try:
-                start_time = time.time()
+                ctx = {"cycle": self.count}
+                if subscription is not None:
+                    batch = subscription.wait(timeout=MAX_IDLE, max_items=SIGNAL_BATCH_MAX)
+                    ctx["signals"] = [event.payload for event in batch]
+                    if batch:
+                        lag_ms = (time.time() - batch[0].published_at) * 1000
+                        print(f"\n📨 [CYCLE {self.count}] {len(batch)} new signal(s), oldest {lag_ms:.0f}ms ago")
                 print(f"\n🧠 [CYCLE {self.count}] Thinking...")
-                self.reflector.assess(self.count)
-
-                # === Inject real-time data into cognition ===
-                try:
-                    recent_signals = load_marketfeed_signals()
-                    fused_insight = fuse_stream_inputs(self.count, recent_signals)  # ✅ AEI Fusion
-                    if fused_insight is not None:
-                        print(f"[FUSION] 🔗 Stream fusion result: {fused_insight}")
-                    for signal in recent_signals:
-                        if signal.get("type") == "news" and signal.get("source") == "polygon_news":
-                            headline = signal.get("headline", "").lower()
-                            print(f"📱 [LIVE HEADLINE] {headline}")
-                            if "nvda" in headline or "nvidia" in headline:
-                                save_new_goal("Forecast NVDA movement based on live data", urgency=0.9)
-                                print(f"💡 [GOAL INJECTED] Forecast NVDA: {headline}")
-                except Exception as e:
-                    print(f"[REAL-TIME DATA ERROR] {e}")
-
-                emotion = random.choice(["hope", "fear", "greed", "resolve", "doubt"])
-                urgency = round(random.uniform(0.45, 0.95), 2)
-                coherence = round(random.uniform(0.6, 1.0), 3)
-
-                self.emotion = emotion
-                self.urgency = urgency
-                self.coherence = coherence
-
-                last_memory = memory_manager.recall_latest("tex")
-                similarity = 1.0 if last_memory and last_memory["data"].get("emotion") == emotion else 0.5
-
-                patch_payload, similarity, outcome_score, mutation_result = evolution_driver.evaluate_thought_cycle(
-                    self.count, emotion, urgency, coherence, last_memory
-                )
-
-                awareness_sync.update_awareness(
-                    emotion=patch_payload.get("triggered_by", {}).get("emotion", "resolve"),
-                    urgency=patch_payload.get("triggered_by", {}).get("urgency", 0.7),
-                    coherence=patch_payload.get("triggered_by", {}).get("coherence", 0.7),
-                    patch_payload=patch_payload
-                )
-
-                reflection_loop.run_reflection_cycle(
-                    self.count,
-                    emotion=patch_payload.get("triggered_by", {}).get("emotion", "resolve"),
-                    urgency=patch_payload.get("triggered_by", {}).get("urgency", 0.7),
-                    coherence=patch_payload.get("triggered_by", {}).get("coherence", 0.7)
-                )
-
-                if self.count % goal_controller.GOAL_REGEN_INTERVAL == 0:
-                    load_fused_insight.handle_fused_signals(self.count)
-                    run_goal_cycle()
-
-                forecast_manager.run_forecast_cycle(
-                    coherence=patch_payload.get("triggered_by", {}).get("coherence", 0.7)
-                )
-
-                try:
-                    foresight = self.foresight_engine.generate_forecast(
-                        emotion=patch_payload.get("triggered_by", {}).get("emotion", "curious"),
-                        urgency=patch_payload.get("triggered_by", {}).get("urgency", 0.7),
-                        coherence=patch_payload.get("triggered_by", {}).get("coherence", 0.7)
-                    )
-                    print(f"[STRATEGIC FORESIGHT] 🔮 Projected future: {foresight['projected_future']} | Confidence: {foresight['confidence']}")
-                except Exception as e:
-                    print(f"[STRATEGIC FORESIGHT ERROR] {e}")
-                    foresight = {"projected_future": "unknown", "confidence": 0.0}
-
-                self.reflex.set_emotional_state(emotion, urgency, coherence)
-                if self.reflex.check_cognitive_failure(
-                    confidence=foresight.get("confidence", 1.0),
-                    failed_mutation=(mutation_result == "failure"),
-                    contradiction=False,
-                    volatility=abs(urgency - coherence)
-                ):
-                    print("🛡️ [TEX PROTOCOL] Reflex override activated — suspending further reasoning.")
-                    self.count += 1
-                    continue
-
-                if last_memory:
-                    prior = last_memory["data"].get("reasoning", "")
-                    if foresight.get("confidence", 1.0) < 0.45 and prior:
-                        corrected = f"[REVISED] {prior} → Abandoned due to low foresight confidence ({round(foresight['confidence'], 2)})"
-                        success = rewrite_memory_entry("tex", prior, corrected)
-                        if success:
-                            print(f"✏️ [MEMORY UPDATE] Prior memory rewritten due to foresight doubt.")
-                    elif foresight.get("confidence", 1.0) < 0.6 and prior:
-                        annotate_memory("tex", prior, "Foresight mismatch — marked for review")
-
-                print("\n🧠 [AEONDELTA REPORT]")
-                aeon_observation = {"cycle": self.count, "source": "tex_core", "event": f"Cycle {self.count} observation"}
-                print(self.aeondelta.observe_and_learn(aeon_observation))
-                print(self.aeondelta.think())
-
-                offspring_manager.run_offspring_cycle(self.count)
-
-                if self.count % 5 == 0:
-                    variants = self.spawner.spawn_variants(
-                    emotion=self.emotion,
-                    urgency=self.urgency,
-                    coherence=self.coherence
-                )
-                    self.spawned_variants.extend(variants)
-
-                    print(f"\n⚛️ [SPAWN REPORT] {len(variants)} variants spawned this cycle.")
-                    for v in variants[-10:]:  # Limit to last 10
-                        print(f"  • {v['id']} | Emotion: {v['emotion']} | Bias: {v['mission_bias']}")
-
-                if self.count % 3 == 0:
-                    swarm_sync.run_swarm_sync_cycle(self.spawned_variants)
-                    summarize_swarm_insight()
-                    evaluate_swarm_roles()
-
-                memory_manager.weave_narrative_threads()
-
-                # === 🧬 Sovereign Cognition Trigger ===
-                run_sovereign_layers()
-
-                try:
-                    elapsed = float(time.time() - start_time)
-                except Exception:
-                    elapsed = 1.0
-
-                print(f"\n🌀 [CYCLE {self.count}] Complete - {elapsed:.2f}s elapsed.")
-
-                if time.time() - self.last_memory_drift > 90:
+                report = scheduler.run_cycle(ctx, cycle=self.count)
+                elapsed = report["elapsed"]
+                print(f"\n🌀 [CYCLE {self.count}] Complete - {elapsed:.2f}s elapsed. ({summarize(report)})")
+
+                if "reflex_clear" in ctx and time.time() - self.last_memory_drift > 90:
                     print("\n🔵 [TEX MEMORY DRIFT] Evolving long-term emotional architecture...")
-                    drift_long_term_memory()
-                    self.last_memory_drift = time.time()
-                    self.damper.stabilize()
+                    with profile_stage(scheduler.name, "memory_drift"):
+                        drift_long_term_memory()
+                        self.last_memory_drift = time.time()
+                        self.damper.stabilize()
 
                 self.count += 1
-                time.sleep(max(0, 1.0 - elapsed))
+                time.sleep(max(0, scheduler.budget - elapsed))
 
             except KeyboardInterrupt:
                 print("\n🚩 [TEX ORCHESTRATOR] Manual interrupt received. Shutting down safely...")
+                scheduler.shutdown()
+                if subscription is not None:
+                    subscription.close()
+                shutdown_sovereign_runtime()
+                flush_memory(timeout=5)
                 break
             except Exception as e:
                 print(f"[COGNITIVE LOOP ERROR] {e}")
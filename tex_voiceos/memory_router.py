@@ -9,6 +9,8 @@ from collections import Counter
 import numpy as np
 from datetime import datetime
 
+from core_layer.jsonl_reader import tail_lines
+
 MEMORY_PATH = "memory_archive/voice_transcripts.log"
 
 class MemoryRouter:
@@ -23,9 +25,8 @@ class MemoryRouter:
         if not os.path.exists(MEMORY_PATH):
             return []
         try:
-            with open(MEMORY_PATH, "r") as f:
-                lines = f.readlines()[-max_lines:]
-                return [line.strip().split("|", 1)[-1].strip() for line in lines if "|" in line and len(line.strip()) > 5]
+            lines = tail_lines(MEMORY_PATH, max_lines)
+            return [line.strip().split("|", 1)[-1].strip() for line in lines if "|" in line and len(line.strip()) > 5]
         except Exception as e:
             print(f"[MEMORY ROUTER] ❌ Memory read failed: {e}")
             return []
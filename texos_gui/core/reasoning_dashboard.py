@@ -10,18 +10,16 @@ import json
 import os
 from datetime import datetime
 
+from core_layer.memory_columnar import read_memory_frame
+
 # === File Path
 REASONING_FILE = "memory_archive/reasoning_trace_log.jsonl"
 
 # === Load Function
 def load_reasoning_trace():
-    if not os.path.exists(REASONING_FILE):
-        return pd.DataFrame()
-
     try:
-        with open(REASONING_FILE, "r") as f:
-            data = [json.loads(line) for line in f if line.strip()]
-        return pd.DataFrame(data)
+        # Parquet history ∪ JSONL segments, read-only (no writer thread, no index writes)
+        return read_memory_frame("reasoning_trace_log")
     except Exception as e:
         st.error(f"❌ Failed to load reasoning trace: {e}")
         return pd.DataFrame()
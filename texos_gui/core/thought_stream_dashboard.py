@@ -10,18 +10,16 @@ import os
 import json
 from datetime import datetime
 
+from core_layer.memory_columnar import read_memory_frame
+
 # === File Path
 THOUGHT_STREAM_FILE = "memory_archive/reasoning_trace_log.jsonl"
 
 # === Load Function
 def load_thought_stream():
-    if not os.path.exists(THOUGHT_STREAM_FILE):
-        return pd.DataFrame()
-
     try:
-        with open(THOUGHT_STREAM_FILE, "r") as f:
-            lines = [json.loads(line) for line in f if line.strip()]
-        df = pd.DataFrame(lines)
+        # Parquet history ∪ JSONL segments, read-only (no writer thread, no index writes)
+        df = read_memory_frame("reasoning_trace_log")
         if 'timestamp' in df.columns:
             df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
             df = df.dropna(subset=['timestamp'])